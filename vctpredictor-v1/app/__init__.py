@@ -6,12 +6,23 @@ Main application initialization and configuration
 
 import os
 import threading
-import time
-from datetime import datetime, timedelta
+from datetime import timedelta
 from flask import Flask
 from config.base import get_config
 from app.services.database import MatchDatabase
 from app.services.predictor import DynamicPredictor
+from app.services.jobs import JobQueue, run_scrape_job, run_match_crawl_job
+from app.services.leader import LeaderLock, LeaderElector
+from app.services.scheduler import Scheduler, ScheduledJob, IntervalSchedule, CronSchedule
+from app.services.match_calendar import MatchCalendar, AdaptiveSchedule
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.standings_cache import StandingsCache
+from app.services.page_cache import PageCache
+from app.services.version_watcher import VersionWatcher
+from app.services.health_state import HealthState, ScraperHealth
+from app.services.rate_limiter import RateLimiter
+from app.services.assets import AssetManifest, Compressor
+from app.services.static_export import StaticExporter
 
 def create_app(config_class=None):
     """Application factory pattern"""
@@ -28,44 +39,58 @@ def create_app(config_class=None):
     
     app.config.from_object(config_class)
     
+    # Static files are fingerprinted and compressed once, before any worker forks
+    app.assets = AssetManifest(app.static_folder).build()
+    app.compressor = Compressor()
+    
     # Get database connection string
     database_url = os.environ.get('DATABASE_URL', config_class.DATABASE_PATH)
     
     # Initialize extensions with error handling
     try:
         db = MatchDatabase(database_url)
-        predictor = DynamicPredictor(database_url)
+        app.standings_cache = StandingsCache(db)
+        app.page_cache = PageCache()
+        app.health_state = HealthState(db)
+        app.scraper_health = ScraperHealth(db)
+        app.scraper_health.subscribe(app.health_state.refresh)
+        predictor = DynamicPredictor(db=db, cache=app.standings_cache)
+        app.rate_limiter = RateLimiter(db)
         app.db = db
         app.predictor = predictor
+        app.static_exporter = StaticExporter(app) if app.config['STATIC_EXPORT_DIR'] else None
         print(f"✅ Database and predictor initialized successfully")
         
-        # Check if we have VCT data, if not, run initial scrape
-        try:
-            teams = db.get_all_teams_with_stats()
-            if not teams or len(teams) < 10:
-                print("⚠️ No VCT data found in database, running initial scrape...")
-                from app.services.scraper import VCTScraper
-                scraper = VCTScraper()
-                scraper.db = db  # Connect scraper to database
-                success = scraper.run_scrape()
-                if success:
-                    print("✅ Initial VCT data scrape completed successfully")
-                else:
-                    print("❌ Initial VCT data scrape failed")
-            else:
-                print(f"✅ Found {len(teams)} teams in database")
-        except Exception as e:
-            print(f"⚠️ Could not check initial data: {e}")
+        # Background job queue for scrapes triggered from the API
+        app.job_queue = JobQueue(db)
+        app.job_queue.register('scrape', lambda context: run_scrape_job(app, context),
+                               timeout_seconds=app.config['SCRAPE_TIMEOUT_SECONDS'])
         
-        # Start background scraper if in production
-        if os.environ.get('FLASK_ENV') == 'production':
-            start_background_scraper(app)
+        app.leader_lock = None
+        app.scheduler = None
+        app.version_watcher = None
+        if app.config['PRELOAD_APP']:
+            # gunicorn --preload: load the standings once in the master so workers
+            # share them; threads don't survive fork, so post_fork starts them
+            app.standings_cache.load()
+        else:
+            start_worker_threads(app)
             
     except Exception as e:
         print(f"⚠️ Warning: Could not initialize database/predictor: {e}")
         print("App will start but database features may not work")
         app.db = None
         app.predictor = None
+        app.standings_cache = None
+        app.page_cache = None
+        app.health_state = None
+        app.scraper_health = None
+        app.rate_limiter = None
+        app.static_exporter = None
+        app.job_queue = None
+        app.leader_lock = None
+        app.scheduler = None
+        app.version_watcher = None
     
     # Register blueprints
     from app.routes import main_bp
@@ -73,54 +98,101 @@ def create_app(config_class=None):
     
     return app
 
-def start_background_scraper(app):
-    """Start background scraper thread"""
-    def scraper_worker():
-        """Background worker for automatic scraping"""
-        while True:
-            try:
-                # Wait until 3 AM
-                now = datetime.now()
-                next_run = now.replace(hour=3, minute=0, second=0, microsecond=0)
-                
-                if now.hour >= 3:
-                    next_run += timedelta(days=1)
-                
-                sleep_seconds = (next_run - now).total_seconds()
-                print(f"⏰ Next scraper run scheduled for {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
-                print(f"💤 Sleeping for {sleep_seconds/3600:.1f} hours...")
-                
-                time.sleep(sleep_seconds)
-                
-                # Run the scraper
-                print("🚀 Running scheduled scraper...")
-                try:
-                    from app.services.scraper import VCTScraper
-                    scraper = VCTScraper()
-                    success = scraper.run_scrape()
-                    
-                    if success:
-                        print("✅ Scheduled scraper completed successfully")
-                    else:
-                        print("❌ Scheduled scraper failed")
-                        
-                except Exception as e:
-                    print(f"❌ Scheduled scraper error: {e}")
-                
-                # Wait a bit before next cycle
-                time.sleep(300)  # 5 minutes
-                
-            except Exception as e:
-                print(f"❌ Scraper worker error: {e}")
-                time.sleep(3600)  # Wait 1 hour on error
-    
-    # Start scraper thread
-    scraper_thread = threading.Thread(target=scraper_worker, daemon=True)
-    scraper_thread.start()
-    print("🔄 Background scraper started (runs daily at 3 AM)")
+def start_worker_threads(app):
+    """Start this process's background threads (in each worker when the app is preloaded)"""
+    if app.db is None:
+        return
+    
+    # Standings writes from any worker (or the scraper) invalidate this worker's cache
+    app.version_watcher = VersionWatcher(app.db)
+    app.standings_cache.attach(app.version_watcher)
+    app.version_watcher.start()
+    
+    # Scraper health is recorded in memory and flushed; one reader per
+    # process serves /api/health and every /api/health/stream client
+    app.scraper_health.start()
+    app.health_state.start()
+    
+    # Requeued jobs and the initial scrape run in the background so the
+    # app can serve whatever data it already has straight away. A job left
+    # by a worker that died is also taken over by the next enqueue or wait
+    # on it (JobQueue.revive_if_stale), whatever STARTUP_POPULATE says
+    if app.config['STARTUP_POPULATE'] == 'background':
+        threading.Thread(target=populate_in_background, args=(app,),
+                         name='vct-startup', daemon=True).start()
+    
+    # Start background scraper if in production
+    if os.environ.get('FLASK_ENV') == 'production':
+        start_background_scraper(app)
 
-# Create app instance
-app = create_app()
+def populate_in_background(app):
+    """Resubmit interrupted jobs and queue a scrape if the standings are (nearly) empty"""
+    try:
+        app.job_queue.recover()
+        
+        teams_count = app.db.count_teams()
+        if teams_count >= app.config['MIN_STARTUP_TEAMS']:
+            print(f"✅ Found {teams_count} teams in database")
+        elif CircuitBreaker(app.db, app.config['CIRCUIT_NAME']).is_open():
+            # vlr.gg is known to be down; the next scheduled or manual scrape will populate
+            print("⛔ No VCT data found, but the vlr.gg circuit is open; skipping initial scrape")
+        else:
+            # Every worker gets here on a fresh deploy; the dedupe key leaves one scrape running
+            job, created = app.job_queue.enqueue('scrape', dedupe_key='scrape')
+            print(f"⚠️ Only {teams_count} teams in database, "
+                  f"{'queued' if created else 'waiting for'} initial scrape {job['id']}")
+    except Exception as e:
+        print(f"⚠️ Could not check initial data: {e}")
 
-# Import routes after app creation to avoid circular imports
-from app import routes
+def start_background_scraper(app):
+    """Start the leader election and job scheduler threads"""
+    # Every worker process runs these threads, but only the elected leader runs jobs
+    leader_lock = LeaderLock(app.db)
+    LeaderElector(leader_lock).start()
+    app.leader_lock = leader_lock
+    
+    def scheduled_scrape(context):
+        # Through the job queue, so a manual or startup scrape and this one never run at once
+        job, created = app.job_queue.enqueue('scrape', dedupe_key='scrape')
+        if not created:
+            print(f"⏭️ Scheduled scrape joined active scrape job {job['id']}")
+        job = app.job_queue.wait(job['id'], check=context.check)
+        if job is None or job['status'] != 'succeeded':
+            raise RuntimeError(job['error'] if job else 'scrape job disappeared')
+        return job['result']
+    
+    def refresh_calendar(context):
+        from app.services.scraper import VCTScraper
+        calendar = MatchCalendar(app.db)
+        events = calendar.refresh(VCTScraper(database_url=app.db.db_path))
+        # New series may move the next adaptive scrape
+        scheduler.reschedule('scrape')
+        return {'events': events, 'series': len(calendar.matches())}
+    
+    scrape_schedule = IntervalSchedule(app.config['SCRAPER_INTERVAL'], anchor=app.config['SCRAPER_ANCHOR'])
+    if app.config['ADAPTIVE_SCHEDULE']:
+        scrape_schedule = AdaptiveSchedule(app.db, heartbeat=scrape_schedule)
+    
+    scheduler = Scheduler(app.db, leader_lock)
+    scheduler.register(ScheduledJob(
+        'scrape',
+        scrape_schedule,
+        scheduled_scrape,
+        timeout_seconds=app.config['SCRAPE_TIMEOUT_SECONDS'],
+        jitter_seconds=app.config['SCHEDULER_JITTER_SECONDS']
+    ))
+    scheduler.register(ScheduledJob(
+        'match_crawl',
+        CronSchedule(app.config['MATCH_CRAWL_CRON']),
+        lambda context: run_match_crawl_job(app, context),
+        jitter_seconds=app.config['SCHEDULER_JITTER_SECONDS']
+    ))
+    if app.config['ADAPTIVE_SCHEDULE']:
+        scheduler.register(ScheduledJob(
+            'match_calendar',
+            IntervalSchedule(timedelta(hours=app.config['CALENDAR_REFRESH_HOURS']), anchor='00:00'),
+            refresh_calendar,
+            run_immediately=True
+        ))
+    scheduler.start()
+    app.scheduler = scheduler
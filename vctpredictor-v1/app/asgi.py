@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+VCT ASGI Application
+Serves the read endpoints from the event loop and hands every other
+request to the Flask app on bounded thread pools
+"""
+
+import io
+import sys
+import json
+import time
+import asyncio
+import logging
+from urllib.parse import parse_qsl
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_etags, quote_etag
+from config.base import Config
+from app.routes import (standings_etag, standings_cache_control, standings_filters, standings_response, health_response,
+                        prediction_table_etag, prediction_table_cache_control, prediction_table_response)
+
+logger = logging.getLogger(__name__)
+
+# Requests Flask still serves, but from the read pool rather than the admin pool
+READ_PATHS = ('/',)
+READ_PREFIXES = ('/static/', '/assets/')
+
+
+class AsgiApp:
+    """
+    ASGI front for the Flask app.
+
+    Requests are served in one of three lanes, so a slow admin call can only
+    hold up other admin calls:
+
+    - GET /api/health, /api/standings, /api/prediction-table,
+      /api/health/stream and cached GET /
+      are coroutines on the event loop, answered from the worker's
+      in-memory state. When that state needs the database (a due standings
+      version check, the first health read) the query runs on a small
+      dedicated DB pool and the coroutine awaits it. An open health stream
+      costs a coroutine, not a thread.
+    - Other requests for the page (uncached renders, prediction POSTs) and
+      static files go to Flask on the read pool.
+    - Everything else (scraper, reset, debug and job endpoints) goes to
+      Flask on the admin pool.
+    """
+
+    def __init__(self, flask_app, read_threads=None, admin_threads=None, db_threads=None):
+        self.flask_app = flask_app
+        self.read_pool = ThreadPoolExecutor(max_workers=read_threads or Config.ASGI_READ_THREADS,
+                                            thread_name_prefix='asgi-read')
+        self.admin_pool = ThreadPoolExecutor(max_workers=admin_threads or Config.ASGI_ADMIN_THREADS,
+                                             thread_name_prefix='asgi-admin')
+        self.db_pool = ThreadPoolExecutor(max_workers=db_threads or Config.ASGI_DB_THREADS,
+                                          thread_name_prefix='asgi-db')
+        self.routes = {
+            '/api/health': self.health,
+            '/api/standings': self.standings,
+            '/api/prediction-table': self.prediction_table,
+            '/api/health/stream': self.health_stream
+        }
+        self.loop = None
+        self._health_changed = asyncio.Event()  # replaced with a fresh one on every change
+
+        health_state = getattr(flask_app, 'health_state', None)
+        if health_state:
+            health_state.max_clients = Config.ASGI_HEALTH_STREAM_MAX_CLIENTS
+            health_state.subscribe(self._on_health_change)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            return
+        self.loop = self.loop or asyncio.get_running_loop()
+
+        # Without a database Flask answers with its 503 pages, and it
+        # enforces any rate limit policy configured for these paths
+        rate_limiter = getattr(self.flask_app, 'rate_limiter', None)
+        if (scope['method'] == 'GET' and self.flask_app.db is not None
+                and not (rate_limiter and rate_limiter.policy_for(scope['path']))):
+            handler = self.routes.get(scope['path'])
+            if handler:
+                return await handler(scope, receive, send)
+            if scope['path'] == '/':
+                page = await self.cached_index()
+                if page is not None:
+                    return await self.send_compressed(scope, send, 'text/html', [], page.encode())
+
+        path = scope['path']
+        pool = self.read_pool if path in READ_PATHS or path.startswith(READ_PREFIXES) else self.admin_pool
+        await self.call_flask(scope, receive, send, pool)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.loop = asyncio.get_running_loop()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for pool in (self.read_pool, self.admin_pool, self.db_pool):
+                    pool.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def db_call(self, function, *args):
+        """Run a blocking database call on the DB pool and wait for it without blocking the loop"""
+        return await self.loop.run_in_executor(self.db_pool, function, *args)
+
+    async def current_snapshot(self):
+        cache = self.flask_app.standings_cache
+        return cache.current() or await self.db_call(cache.snapshot)
+
+    # Read endpoints served on the loop
+
+    async def cached_index(self):
+        """The cached GET / page, or None to let Flask render it"""
+        page_cache = self.flask_app.page_cache
+        try:
+            snapshot = await self.current_snapshot()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not check standings version for the page: {e}")
+            return None
+        return page_cache.peek('page:index', snapshot.version, page_cache.max_age)
+
+    async def health(self, scope, receive, send):
+        try:
+            health_state = self.flask_app.health_state
+            if health_state.payload is None:
+                await self.db_call(health_state.refresh)  # before the reader thread's first pass
+            body = health_response(self.flask_app)
+        except Exception as e:
+            # Flask reports the error in the endpoint's usual shape
+            logger.warning(f"⚠️ Serving /api/health through Flask: {e}")
+            return await self.call_flask(scope, receive, send, self.read_pool)
+        await self.send_json(send, 200, body, scope=scope)
+
+    async def standings(self, scope, receive, send):
+        try:
+            filters = standings_filters(MultiDict(parse_qsl(scope['query_string'].decode('latin-1'),
+                                                            keep_blank_values=True)))
+            snapshot = await self.current_snapshot()
+            etag = standings_etag(snapshot.version, filters)
+            headers = [(b'etag', quote_etag(etag).encode()),
+                       (b'cache-control', standings_cache_control().encode())]
+            if parse_etags(self.header(scope, b'if-none-match')).contains_weak(etag):
+                return await self.send_response(send, 304, headers, b'')
+            body = standings_response(snapshot, filters)
+        except Exception as e:
+            logger.warning(f"⚠️ Serving /api/standings through Flask: {e}")
+            return await self.call_flask(scope, receive, send, self.read_pool)
+        await self.send_json(send, 200, body, headers, scope=scope)
+
+    async def prediction_table(self, scope, receive, send):
+        try:
+            args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+            snapshot = await self.current_snapshot()
+            etag = prediction_table_etag(snapshot.version)
+            headers = [(b'etag', quote_etag(etag).encode()),
+                       (b'cache-control', prediction_table_cache_control(args.get('v'), snapshot.version).encode())]
+            if parse_etags(self.header(scope, b'if-none-match')).contains_weak(etag):
+                return await self.send_response(send, 304, headers, b'')
+            body = prediction_table_response(self.flask_app, snapshot)
+        except Exception as e:
+            logger.warning(f"⚠️ Serving /api/prediction-table through Flask: {e}")
+            return await self.call_flask(scope, receive, send, self.read_pool)
+        await self.send_json(send, 200, body, headers, scope=scope)
+
+    async def health_stream(self, scope, receive, send):
+        """Server-Sent Events like the Flask route, waiting on the loop instead of a thread"""
+        health_state = self.flask_app.health_state
+        if not health_state.connect():
+            return await self.send_json(send, 503, {
+                'success': False,
+                'error': 'Too many health streams on this worker'
+            })
+
+        disconnected = asyncio.ensure_future(self.wait_for_disconnect(receive))
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [(b'content-type', b'text/event-stream; charset=utf-8'),
+                            (b'cache-control', b'no-cache'),
+                            (b'x-accel-buffering', b'no')]
+            })
+            await self.send_event(send, f"retry: {Config.HEALTH_STREAM_RETRY_MS}\n\n")
+
+            event_id = self.header(scope, b'last-event-id') or None
+            deadline = time.monotonic() + Config.HEALTH_STREAM_MAX_SECONDS
+            while time.monotonic() < deadline and not disconnected.done():
+                # Taken before checking, so a change published in between still sets it
+                changed = self._health_changed
+                change = health_state.change_since(event_id)
+                if change is not None:
+                    event_id, payload = change
+                    await self.send_event(send, f"id: {event_id}\nevent: health\n"
+                                                f"data: {json.dumps(payload)}\n\n")
+                    continue
+
+                waiter = asyncio.ensure_future(changed.wait())
+                done, _ = await asyncio.wait({waiter, disconnected},
+                                             timeout=Config.HEALTH_STREAM_HEARTBEAT_SECONDS,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+                if not done:
+                    await self.send_event(send, ": heartbeat\n\n")
+
+            if not disconnected.done():
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            disconnected.cancel()
+            health_state.disconnect()
+
+    def _on_health_change(self):
+        # Called on the health reader's thread
+        loop = self.loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._wake_streams)
+        except RuntimeError:
+            pass  # the loop has shut down
+
+    def _wake_streams(self):
+        changed, self._health_changed = self._health_changed, asyncio.Event()
+        changed.set()
+
+    # Flask, on a thread pool
+
+    async def call_flask(self, scope, receive, send, pool):
+        environ = self.wsgi_environ(scope, await self.read_body(receive))
+        status, headers, body = await self.loop.run_in_executor(pool, self.run_wsgi, environ)
+        await self.send_response(send, status, headers, body)
+
+    def run_wsgi(self, environ):
+        """Call the Flask app and collect its whole response"""
+        response = {}
+        chunks = []
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                   for name, value in headers]
+            return chunks.append
+
+        result = self.flask_app(environ, start_response)
+        try:
+            chunks.extend(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return response['status'], response['headers'], b''.join(chunks)
+
+    def wsgi_environ(self, scope, body):
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope['query_string'].decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1] or 80),
+            'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False
+        }
+        for name, value in scope['headers']:
+            name = name.decode('latin-1')
+            if name == 'content-type':
+                key = 'CONTENT_TYPE'
+            elif name == 'content-length':
+                key = 'CONTENT_LENGTH'
+            else:
+                key = 'HTTP_' + name.upper().replace('-', '_')
+            value = value.decode('latin-1')
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+    # ASGI plumbing
+
+    @staticmethod
+    def header(scope, name):
+        return next((value.decode('latin-1') for key, value in scope['headers'] if key == name), '')
+
+    @staticmethod
+    async def read_body(receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] != 'http.request':
+                break
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        return b''.join(chunks)
+
+    @staticmethod
+    async def wait_for_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    @staticmethod
+    async def send_response(send, status, headers, body):
+        if not any(name == b'content-length' for name, _ in headers):
+            headers = headers + [(b'content-length', str(len(body)).encode())]
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def send_json(self, send, status, payload, headers=None, scope=None):
+        """A JSON response, compressed like Flask's when scope is given"""
+        # Same encoding as jsonify outside debug mode
+        body = (self.flask_app.json.dumps(payload, separators=(',', ':')) + '\n').encode()
+        if scope is not None and status == 200:
+            return await self.send_compressed(scope, send, 'application/json', headers or [], body)
+        await self.send_response(send, status, [(b'content-type', b'application/json')] + (headers or []), body)
+
+    async def send_compressed(self, scope, send, mimetype, headers, body):
+        """A 200 response, gzip or brotli encoded as compress_response would for Flask"""
+        content_type = f"{mimetype}; charset=utf-8" if mimetype.startswith('text/') else mimetype
+        headers = [(b'content-type', content_type.encode())] + headers
+        compressor = getattr(self.flask_app, 'compressor', None)
+        if compressor and compressor.eligible(mimetype, len(body)):
+            headers.append((b'vary', b'Accept-Encoding'))
+            body, encoding = compressor.compress(body, mimetype, self.header(scope, b'accept-encoding'))
+            if encoding:
+                headers.append((b'content-encoding', encoding.encode()))
+                headers = [(name, b'W/' + value if name == b'etag' and not value.startswith(b'W/') else value)
+                           for name, value in headers]
+        await self.send_response(send, 200, headers, body)
+
+    @staticmethod
+    async def send_event(send, text):
+        await send({'type': 'http.response.body', 'body': text.encode(), 'more_body': True})
@@ -4,10 +4,12 @@ VCT Predictor Routes
 All web endpoints and API calls
 """
 
-from flask import Blueprint, render_template, request, jsonify, current_app
+from flask import Blueprint, render_template, request, jsonify, current_app, url_for, Response, g
+from markupsafe import Markup, escape
 from datetime import datetime
 import os
 import json
+import hashlib
 import threading
 import time
 from bs4 import BeautifulSoup
@@ -15,13 +17,223 @@ from bs4 import BeautifulSoup
 # Create blueprint
 main_bp = Blueprint('main', __name__)
 
+@main_bp.before_request
+def enforce_rate_limit():
+    """Answer 429 once a client is over the rate limit policy for this endpoint"""
+    from app.services.rate_limiter import client_address
+    
+    rate_limiter = getattr(current_app, 'rate_limiter', None)
+    if not rate_limiter or not rate_limiter.policy_for(request.path):
+        return None
+    
+    client = client_address(request.headers.get('X-Forwarded-For'), request.remote_addr,
+                            current_app.config['RATE_LIMIT_PROXY_HOPS'])
+    g.rate_limit = rate_limiter.check(request.path, client)
+    if not g.rate_limit or g.rate_limit['allowed']:
+        return None
+    
+    from app.services.metrics import rate_limited_total
+    rate_limited_total.inc(policy=g.rate_limit['policy'])
+    response = jsonify({
+        'success': False,
+        'error': 'Rate limit exceeded. Please try again later.',
+        'error_code': 'RATE_LIMIT_EXCEEDED',
+        'retry_after': g.rate_limit['retry_after']
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = str(g.rate_limit['retry_after'])
+    return response
+
+@main_bp.after_request
+def add_rate_limit_headers(response):
+    rate_limit = g.get('rate_limit')
+    if rate_limit:
+        response.headers['X-RateLimit-Limit'] = str(rate_limit['limit'])
+        response.headers['X-RateLimit-Remaining'] = str(rate_limit['remaining'])
+    return response
+
+@main_bp.after_request
+def compress_response(response):
+    """gzip or brotli for HTML and JSON bodies above COMPRESS_MIN_BYTES, if the client accepts it"""
+    compressor = getattr(current_app, 'compressor', None)
+    if (not compressor or response.status_code != 200 or response.is_streamed
+            or response.direct_passthrough or 'Content-Encoding' in response.headers):
+        return response
+    if not compressor.eligible(response.mimetype, response.content_length or 0):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    body, encoding = compressor.compress(response.get_data(), response.mimetype,
+                                         request.headers.get('Accept-Encoding'))
+    if encoding:
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        # The validator now describes the decoded content
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+    return response
+
+@main_bp.app_template_global()
+def asset_url(filename):
+    """Fingerprinted /assets/ URL for a static file (plain /static/ when fingerprints are off)"""
+    url_name = current_app.assets.url_name(filename)
+    if url_name is None:
+        return url_for('static', filename=filename)
+    return url_for('main.asset', filename=url_name)
+
 def check_db_available():
     """Check if database is available"""
     if not current_app.db:
         return False, "Database not available"
     return True, "Database available"
 
+def format_timestamp(value):
+    """ISO string for a timestamp column (SQLite already returns strings)"""
+    if not value:
+        return None
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+def event_name(team):
+    """Display name of the event a standings row belongs to"""
+    from config.base import Config
+    event = next((e for e in Config.TRACKED_EVENTS if str(e['event_id']) == str(team['event_id'])), {})
+    return event.get('name') or f"{team['region'].title()} {team['stage']}"
+
+def group_standings_by_event(teams):
+    """Nest standings rows as events -> groups -> teams, in TRACKED_EVENTS order"""
+    from config.base import Config
+    order = {str(event['event_id']): index for index, event in enumerate(Config.TRACKED_EVENTS)}
+    
+    events = {}
+    for team in teams:
+        key = (str(team['event_id']), team['stage'])
+        if key not in events:
+            events[key] = {
+                'event_id': key[0],
+                'region': team['region'],
+                'stage': team['stage'],
+                'name': event_name(team),
+                'groups': {}
+            }
+        events[key]['groups'].setdefault(team['group_name'], []).append(team)
+    
+    standings = sorted(events.values(), key=lambda event: (order.get(event['event_id'], len(order)), event['name']))
+    for event in standings:
+        event['groups'] = [{'name': name, 'teams': rows} for name, rows in sorted(event['groups'].items())]
+    return standings
+
+def get_scheduler_lock_status():
+    """Leader election status for the scheduled scraper (None when it is not running here)"""
+    leader_lock = getattr(current_app, 'leader_lock', None)
+    return leader_lock.status() if leader_lock else None
+
+
+def get_circuit_status():
+    """State of the vlr.gg circuit breaker (None if it cannot be read)"""
+    from config.base import Config
+    from app.services.circuit_breaker import CircuitBreaker
+    return CircuitBreaker(current_app.db, Config.CIRCUIT_NAME).status()
+
+def standings_freshness(circuit, as_of):
+    """
+    Staleness marker for the standings being served. While the circuit is
+    not closed, they are the last good snapshot rather than live data.
+    """
+    stale = bool(circuit and circuit['state'] != 'closed')
+    return {
+        'stale': stale,
+        'as_of': as_of,
+        'reason': 'vlr.gg is unavailable; showing the last successful scrape' if stale else None,
+        'retry_at': circuit['retry_at'] if stale else None
+    }
+
+def get_standings_freshness(circuit=None):
+    """Staleness marker read from the database"""
+    circuit = circuit or get_circuit_status()
+    return standings_freshness(circuit, current_app.db.get_state(current_app.db.STANDINGS_SCRAPED_KEY))
+
+def standings_etag(version, filters):
+    """Strong ETag for one standings version and filter combination"""
+    key = '|'.join(f"{name}={value}" for name, value in sorted(filters.items()))
+    return f"standings-{version}-{hashlib.sha1(key.encode()).hexdigest()[:12]}"
+
+def standings_cache_control():
+    """Cache-Control a CDN can serve (and revalidate) /api/standings from"""
+    from config.base import Config
+    return (
+        f"public, max-age={Config.STANDINGS_API_MAX_AGE_SECONDS}, "
+        f"stale-while-revalidate={Config.STANDINGS_API_STALE_WHILE_REVALIDATE_SECONDS}, "
+        f"stale-if-error={Config.STANDINGS_API_STALE_IF_ERROR_SECONDS}"
+    )
 
+def set_standings_cache_headers(response, etag):
+    """Validator plus Cache-Control"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = standings_cache_control()
+    return response
+
+def standings_filters(args):
+    """The event_id, region and group filters given in the query string"""
+    return {name: args[name] for name in ('event_id', 'region', 'group') if args.get(name)}
+
+def standings_response(snapshot, filters):
+    """/api/standings body: the snapshot's teams matching filters, grouped by event"""
+    teams = snapshot.rows(filters.get('event_id'))
+    if 'region' in filters:
+        teams = [team for team in teams if team['region'].lower() == filters['region'].lower()]
+    if 'group' in filters:
+        teams = [team for team in teams if team['group_name'].lower() == filters['group'].lower()]
+    # Same order as the page: wins (desc), then losses (asc); ties keep the snapshot's delta order
+    teams.sort(key=lambda team: (-team['wins'], team['losses']))
+    
+    return {
+        'success': True,
+        'version': snapshot.version,
+        'filters': filters,
+        'teams_count': len(teams),
+        'events': group_standings_by_event(teams)
+    }
+
+def prediction_table_etag(version):
+    return f"prediction-table-{version}"
+
+def prediction_table_cache_control(requested_version, version):
+    """Immutable at the version-pinned URL the page links to; otherwise revalidated like /api/standings"""
+    from config.base import Config
+    if requested_version == str(version):
+        return f"public, max-age={Config.STATIC_MAX_AGE_SECONDS}, immutable"
+    return standings_cache_control()
+
+def prediction_table_response(app, snapshot):
+    """/api/prediction-table body: the predictor's probability table with event names, built once per version"""
+    def build():
+        table = app.predictor.probability_table(snapshot)
+        for group in table['groups']:
+            group['event_name'] = event_name(group)
+        return dict(success=True, **table)
+    return app.page_cache.get_or_render('api:prediction_table', snapshot.version, build)
+
+def health_response(app):
+    """/api/health body, built from app's in-memory health state without a query"""
+    health_state = app.health_state
+    circuit = health_state.circuit
+    summary = health_state.payload
+    leader_lock = getattr(app, 'leader_lock', None)
+    
+    return {
+        'status': summary['status'],
+        'message': summary['message'],
+        'last_run': summary['last_run'],
+        'success_count': summary['success_count'],
+        'total_runs': summary['total_runs'],
+        'success_rate': summary['success_rate'],
+        'scheduler_lock': leader_lock.status() if leader_lock else None,
+        'circuit_breaker': circuit,
+        'standings': standings_freshness(circuit, health_state.scraped_at),
+        'standings_cache': app.standings_cache.status(),
+        'health_stream': health_state.status()
+    }
 
 def run_auto_scraper():
     """Run the scraper in a background thread"""
@@ -59,38 +271,17 @@ def api_health():
                 'success_rate': 0
             }), 503
         
-        # Try to get health status from database
+        # Served from this worker's health state, which reads the database
+        # every HEALTH_POLL_SECONDS however often this endpoint is called
         try:
-            health_data = current_app.db.get_scraper_health()
+            health_state = current_app.health_state
+            if health_state.payload is None:
+                health_state.refresh()  # before the reader thread's first pass
             
-            # Check if we have valid health data
-            if health_data and health_data.get('total_runs', 0) > 0:
-                # Calculate success rate
-                success_rate = 0
-                if health_data['total_runs'] > 0:
-                    success_rate = (health_data['success_count'] / health_data['total_runs']) * 100
-                
-                return jsonify({
-                    'status': health_data['status'],
-                    'message': 'Health data from database',
-                    'last_run': health_data['last_run'].isoformat() if health_data['last_run'] else None,
-                    'success_count': health_data['success_count'],
-                    'total_runs': health_data['total_runs'],
-                    'success_rate': round(success_rate, 1)
-                })
-            else:
-                # No health data yet, return default status
-                return jsonify({
-                    'status': 'initializing',
-                    'message': 'Scraper health monitoring not yet initialized',
-                    'last_run': None,
-                    'success_count': 0,
-                    'total_runs': 0,
-                    'success_rate': 0
-                })
+            return jsonify(health_response(current_app))
                 
         except Exception as db_error:
-            print(f"⚠️ Could not get scraper health from database: {db_error}")
+            print(f"⚠️ Could not get scraper health: {db_error}")
             # Return default status if database query fails
             return jsonify({
                 'status': 'unknown',
@@ -98,7 +289,8 @@ def api_health():
                 'last_run': None,
                 'success_count': 0,
                 'total_runs': 0,
-                'success_rate': 0
+                'success_rate': 0,
+                'scheduler_lock': get_scheduler_lock_status()
             })
             
     except Exception as e:
@@ -112,11 +304,50 @@ def api_health():
             'success_rate': 0
         }), 500
 
-@main_bp.route('/api/run-scraper', methods=['GET', 'POST'])
-def run_scraper():
-    """Run the scraper manually"""
+@main_bp.route('/api/health/stream')
+def api_health_stream():
+    """Server-Sent Events: scraper health whenever it changes, with heartbeats in between"""
+    from config.base import Config
+    
+    health_state = getattr(current_app, 'health_state', None)
+    if not health_state:
+        return jsonify({
+            'success': False,
+            'error': 'Health stream not available'
+        }), 503
+    if not health_state.connect():
+        # The page falls back to polling /api/health
+        return jsonify({
+            'success': False,
+            'error': 'Too many health streams on this worker'
+        }), 503
+    
+    last_event_id = request.headers.get('Last-Event-ID')
+    
+    def stream():
+        event_id = last_event_id
+        deadline = time.monotonic() + Config.HEALTH_STREAM_MAX_SECONDS
+        yield f"retry: {Config.HEALTH_STREAM_RETRY_MS}\n\n"
+        while time.monotonic() < deadline:
+            change = health_state.wait_for_change(event_id, Config.HEALTH_STREAM_HEARTBEAT_SECONDS)
+            if change is None:
+                yield ": heartbeat\n\n"
+                continue
+            event_id, payload = change
+            yield f"id: {event_id}\nevent: health\ndata: {json.dumps(payload)}\n\n"
+    
+    response = Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # don't let a proxy buffer the stream
+    })
+    # Runs when the server closes the response, even if the stream never started
+    response.call_on_close(health_state.disconnect)
+    return response
+
+@main_bp.route('/api/health/history')
+def api_health_history():
+    """Recent scraper status changes and run outcomes"""
     try:
-        # Check if database is available
         db_available, message = check_db_available()
         if not db_available:
             return jsonify({
@@ -124,81 +355,252 @@ def run_scraper():
                 'error': message
             }), 503
         
-        # Check if scraper is available
-        if not hasattr(current_app, 'scraper_service'):
-            from app.services.scraper import VCTScraper
-            current_app.scraper_service = VCTScraper()
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        return jsonify({
+            'success': True,
+            'history': current_app.db.get_scraper_health_history(limit=limit)
+        })
         
-        # Update health status to running
-        try:
-            current_app.db.update_scraper_health(
-                status='running',
-                success_count=0,
-                total_runs=1
-            )
-        except Exception as e:
-            print(f"⚠️ Could not update scraper health: {e}")
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@main_bp.route('/api/prediction-table')
+def api_prediction_table():
+    """In-group win probabilities for predictions in the browser; ?v=<version> is cacheable for a year"""
+    try:
+        db_available, message = check_db_available()
+        if not db_available:
+            return jsonify({
+                'success': False,
+                'error': message
+            }), 503
         
-        # Run the scraper
-        success = current_app.scraper_service.run_scrape()
+        snapshot = current_app.standings_cache.snapshot()
+        etag = prediction_table_etag(snapshot.version)
+        cache_control = prediction_table_cache_control(request.args.get('v'), snapshot.version)
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            # Compact even under DEBUG, where jsonify would indent the whole table
+            body = current_app.json.dumps(prediction_table_response(current_app, snapshot), separators=(',', ':'))
+            response = current_app.response_class(body + '\n', mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        return response
         
-        if success:
-            # Update health status to success
-            try:
-                current_app.db.update_scraper_health(
-                    status='success',
-                    success_count=1,
-                    total_runs=1
-                )
-            except Exception as e:
-                print(f"⚠️ Could not update scraper health: {e}")
-            
-            # Get updated team count
-            try:
-                teams_with_stats = current_app.db.get_all_teams_with_stats()
-                teams_count = len(teams_with_stats) if teams_with_stats else 0
-            except:
-                teams_count = 0
-            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@main_bp.route('/api/standings')
+def api_standings():
+    """Standings from the cached snapshot, optionally filtered; answers If-None-Match with 304"""
+    try:
+        db_available, message = check_db_available()
+        if not db_available:
             return jsonify({
-                'success': True,
-                'message': 'Scraper completed successfully',
-                'teams_count': teams_count
-            })
-        else:
-            # Update health status to failed
-            try:
-                current_app.db.update_scraper_health(
-                    status='failed',
-                    success_count=0,
-                    total_runs=1,
-                    error_message='Scraper failed to complete'
-                )
-            except Exception as e:
-                print(f"⚠️ Could not update scraper health: {e}")
-            
+                'success': False,
+                'error': message
+            }), 503
+        
+        filters = standings_filters(request.args)
+        
+        # The snapshot's version is checked against the database at most every
+        # few seconds (or on a change notification), so a 304 costs no query
+        snapshot = current_app.standings_cache.snapshot()
+        etag = standings_etag(snapshot.version, filters)
+        if request.if_none_match.contains_weak(etag):
+            return set_standings_cache_headers(Response(status=304), etag)
+        
+        return set_standings_cache_headers(jsonify(standings_response(snapshot, filters)), etag)
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@main_bp.route('/assets/<path:filename>')
+def asset(filename):
+    """A fingerprinted static file, precompressed, cached for a year"""
+    from app.services.assets import choose_encoding
+    from config.base import Config
+    
+    asset, current = current_app.assets.lookup(filename)
+    if asset is None:
+        return jsonify({
+            'success': False,
+            'error': 'Asset not found'
+        }), 404
+    
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'), asset.variants) or 'identity'
+    response = Response(asset.variants[encoding], mimetype=asset.mimetype)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.set_etag(f"{asset.hash}-{encoding}")
+    if current:
+        response.headers['Cache-Control'] = f"public, max-age={Config.STATIC_MAX_AGE_SECONDS}, immutable"
+    else:
+        # An outdated hash from a page rendered before a deploy
+        response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@main_bp.route('/api/run-scraper', methods=['GET', 'POST'])
+def run_scraper():
+    """Queue a scrape in the background and return its job id"""
+    try:
+        # Check if database is available
+        db_available, message = check_db_available()
+        if not db_available or not current_app.job_queue:
             return jsonify({
                 'success': False,
-                'error': 'Scraper failed to complete'
-            }), 500
+                'error': message if not db_available else 'Job queue not available'
+            }), 503
+        
+        # Repeated clicks share the scrape that is already pending or running
+        job, created = current_app.job_queue.enqueue('scrape', dedupe_key='scrape')
+        
+        return jsonify({
+            'success': True,
+            'message': 'Scrape queued' if created else 'Scrape already in progress',
+            'job_id': job['id'],
+            'status': job['status'],
+            'deduplicated': not created,
+            'status_url': url_for('main.job_status', job_id=job['id'])
+        }), 202
             
     except Exception as e:
-        # Update health status to error
-        try:
-            current_app.db.update_scraper_health(
-                status='error',
-                success_count=0,
-                total_runs=1,
-                error_message=str(e)
-            )
-        except Exception as health_error:
-            print(f"⚠️ Could not update scraper health: {health_error}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@main_bp.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Get the status and progress of a background job"""
+    try:
+        db_available, message = check_db_available()
+        if not db_available or not current_app.job_queue:
+            return jsonify({
+                'success': False,
+                'error': message if not db_available else 'Job queue not available'
+            }), 503
+        
+        job = current_app.job_queue.get(job_id)
+        if not job:
+            return jsonify({
+                'success': False,
+                'error': 'Job not found'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'job_id': job['id'],
+            'job_type': job['job_type'],
+            'status': job['status'],
+            'stage': job['stage'],
+            'progress': job['progress'] or [],
+            'result': job['result'],
+            'error': job['error'],
+            'created_at': job['created_at'],
+            'started_at': job['started_at'],
+            'finished_at': job['finished_at']
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@main_bp.route('/api/schedule')
+def schedule_status():
+    """Scheduled jobs with their next run and why it was chosen, plus upcoming series"""
+    try:
+        db_available, message = check_db_available()
+        if not db_available:
+            return jsonify({
+                'success': False,
+                'error': message
+            }), 503
+        
+        from app.services.match_calendar import MatchCalendar
+        
+        # Read from the database so every worker reports what the leader scheduled
+        jobs = [{
+            'name': job['name'],
+            'schedule': job['schedule'],
+            'next_run_at': job['next_run_at'],
+            'next_run_reason': job['next_run_reason'],
+            'last_status': job['last_status'],
+            'last_started_at': job['last_started_at'],
+            'last_finished_at': job['last_finished_at'],
+            'last_duration': job['last_duration'],
+            'last_error': job['last_error']
+        } for job in current_app.db.get_scheduled_jobs()]
+        
+        calendar = MatchCalendar(current_app.db)
+        now = datetime.now().isoformat()
+        
+        return jsonify({
+            'success': True,
+            'scheduler_running': bool(getattr(current_app, 'scheduler', None)),
+            'jobs': jobs,
+            'standings_changed_at': current_app.db.get_state(current_app.db.STANDINGS_CHANGED_KEY),
+            'calendar_updated_at': calendar.load()['updated_at'],
+            'upcoming_matches': [m for m in calendar.matches() if m['starts_at'] >= now]
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@main_bp.route('/api/scrape-runs')
+def scrape_runs():
+    """Recent traced scrape runs; ?spans=true includes every span"""
+    try:
+        db_available, message = check_db_available()
+        if not db_available:
+            return jsonify({
+                'success': False,
+                'error': message
+            }), 503
         
+        limit = min(request.args.get('limit', 20, type=int), 100)
+        include_spans = request.args.get('spans', 'false').lower() == 'true'
+        return jsonify({
+            'success': True,
+            'runs': current_app.db.get_scrape_runs(limit=limit, include_spans=include_spans)
+        })
+        
+    except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@main_bp.route('/metrics')
+def metrics():
+    """Prometheus metrics for this process plus gauges for the latest stored scrape run"""
+    from app.services.metrics import registry, update_last_run_gauges
+    
+    if current_app.db:
+        try:
+            runs = current_app.db.get_scrape_runs(limit=1)
+            update_last_run_gauges(runs[0] if runs else None)
+        except Exception as e:
+            print(f"⚠️ Could not read latest scrape run for metrics: {e}")
+    
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
 @main_bp.route('/api/init-db')
 def init_database():
     """Initialize database with sample data (for Railway deployment)"""
@@ -279,7 +681,7 @@ def debug_scraper():
         # Check if scraper is available
         if not hasattr(current_app, 'scraper_service'):
             from app.services.scraper import VCTScraper
-            current_app.scraper_service = VCTScraper()
+            current_app.scraper_service = VCTScraper(health=current_app.scraper_health)
         
         # Test different VCT URLs
         test_urls = [
@@ -338,8 +740,8 @@ def debug_scraper():
         # Try to run a test scrape
         try:
             test_scrape = current_app.scraper_service.scrape_vct_standings()
-            scrape_success = test_scrape is not False
-            teams_count = len(test_scrape) if test_scrape else 0
+            scrape_success = any(teams for _, teams in test_scrape)
+            teams_count = sum(len(teams) for _, teams in test_scrape if teams)
         except Exception as e:
             scrape_success = False
             teams_count = 0
@@ -407,7 +809,7 @@ def test_scraper_detailed():
         # Check if scraper is available
         if not hasattr(current_app, 'scraper_service'):
             from app.services.scraper import VCTScraper
-            current_app.scraper_service = VCTScraper()
+            current_app.scraper_service = VCTScraper(health=current_app.scraper_health)
         
         # Get the main VCT 2025 URL
         vct_url = "https://www.vlr.gg/event/2501/vct-2025-americas-stage-2"
@@ -416,60 +818,13 @@ def test_scraper_detailed():
         analysis_results = {}
         
         try:
-            # Analyze page structure
-            soup = current_app.scraper_service.analyze_vct_page_structure(vct_url)
-            if soup:
-                # Extract specific information
-                page_text = soup.get_text()
-                
-                # Count group mentions
-                analysis_results['alpha_count'] = page_text.lower().count('alpha')
-                analysis_results['omega_count'] = page_text.lower().count('omega')
-                analysis_results['group_a_count'] = page_text.lower().count('group a')
-                analysis_results['group_b_count'] = page_text.lower().count('group b')
-                
-                # Count tables
-                all_tables = soup.find_all('table')
-                analysis_results['total_tables'] = len(all_tables)
-                
-                # Look for team names
-                team_indicators = ['sentinels', 'loud', '100 thieves', 'nrg', 'cloud9', 'mibr', 'leviatán', 'krü', 'furia', 'evil geniuses', 'g2 esports', 'shopify rebellion']
-                found_teams = []
-                for team in team_indicators:
-                    if team.lower() in page_text.lower():
-                        found_teams.append(team)
-                analysis_results['found_teams'] = found_teams
-                
-                # Look for standings table
-                standings_table = (
-                    soup.find('table', class_='wf-table') or
-                    soup.find('table', class_='standings-table') or
-                    soup.find('table', class_='event-standings-table') or
-                    soup.find('table')
-                )
-                
-                if standings_table:
-                    rows = standings_table.find_all('tr')
-                    analysis_results['standings_table_rows'] = len(rows)
-                    analysis_results['standings_table_found'] = True
-                    
-                    # Show first few rows structure
-                    if len(rows) > 1:
-                        first_row = rows[0]
-                        cells = first_row.find_all(['th', 'td'])
-                        headers = [cell.get_text(strip=True) for cell in cells]
-                        analysis_results['table_headers'] = headers
-                        
-                        # Show sample data from first few rows
-                        sample_rows = []
-                        for i in range(min(3, len(rows))):
-                            row_cells = rows[i].find_all('td')
-                            row_text = [cell.get_text(strip=True) for cell in row_cells]
-                            sample_rows.append(row_text)
-                        analysis_results['sample_rows'] = sample_rows
-                else:
-                    analysis_results['standings_table_found'] = False
-                
+            # Team names to look for on the page
+            team_indicators = ['sentinels', 'loud', '100 thieves', 'nrg', 'cloud9', 'mibr', 'leviatán', 'krü', 'furia', 'evil geniuses', 'g2 esports', 'shopify rebellion']
+            
+            # Analyze page structure (parsed in the parser pool, which hands back plain data)
+            page_analysis = current_app.scraper_service.analyze_vct_page_structure(vct_url, team_indicators)
+            if page_analysis:
+                analysis_results.update(page_analysis)
                 analysis_results['analysis_success'] = True
             else:
                 analysis_results['analysis_success'] = False
@@ -481,16 +836,19 @@ def test_scraper_detailed():
         
         # Try to run the scraper
         try:
-            teams_data = current_app.scraper_service.scrape_vct_standings()
+            event_results = current_app.scraper_service.scrape_vct_standings()
+            teams_data = [team for _, teams in event_results if teams for team in teams]
             if teams_data:
                 analysis_results['scrape_success'] = True
                 analysis_results['teams_count'] = len(teams_data)
                 
-                # Group distribution
-                alpha_teams = [t for t in teams_data if t['group_name'] == 'Alpha']
-                omega_teams = [t for t in teams_data if t['group_name'] == 'Omega']
-                analysis_results['alpha_count'] = len(alpha_teams)
-                analysis_results['omega_count'] = len(omega_teams)
+                # Group distribution per event
+                group_counts = {}
+                for team in teams_data:
+                    key = f"{team['region']}/{team['group_name']}"
+                    group_counts[key] = group_counts.get(key, 0) + 1
+                analysis_results['group_counts'] = group_counts
+                analysis_results['failed_events'] = [event['region'] for event, teams in event_results if not teams]
                 analysis_results['teams_data'] = teams_data
             else:
                 analysis_results['scrape_success'] = False
@@ -527,6 +885,7 @@ def reset_database():
         
         # Clear all teams
         success = current_app.db.clear_all_teams()
+        current_app.standings_cache.invalidate()
         
         if success:
             return jsonify({
@@ -560,6 +919,7 @@ def reset_database_complete():
         
         # Complete database reset
         success = current_app.db.reset_database()
+        current_app.standings_cache.invalidate()
         
         if success:
             return jsonify({
@@ -579,6 +939,64 @@ def reset_database_complete():
             'error': str(e)
         }), 500
 
+def index_view_data(snapshot):
+    """Standings rows sorted for the page, and the same rows grouped by event (computed once per version)"""
+    teams_with_stats = snapshot.rows()
+    
+    # Debug: Log team count and data
+    print(f"🔍 Found {len(teams_with_stats)} teams in database (standings v{snapshot.version})")
+    for team in teams_with_stats:
+        print(f"  - {team.get('team', 'Unknown')} ({team.get('region', 'Unknown')} Group {team.get('group_name', 'Unknown')}): {team.get('record', 'Unknown')}")
+    
+    # Sort teams by record (best to worst): wins (desc), then losses (asc)
+    teams_with_stats.sort(key=lambda team: (-team['wins'], team['losses']))
+    return teams_with_stats, group_standings_by_event(teams_with_stats)
+
+def select_team_option(options_html, team_id):
+    """The cached team <option> list with the submitted team marked as selected"""
+    if not team_id:
+        return options_html
+    # Markup.replace would escape its arguments, so replace on the plain string
+    option = f'<option value="{escape(team_id)}">'
+    return Markup(str(options_html).replace(option, option[:-1] + ' selected>', 1))
+
+def render_index(version, teams_with_stats, standings, prediction_result=None, error_message=None,
+                 prediction_table_url=None):
+    """
+    Render the main page; the standings tables and team options come from the fragment cache.
+    script.js answers the form from the probability table at prediction_table_url (the
+    version-pinned /api/prediction-table unless given) and falls back to the POST.
+    """
+    page_cache = current_app.page_cache
+    
+    # Get last updated time
+    last_updated = None
+    freshness = None
+    try:
+        # Try to get the most recent update time from the database
+        last_updated = current_app.db.get_last_update_time()
+        freshness = get_standings_freshness()
+    except:
+        last_updated = datetime.now()
+    
+    standings_html = page_cache.get_or_render(
+        'fragment:standings', version,
+        lambda: Markup(render_template('partials/_standings.html', standings=standings)))
+    options_html = page_cache.get_or_render(
+        'fragment:team_options', version,
+        lambda: Markup(render_template('partials/_team_options.html', standings=standings)))
+    
+    return render_template('index.html',
+                        teams_with_stats=teams_with_stats,
+                        standings_html=standings_html,
+                        team1_options=select_team_option(options_html, request.form.get('team1')),
+                        team2_options=select_team_option(options_html, request.form.get('team2')),
+                        prediction_result=prediction_result,
+                        error_message=error_message,
+                        last_updated=last_updated,
+                        freshness=freshness,
+                        prediction_table_url=prediction_table_url or url_for('main.api_prediction_table', v=version))
+
 @main_bp.route('/', methods=['GET', 'POST'])
 def index():
     """Main page with team selection and prediction"""
@@ -592,95 +1010,64 @@ def index():
                                 error_message="Database not available. Please try again later.",
                                 last_updated=None)
         
-        # Get teams with stats
-        teams_with_stats = current_app.db.get_all_teams_with_stats()
-        
-        # Debug: Log team count and data
-        print(f"🔍 Found {len(teams_with_stats) if teams_with_stats else 0} teams in database")
-        if teams_with_stats:
-            print("📋 Teams found:")
-            for team in teams_with_stats:
-                print(f"  - {team.get('team', 'Unknown')} (Group {team.get('group_name', 'Unknown')}): {team.get('record', 'Unknown')}")
+        # Sorted and grouped teams, shared by every request until the standings version moves
+        page_cache = current_app.page_cache
+        snapshot = current_app.standings_cache.snapshot()
+        teams_with_stats, standings = page_cache.get_or_render(
+            'index:teams', snapshot.version, lambda: index_view_data(snapshot))
         
-        if not teams_with_stats or len(teams_with_stats) < 6:  # Temporarily lowered from 10 to 6
-            print(f"⚠️ Not enough teams ({len(teams_with_stats) if teams_with_stats else 0}), showing no-data section")
+        if len(teams_with_stats) < 6:  # Temporarily lowered from 10 to 6
+            print(f"⚠️ Not enough teams ({len(teams_with_stats)}), showing no-data section")
             return render_template('index.html',
                                 teams_with_stats=[],
                                 prediction_result=None,
                                 error_message="No VCT data available. Please use the Update button to fetch current tournament data.",
                                 last_updated=None)
         
-        # Sort teams by record (best to worst)
-        def parse_record(record_str):
-            """Parse record string like '4-0' to get wins and losses"""
-            try:
-                if '-' in record_str:
-                    wins, losses = map(int, record_str.split('-'))
-                    return wins, losses
-                elif '–' in record_str:  # Handle en dash
-                    wins, losses = map(int, record_str.split('–'))
-                    return wins, losses
-                else:
-                    return 0, 0
-            except:
-                return 0, 0
-        
-        def sort_teams(team):
-            """Sort key for teams: wins (desc), then losses (asc)"""
-            wins, losses = parse_record(team['record'])
-            return (-wins, losses)  # Negative wins for descending order
-        
-        # Sort teams within each group
-        teams_with_stats.sort(key=sort_teams)
+        if request.method == 'GET':
+            # A GET render only changes with the standings version, apart from the
+            # stale notice and last update time, which may lag by PAGE_CACHE_MAX_AGE_SECONDS
+            return page_cache.get_or_render(
+                'page:index', snapshot.version,
+                lambda: render_index(snapshot.version, teams_with_stats, standings),
+                max_age=page_cache.max_age)
         
         # Handle form submission for prediction
         prediction_result = None
         error_message = None
         
-        if request.method == 'POST':
-            try:
-                team1_id = request.form.get('team1')
-                team2_id = request.form.get('team2')
+        try:
+            team1_id = request.form.get('team1')
+            team2_id = request.form.get('team2')
+            
+            if not team1_id or not team2_id:
+                error_message = 'Please select two teams'
+            elif team1_id == team2_id:
+                error_message = 'Please select two different teams'
+            else:
+                # Find the selected teams
+                team1 = next((t for t in teams_with_stats if str(t['id']) == team1_id), None)
+                team2 = next((t for t in teams_with_stats if str(t['id']) == team2_id), None)
                 
-                if not team1_id or not team2_id:
-                    error_message = 'Please select two teams'
-                elif team1_id == team2_id:
-                    error_message = 'Please select two different teams'
+                if not team1 or not team2:
+                    error_message = 'One or both selected teams are invalid'
+                elif (team1['event_id'], team1['stage']) != (team2['event_id'], team2['stage']):
+                    error_message = f'Teams must be from the same event. {team1["team"]} plays in {event_name(team1)} and {team2["team"]} plays in {event_name(team2)}'
+                elif team1['group_name'] != team2['group_name']:
+                    error_message = f'Teams must be from the same group. {team1["team"]} is in Group {team1["group_name"]} and {team2["team"]} is in Group {team2["group_name"]}'
                 else:
-                    # Find the selected teams
-                    team1 = next((t for t in teams_with_stats if str(t['id']) == team1_id), None)
-                    team2 = next((t for t in teams_with_stats if str(t['id']) == team2_id), None)
-                    
-                    if not team1 or not team2:
-                        error_message = 'One or both selected teams are invalid'
-                    elif team1['group_name'] != team2['group_name']:
-                        error_message = f'Teams must be from the same group. {team1["team"]} is in Group {team1["group_name"]} and {team2["team"]} is in Group {team2["group_name"]}'
-                    else:
-                        # Make prediction
-                        try:
-                            prediction_result = current_app.predictor.predict_match_winner(team1['team'], team2['team'])
-                            if 'error' in prediction_result:
-                                error_message = prediction_result['error']
-                        except Exception as e:
-                            error_message = f'Prediction failed: {str(e)}'
-                            
-            except Exception as e:
-                error_message = f'An error occurred: {str(e)}'
-        
-        # Get last updated time
-        last_updated = None
-        if teams_with_stats:
-            try:
-                # Try to get the most recent update time from the database
-                last_updated = current_app.db.get_last_update_time()
-            except:
-                last_updated = datetime.now()
+                    # Make prediction
+                    try:
+                        prediction_result = current_app.predictor.predict_match_winner(team1['team'], team2['team'], event_id=team1['event_id'])
+                        if 'error' in prediction_result:
+                            error_message = prediction_result['error']
+                    except Exception as e:
+                        error_message = f'Prediction failed: {str(e)}'
+                        
+        except Exception as e:
+            error_message = f'An error occurred: {str(e)}'
         
-        return render_template('index.html',
-                            teams_with_stats=teams_with_stats,
-                            prediction_result=prediction_result,
-                            error_message=error_message,
-                            last_updated=last_updated)
+        return render_index(snapshot.version, teams_with_stats, standings, prediction_result, error_message)
                             
     except Exception as e:
         return render_template('index.html',
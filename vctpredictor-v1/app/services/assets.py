@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+VCT Static Assets
+Content-hash fingerprinted static files with precompressed variants, and
+compression of dynamic HTML and JSON responses
+"""
+
+import os
+import gzip
+import hashlib
+import logging
+import mimetypes
+import threading
+from collections import OrderedDict
+import brotli
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+# Static files are compressed once, so they get the slowest, smallest settings
+STATIC_LEVELS = {'br': 11, 'gzip': 9}
+DYNAMIC_LEVELS = {'br': 5, 'gzip': 6}
+PREFERENCE = ('br', 'gzip')
+
+
+def is_compressible(mimetype):
+    return bool(mimetype) and mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+def accepted_encodings(accept_encoding):
+    """Encodings an Accept-Encoding header allows (q=0 excludes one)"""
+    accepted = set()
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        params = params.strip()
+        try:
+            quality = float(params[2:]) if params.startswith('q=') else 1.0
+        except ValueError:
+            quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def choose_encoding(accept_encoding, available):
+    """The preferred encoding in `available` the client accepts, or None"""
+    accepted = accepted_encodings(accept_encoding)
+    return next((encoding for encoding in PREFERENCE
+                 if encoding in available and (encoding in accepted or '*' in accepted)), None)
+
+
+def compress(body, encoding, levels=DYNAMIC_LEVELS):
+    if encoding == 'br':
+        return brotli.compress(body, quality=levels['br'])
+    return gzip.compress(body, compresslevel=levels['gzip'], mtime=0)
+
+
+class Asset:
+    """One static file: its fingerprint and the bytes of each encoding"""
+
+    def __init__(self, name, content):
+        self.name = name
+        self.hash = hashlib.sha256(content).hexdigest()[:12]
+        self.mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        stem, ext = os.path.splitext(name)
+        self.url_name = f"{stem}.{self.hash}{ext}"
+        self.variants = {'identity': content}
+        if is_compressible(self.mimetype):
+            for encoding in PREFERENCE:
+                compressed = compress(content, encoding, STATIC_LEVELS)
+                if len(compressed) < len(content):
+                    self.variants[encoding] = compressed
+
+
+class AssetManifest:
+    """
+    Every file under the static folder, read and compressed once at
+    startup (in the gunicorn master when the app is preloaded, so workers
+    share it). Pages link to /assets/<name>.<hash>.<ext>, which changes
+    whenever the content does, so those URLs can be cached for a year.
+    """
+
+    def __init__(self, folder, enabled=None):
+        self.folder = folder
+        self.enabled = Config.STATIC_FINGERPRINTS if enabled is None else enabled
+        self.assets = {}
+        self._by_url_name = {}
+
+    def build(self):
+        assets = {}
+        for root, _, files in os.walk(self.folder):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                name = os.path.relpath(path, self.folder).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    assets[name] = Asset(name, f.read())
+        self.assets = assets
+        self._by_url_name = {asset.url_name: asset for asset in assets.values()}
+        logger.info(f"🗂️ Fingerprinted {len(assets)} static files (gzip and brotli)")
+        return self
+
+    def url_name(self, name):
+        """The fingerprinted name for a static file, or None when it is not in the manifest"""
+        asset = self.assets.get(name) if self.enabled else None
+        return asset.url_name if asset else None
+
+    def lookup(self, url_name):
+        """
+        (asset, current) for a fingerprinted name. A page rendered before a
+        deploy may ask for an older hash; it gets the current file with
+        current=False, which must not be cached as immutable.
+        """
+        asset = self._by_url_name.get(url_name)
+        if asset:
+            return asset, True
+        stem, ext = os.path.splitext(url_name)
+        asset = self.assets.get(f"{stem.rpartition('.')[0]}{ext}")
+        return asset, False
+
+    def status(self):
+        return {
+            'enabled': self.enabled,
+            'files': len(self.assets),
+            'encodings': list(PREFERENCE)
+        }
+
+
+class Compressor:
+    """
+    Compresses dynamic responses above COMPRESS_MIN_BYTES. The last few
+    results are kept by content hash, so a page or JSON body served from
+    a cache is compressed once rather than on every request.
+    """
+
+    def __init__(self, enabled=None, min_bytes=None, cache_entries=32):
+        self.enabled = Config.COMPRESSION if enabled is None else enabled
+        self.min_bytes = Config.COMPRESS_MIN_BYTES if min_bytes is None else min_bytes
+        self.cache_entries = cache_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def eligible(self, mimetype, size):
+        """Whether a response's encoding depends on Accept-Encoding (it needs Vary)"""
+        return self.enabled and size >= self.min_bytes and is_compressible(mimetype)
+
+    def compress(self, body, mimetype, accept_encoding):
+        """(body, encoding) with encoding None when the body goes out as it is"""
+        if not self.eligible(mimetype, len(body)):
+            return body, None
+        encoding = choose_encoding(accept_encoding, PREFERENCE)
+        if encoding is None:
+            return body, None
+
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        with self._lock:
+            compressed = self._cache.get(key)
+            if compressed is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return compressed, encoding
+            self.misses += 1
+
+        compressed = compress(body, encoding)
+        if len(compressed) >= len(body):
+            return body, None
+        with self._lock:
+            self._cache[key] = compressed
+            if len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return compressed, encoding
+
+    def status(self):
+        return {
+            'enabled': self.enabled,
+            'min_bytes': self.min_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+VCT Circuit Breaker
+Stops calling vlr.gg while it is failing; state is shared through the database
+"""
+
+import logging
+from datetime import datetime, timedelta
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request while the breaker is open"""
+
+    def __init__(self, name, retry_at=None):
+        self.name = name
+        self.retry_at = retry_at
+        super().__init__(f"Circuit '{name}' is open" + (f" until {retry_at}" if retry_at else ""))
+
+
+class CircuitBreaker:
+    """
+    Closed: calls go through and consecutive failures are counted; reaching
+    CIRCUIT_FAILURE_THRESHOLD opens the breaker.
+    Open: calls fail immediately with CircuitOpenError until retry_at.
+    Half-open: after retry_at one process wins the transition and makes a
+    single probe call. Success closes the breaker, failure opens it again.
+
+    The state lives in the circuit_breakers table so every worker, the
+    scheduler and manual scrapes see the same breaker. If that table cannot
+    be read the breaker stays out of the way and calls go through.
+    """
+
+    def __init__(self, db, name, failure_threshold=None, recovery_seconds=None, probe_timeout_seconds=None):
+        self.db = db
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.recovery_seconds = recovery_seconds or Config.CIRCUIT_RECOVERY_SECONDS
+        self.probe_timeout_seconds = probe_timeout_seconds or Config.CIRCUIT_PROBE_TIMEOUT_SECONDS
+
+    def status(self):
+        """The stored breaker row plus whether calls are currently rejected"""
+        try:
+            row = self.db.get_circuit_breaker(self.name)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read circuit breaker '{self.name}': {e}")
+            return None
+        row['rejecting'] = self._rejecting(row)
+        return row
+
+    def is_open(self):
+        status = self.status()
+        return bool(status and status['rejecting'])
+
+    def _rejecting(self, row, now=None):
+        if row['state'] == CLOSED:
+            return False
+        # Open: wait out the recovery time. Half-open: the probe holder gets
+        # probe_timeout_seconds before someone else may probe.
+        return bool(row['retry_at']) and (now or datetime.now()).isoformat() < row['retry_at']
+
+    def before_call(self):
+        """
+        Raise CircuitOpenError unless a call may go out now. Returns True when
+        this call is the half-open probe, which callers should not retry.
+        """
+        try:
+            row = self.db.get_circuit_breaker(self.name)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read circuit breaker '{self.name}': {e}")
+            return False
+
+        if row['state'] == CLOSED:
+            return False
+        if self._rejecting(row):
+            raise CircuitOpenError(self.name, row['retry_at'])
+
+        # Recovery time is up (or a previous probe went silent): try to take the probe
+        probe_until = (datetime.now() + timedelta(seconds=self.probe_timeout_seconds)).isoformat()
+        if not self.db.transition_breaker(self.name, row['state'], HALF_OPEN, retry_at=probe_until,
+                                          from_retry_at=row['retry_at']):
+            raise CircuitOpenError(self.name, row['retry_at'])
+        logger.info(f"🔌 Circuit '{self.name}' half-open, sending a probe request")
+        return True
+
+    def record_success(self):
+        try:
+            row = self.db.get_circuit_breaker(self.name)
+            if row['state'] == CLOSED and not row['failure_count']:
+                return
+            self.db.record_breaker_success(self.name)
+            if row['state'] != CLOSED:
+                logger.info(f"✅ Circuit '{self.name}' closed, {self.name} is responding again")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not update circuit breaker '{self.name}': {e}")
+
+    def record_failure(self, error):
+        try:
+            row = self.db.record_breaker_failure(self.name, str(error))
+            retry_at = (datetime.now() + timedelta(seconds=self.recovery_seconds)).isoformat()
+            if row['state'] == HALF_OPEN:
+                if self.db.transition_breaker(self.name, HALF_OPEN, OPEN, retry_at=retry_at, trip=True):
+                    logger.warning(f"⛔ Circuit '{self.name}' probe failed, open again until {retry_at[:19]}")
+            elif row['state'] == CLOSED and row['failure_count'] >= self.failure_threshold:
+                if self.db.transition_breaker(self.name, CLOSED, OPEN, retry_at=retry_at, trip=True):
+                    logger.warning(f"⛔ Circuit '{self.name}' opened after {row['failure_count']} failures "
+                                   f"({error}); retrying after {retry_at[:19]}")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not update circuit breaker '{self.name}': {e}")
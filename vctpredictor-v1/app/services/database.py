@@ -1,5 +1,6 @@
 # MVP 3: Database Operations
 
+import json
 import logging
 import os
 from datetime import datetime, timedelta
@@ -7,23 +8,68 @@ from datetime import datetime, timedelta
 logger = logging.getLogger(__name__)
 
 class MatchDatabase:
+    # scrape_state key prefix for the content hash of each event's last written standings
+    STANDINGS_HASH_KEY = 'standings_hash'
+    # scrape_state key holding when the standings last actually changed (ISO timestamp)
+    STANDINGS_CHANGED_KEY = 'standings_changed_at'
+    # scrape_state key holding when a scrape last succeeded (ISO timestamp)
+    STANDINGS_SCRAPED_KEY = 'standings_scraped_at'
+    # scrape_state key counting writes to group_standings; caches reload when it moves
+    STANDINGS_VERSION_KEY = 'standings_version'
+    # PostgreSQL NOTIFY channel carrying the new standings version after each write
+    STANDINGS_CHANNEL = 'vct_standings'
+    # Rows stored before standings were keyed by event all came from this event
+    LEGACY_STANDINGS_EVENT = {'region': 'americas', 'event_id': '2501', 'stage': 'Stage 2'}
+    # The single scraper_health row
+    HEALTH_ROW_ID = 1
+    # Column order of scrape_jobs rows as returned by the job queries
+    JOB_COLUMNS = ('id', 'job_type', 'dedupe_key', 'status', 'stage', 'progress', 'result', 'error',
+                   'created_at', 'started_at', 'finished_at', 'updated_at')
+    # Column order of scheduled_jobs rows
+    SCHEDULED_JOB_COLUMNS = ('name', 'schedule', 'next_run_at', 'next_run_reason', 'last_started_at',
+                             'last_finished_at', 'last_status', 'last_stage', 'last_error', 'last_result',
+                             'last_duration', 'run_owner', 'updated_at')
+    # Column order of scheduler_locks rows
+    LOCK_COLUMNS = ('name', 'owner', 'acquired_at', 'heartbeat_at', 'expires_at')
+    # Column order of scrape_runs rows
+    SCRAPE_RUN_COLUMNS = ('id', 'started_at', 'finished_at', 'duration_seconds', 'outcome', 'teams_count',
+                          'pages', 'bytes_downloaded', 'tables_examined', 'tables_accepted', 'rows_parsed',
+                          'fetch_seconds', 'parse_seconds', 'write_seconds', 'spans')
+    # Column order of circuit_breakers rows
+    BREAKER_COLUMNS = ('name', 'state', 'failure_count', 'trip_count', 'opened_at', 'retry_at',
+                       'last_failure_at', 'last_success_at', 'last_error', 'updated_at')
+    
     def __init__(self, db_path='val_standings.db'):
         self.db_path = db_path
         self.is_postgres = db_path.startswith('postgresql://')
         self.init_database()
         
     def get_connection(self):
-        """Get database connection based on type"""
+        """Get database connection based on type; PostgreSQL ones come from the process's pool"""
         if self.is_postgres:
+            from app.services.db_pool import get_pool
             try:
-                import psycopg2
-                return psycopg2.connect(self.db_path)
+                return get_pool(self.db_path).acquire()
             except ImportError:
                 logger.error("psycopg2 not available for PostgreSQL")
                 raise
         else:
             import sqlite3
             return sqlite3.connect(self.db_path)
+
+    def get_dedicated_connection(self):
+        """
+        A connection outside the pool, for sessions that hold state for their
+        whole life (LISTEN, advisory locks) and must never be handed to anyone else
+        """
+        if self.is_postgres:
+            try:
+                import psycopg2
+                return psycopg2.connect(self.db_path)
+            except ImportError:
+                logger.error("psycopg2 not available for PostgreSQL")
+                raise
+        return self.get_connection()
     
     def init_database(self):
         """Initialize database with required tables"""
@@ -32,21 +78,10 @@ class MatchDatabase:
         
         try:
             # Create group standings table
+            cursor.execute(self._group_standings_schema(if_not_exists=True))
+            self._upgrade_group_standings(cursor)
+            
             if self.is_postgres:
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS group_standings (
-                        id SERIAL PRIMARY KEY,
-                        group_name VARCHAR(50) NOT NULL,
-                        team VARCHAR(100) NOT NULL,
-                        record VARCHAR(20) NOT NULL,
-                        map_diff VARCHAR(20) NOT NULL,
-                        round_diff VARCHAR(20) NOT NULL,
-                        delta REAL NOT NULL,
-                        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(group_name, team)
-                    )
-                """)
-                
                 # Create scraper health tracking table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS scraper_health (
@@ -72,20 +107,6 @@ class MatchDatabase:
                     )
                 """)
             else:
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS group_standings (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        group_name TEXT NOT NULL,
-                        team TEXT NOT NULL,
-                        record TEXT NOT NULL,
-                        map_diff TEXT NOT NULL,
-                        round_diff TEXT NOT NULL,
-                        delta REAL NOT NULL,
-                        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(group_name, team)
-                    )
-                """)
-                
                 # Create scraper health tracking table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS scraper_health (
@@ -111,6 +132,9 @@ class MatchDatabase:
                     )
                 """)
             
+            self._upgrade_scraper_health(cursor)
+            self._create_auxiliary_tables(cursor)
+            
             conn.commit()
             
             # Initialize basic health data if table is empty
@@ -122,6 +146,265 @@ class MatchDatabase:
         finally:
             conn.close()
     
+    def _upgrade_scraper_health(self, cursor):
+        """Collapse scraper_health to its single row (id 1), keeping the latest state"""
+        cursor.execute("SELECT COUNT(*), MIN(id) FROM scraper_health")
+        count, first_id = cursor.fetchone()
+        if count == 0 or (count == 1 and first_id == self.HEALTH_ROW_ID):
+            return
+        
+        # Older versions appended a row per update on PostgreSQL
+        logger.info(f"Collapsing {count} scraper_health rows into one")
+        cursor.execute("""
+            SELECT last_run, status, success_count, total_runs, last_error
+            FROM scraper_health ORDER BY updated_at DESC, id DESC LIMIT 1
+        """)
+        latest = cursor.fetchone()
+        cursor.execute("DELETE FROM scraper_health")
+        cursor.execute(self._sql("""
+            INSERT INTO scraper_health (id, last_run, status, success_count, total_runs, last_error, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """), (self.HEALTH_ROW_ID,) + tuple(latest))
+    
+    def _group_standings_schema(self, if_not_exists=False):
+        """CREATE statement for group_standings, keyed by (region, event, stage, group, team)"""
+        text = 'VARCHAR(100)' if self.is_postgres else 'TEXT'
+        return f"""
+            CREATE TABLE {'IF NOT EXISTS ' if if_not_exists else ''}group_standings (
+                id {'SERIAL PRIMARY KEY' if self.is_postgres else 'INTEGER PRIMARY KEY AUTOINCREMENT'},
+                region {text} NOT NULL,
+                event_id {text} NOT NULL,
+                stage {text} NOT NULL,
+                group_name {text} NOT NULL,
+                team {text} NOT NULL,
+                record {text} NOT NULL,
+                map_diff {text} NOT NULL,
+                round_diff {text} NOT NULL,
+                delta REAL NOT NULL,
+                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(region, event_id, stage, group_name, team)
+            )
+        """
+    
+    def _upgrade_group_standings(self, cursor):
+        """Move a single-event group_standings table to the multi-event key, then index it"""
+        if self.is_postgres:
+            cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name = 'group_standings'")
+        else:
+            cursor.execute("PRAGMA table_info(group_standings)")
+        columns = {row[0] if self.is_postgres else row[1] for row in cursor.fetchall()}
+        
+        if 'region' not in columns:
+            legacy = self.LEGACY_STANDINGS_EVENT
+            logger.info("Migrating group_standings to (region, event_id, stage, group_name, team) keys")
+            if self.is_postgres:
+                cursor.execute("""
+                    ALTER TABLE group_standings
+                        ADD COLUMN region VARCHAR(100),
+                        ADD COLUMN event_id VARCHAR(100),
+                        ADD COLUMN stage VARCHAR(100)
+                """)
+                cursor.execute("UPDATE group_standings SET region = %s, event_id = %s, stage = %s",
+                               (legacy['region'], legacy['event_id'], legacy['stage']))
+                cursor.execute("""
+                    ALTER TABLE group_standings
+                        ALTER COLUMN region SET NOT NULL,
+                        ALTER COLUMN event_id SET NOT NULL,
+                        ALTER COLUMN stage SET NOT NULL,
+                        DROP CONSTRAINT IF EXISTS group_standings_group_name_team_key,
+                        ADD CONSTRAINT group_standings_region_event_id_stage_group_name_team_key
+                            UNIQUE (region, event_id, stage, group_name, team)
+                """)
+            else:
+                # SQLite cannot change a UNIQUE constraint in place, so rebuild the table
+                cursor.execute("ALTER TABLE group_standings RENAME TO group_standings_legacy")
+                cursor.execute(self._group_standings_schema())
+                cursor.execute("""
+                    INSERT INTO group_standings (id, region, event_id, stage, group_name, team, record,
+                                                 map_diff, round_diff, delta, last_updated)
+                    SELECT id, ?, ?, ?, group_name, team, record, map_diff, round_diff, delta, last_updated
+                    FROM group_standings_legacy
+                """, (legacy['region'], legacy['event_id'], legacy['stage']))
+                cursor.execute("DROP TABLE group_standings_legacy")
+        
+        # Per-event reads filter on event and group; the unique key leads with region
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_group_standings_event
+            ON group_standings (event_id, stage, group_name)
+        """)
+    
+    def _sql(self, query):
+        """Adapt a '?'-style query to the active driver's parameter style"""
+        return query.replace('?', '%s') if self.is_postgres else query
+    
+    def _create_auxiliary_tables(self, cursor):
+        """Create the scraper state and match results tables"""
+        if self.is_postgres:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_state (
+                    key VARCHAR(100) PRIMARY KEY,
+                    value TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS matches (
+                    id SERIAL PRIMARY KEY,
+                    match_id VARCHAR(50) NOT NULL UNIQUE,
+                    date VARCHAR(20) NOT NULL,
+                    team1 VARCHAR(100) NOT NULL,
+                    team2 VARCHAR(100) NOT NULL,
+                    team1_score INTEGER NOT NULL,
+                    team2_score INTEGER NOT NULL,
+                    map_name VARCHAR(50),
+                    tournament VARCHAR(200),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+        else:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS matches (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    match_id TEXT NOT NULL UNIQUE,
+                    date TEXT NOT NULL,
+                    team1 TEXT NOT NULL,
+                    team2 TEXT NOT NULL,
+                    team1_score INTEGER NOT NULL,
+                    team2_score INTEGER NOT NULL,
+                    map_name TEXT,
+                    tournament TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+        
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (date)")
+        
+        # Background jobs; timestamps are ISO strings written by the app so they compare consistently
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_jobs (
+                id VARCHAR(36) PRIMARY KEY,
+                job_type VARCHAR(50) NOT NULL,
+                dedupe_key VARCHAR(100),
+                status VARCHAR(20) NOT NULL,
+                stage VARCHAR(20),
+                progress TEXT,
+                result TEXT,
+                error TEXT,
+                created_at VARCHAR(32) NOT NULL,
+                started_at VARCHAR(32),
+                finished_at VARCHAR(32),
+                updated_at VARCHAR(32) NOT NULL
+            )
+        """)
+        # At most one pending/running job per dedupe key
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_scrape_jobs_active
+            ON scrape_jobs (dedupe_key) WHERE status IN ('pending', 'running')
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scrape_jobs_status ON scrape_jobs (status, updated_at)")
+        
+        # Periodic job definitions and their persisted next-run times
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scheduled_jobs (
+                name VARCHAR(100) PRIMARY KEY,
+                schedule VARCHAR(200) NOT NULL,
+                next_run_at VARCHAR(32),
+                next_run_reason VARCHAR(200),
+                last_started_at VARCHAR(32),
+                last_finished_at VARCHAR(32),
+                last_status VARCHAR(20),
+                last_stage VARCHAR(50),
+                last_error TEXT,
+                last_result TEXT,
+                last_duration REAL,
+                run_owner VARCHAR(200),
+                updated_at VARCHAR(32) NOT NULL
+            )
+        """)
+        
+        # Leases for cluster-wide singleton work such as the scheduled scrape
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scheduler_locks (
+                name VARCHAR(100) PRIMARY KEY,
+                owner VARCHAR(200) NOT NULL,
+                acquired_at VARCHAR(32) NOT NULL,
+                heartbeat_at VARCHAR(32) NOT NULL,
+                expires_at VARCHAR(32) NOT NULL
+            )
+        """)
+        
+        # One row per scrape run with its trace; spans is a JSON list
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_runs (
+                id VARCHAR(36) PRIMARY KEY,
+                started_at VARCHAR(32) NOT NULL,
+                finished_at VARCHAR(32),
+                duration_seconds REAL,
+                outcome VARCHAR(20) NOT NULL,
+                teams_count INTEGER,
+                pages INTEGER,
+                bytes_downloaded INTEGER,
+                tables_examined INTEGER,
+                tables_accepted INTEGER,
+                rows_parsed INTEGER,
+                fetch_seconds REAL,
+                parse_seconds REAL,
+                write_seconds REAL,
+                spans TEXT
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scrape_runs_started ON scrape_runs (started_at)")
+        
+        # Scraper status changes and run outcomes, newest kept up to HEALTH_HISTORY_KEEP
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS scraper_health_history (
+                id {'SERIAL PRIMARY KEY' if self.is_postgres else 'INTEGER PRIMARY KEY AUTOINCREMENT'},
+                status VARCHAR(50) NOT NULL,
+                success INTEGER,
+                error TEXT,
+                recorded_at VARCHAR(32) NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scraper_health_history_recorded "
+                       "ON scraper_health_history (recorded_at)")
+        
+        # Sliding window counters for RATE_LIMIT_STORE=database; not dropped by
+        # reset_database, which would hand out fresh limits to the reset endpoints
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key VARCHAR(200) PRIMARY KEY,
+                window_index BIGINT NOT NULL,
+                previous_count INTEGER NOT NULL DEFAULT 0,
+                current_count INTEGER NOT NULL DEFAULT 0,
+                updated_at BIGINT NOT NULL
+            )
+        """)
+        
+        # Circuit breakers around outbound HTTP, shared by every worker process
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS circuit_breakers (
+                name VARCHAR(100) PRIMARY KEY,
+                state VARCHAR(20) NOT NULL,
+                failure_count INTEGER NOT NULL DEFAULT 0,
+                trip_count INTEGER NOT NULL DEFAULT 0,
+                opened_at VARCHAR(32),
+                retry_at VARCHAR(32),
+                last_failure_at VARCHAR(32),
+                last_success_at VARCHAR(32),
+                last_error TEXT,
+                updated_at VARCHAR(32) NOT NULL
+            )
+        """)
+    
     def init_basic_health_data(self):
         """Initialize basic health data if the scraper_health table is empty"""
         try:
@@ -138,16 +421,10 @@ class MatchDatabase:
             
             if count == 0:
                 # Insert initial health data
-                if self.is_postgres:
-                    cursor.execute("""
-                        INSERT INTO scraper_health (status, success_count, total_runs, last_run, created_at, updated_at)
-                        VALUES ('initializing', 0, 0, NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                    """)
-                else:
-                    cursor.execute("""
-                        INSERT INTO scraper_health (status, success_count, total_runs, last_run, created_at, updated_at)
-                        VALUES ('initializing', 0, 0, NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                    """)
+                cursor.execute(self._sql("""
+                    INSERT INTO scraper_health (id, status, success_count, total_runs, last_run, created_at, updated_at)
+                    VALUES (?, 'initializing', 0, 0, NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                """), (self.HEALTH_ROW_ID,))
                 
                 conn.commit()
                 print("✅ Initialized basic health data")
@@ -166,12 +443,13 @@ class MatchDatabase:
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
-                INSERT OR IGNORE INTO matches 
+            cursor.execute(self._sql('''
+                INSERT INTO matches 
                 (match_id, date, team1, team2, team1_score, team2_score, 
                  map_name, tournament, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+                ON CONFLICT (match_id) DO NOTHING
+            '''), (
                 match_data.get('match_id', ''),
                 match_data['date'],
                 match_data['team1'],
@@ -195,7 +473,9 @@ class MatchDatabase:
     
     def insert_matches_batch(self, matches_list):
         """
-        Insert multiple matches efficiently
+        Insert multiple matches efficiently in one transaction.
+        Returns the number of new rows; raises if the batch could not be
+        written, so callers never mistake a failed batch for duplicates.
         """
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -204,12 +484,13 @@ class MatchDatabase:
         
         try:
             for match_data in matches_list:
-                cursor.execute('''
-                    INSERT OR IGNORE INTO matches 
+                cursor.execute(self._sql('''
+                    INSERT INTO matches 
                     (match_id, date, team1, team2, team1_score, team2_score, 
                      map_name, tournament, created_at)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                    ON CONFLICT (match_id) DO NOTHING
+                '''), (
                     match_data.get('match_id', ''),
                     match_data['date'],
                     match_data['team1'],
@@ -233,8 +514,9 @@ class MatchDatabase:
             
         except Exception as e:
             logger.error(f"Error in batch insert: {e}")
+            conn.rollback()
             self.record_data_update(0, f"error: {e}")
-            return 0
+            raise
         finally:
             conn.close()
     
@@ -244,10 +526,10 @@ class MatchDatabase:
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
+            cursor.execute(self._sql('''
                 INSERT INTO data_updates (update_date, matches_added, status, created_at)
                 VALUES (?, ?, ?, ?)
-            ''', (
+            '''), (
                 datetime.now().date().isoformat(),
                 matches_added,
                 status,
@@ -259,6 +541,22 @@ class MatchDatabase:
         finally:
             conn.close()
     
+    def get_existing_match_ids(self, match_ids):
+        """Return the subset of match_ids that are already stored"""
+        match_ids = list(match_ids)
+        if not match_ids:
+            return set()
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            placeholders = ', '.join(['?'] * len(match_ids))
+            cursor.execute(self._sql(f"SELECT match_id FROM matches WHERE match_id IN ({placeholders})"), match_ids)
+            return {row[0] for row in cursor.fetchall()}
+        finally:
+            conn.close()
+    
     def get_team_recent_matches(self, team_name, days_back=30, limit=20):
         """
         Get recent matches for a team
@@ -268,13 +566,13 @@ class MatchDatabase:
         
         cutoff_date = (datetime.now() - timedelta(days=days_back)).date().isoformat()
         
-        cursor.execute('''
+        cursor.execute(self._sql('''
             SELECT * FROM matches 
             WHERE (LOWER(team1) = LOWER(?) OR LOWER(team2) = LOWER(?))
             AND date >= ?
             ORDER BY date DESC 
             LIMIT ?
-        ''', (team_name, team_name, cutoff_date, limit))
+        '''), (team_name, team_name, cutoff_date, limit))
         
         matches = []
         for row in cursor.fetchall():
@@ -352,7 +650,7 @@ class MatchDatabase:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
+        cursor.execute(self._sql('''
             SELECT * FROM matches 
             WHERE (
                 (LOWER(team1) = LOWER(?) AND LOWER(team2) = LOWER(?))
@@ -361,7 +659,7 @@ class MatchDatabase:
             )
             ORDER BY date DESC 
             LIMIT ?
-        ''', (team1, team2, team2, team1, limit))
+        '''), (team1, team2, team2, team1, limit))
         
         matches = []
         team1_wins = 0
@@ -436,38 +734,61 @@ class MatchDatabase:
         # Get teams with matches in last 60 days
         cutoff_date = (datetime.now() - timedelta(days=60)).date().isoformat()
         
-        cursor.execute('''
+        cursor.execute(self._sql('''
             SELECT DISTINCT team1 as team FROM matches WHERE date >= ?
             UNION
             SELECT DISTINCT team2 as team FROM matches WHERE date >= ?
             ORDER BY team
-        ''', (cutoff_date, cutoff_date))
+        '''), (cutoff_date, cutoff_date))
         
         teams = [row[0] for row in cursor.fetchall()]
         conn.close()
         
         return teams
-    
-    def get_all_teams_with_stats(self, days_back=30):
+
+    def count_teams(self):
+        """Number of stored standings rows (cheap check used at startup)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("SELECT COUNT(*) FROM group_standings")
+            return cursor.fetchone()[0]
+        finally:
+            conn.close()
+
+    def get_all_teams_with_stats(self, days_back=30, region=None, event_id=None):
         """
-        Returns a list of all teams with their stats and group info from the group_standings table.
+        Returns a list of all teams with their stats and group info from the group_standings table,
+        optionally limited to one region or event.
         """
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
+            filters = []
+            params = []
+            if region:
+                filters.append("region = ?")
+                params.append(region)
+            if event_id:
+                filters.append("event_id = ?")
+                params.append(str(event_id))
+            where = f"WHERE {' AND '.join(filters)}" if filters else ""
+            
             # Get all teams from group_standings table
-            cursor.execute('''
-                SELECT id, group_name, team, record, map_diff, round_diff, delta, last_updated
+            cursor.execute(self._sql(f'''
+                SELECT id, region, event_id, stage, group_name, team, record, map_diff, round_diff, delta, last_updated
                 FROM group_standings
-                ORDER BY group_name, delta DESC
-            ''')
+                {where}
+                ORDER BY region, event_id, stage, group_name, delta DESC
+            '''), params)
             
             rows = cursor.fetchall()
             team_list = []
             
             for row in rows:
-                team_id, group_name, team, record, map_diff, round_diff, delta, last_updated = row
+                team_id, region, event_id, stage, group_name, team, record, map_diff, round_diff, delta, last_updated = row
                 
                 # Parse the record to get wins and losses
                 # Record format is like "4-0" or "3–1" (wins-losses)
@@ -496,6 +817,9 @@ class MatchDatabase:
                 team_entry = {
                     'id': team_id,
                     'team': team,
+                    'region': region,
+                    'event_id': event_id,
+                    'stage': stage,
                     'group_name': group_name,
                     'record': record,
                     'map_diff': map_diff,
@@ -517,23 +841,20 @@ class MatchDatabase:
         finally:
             conn.close()
     
-    def insert_match_data(self, group, team, record, map_diff, round_diff, delta):
-        """Insert or update match data for a team"""
+    def insert_match_data(self, group, team, record, map_diff, round_diff, delta, region=None, event_id=None, stage=None):
+        """Insert or update match data for a team (event defaults to the original Americas event)"""
+        region = region or self.LEGACY_STANDINGS_EVENT['region']
+        event_id = str(event_id or self.LEGACY_STANDINGS_EVENT['event_id'])
+        stage = stage or self.LEGACY_STANDINGS_EVENT['stage']
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
             # Check if team already exists in this group
-            if self.is_postgres:
-                cursor.execute("""
-                    SELECT id FROM group_standings 
-                    WHERE group_name = %s AND team = %s
-                """, (group, team))
-            else:
-                cursor.execute("""
-                    SELECT id FROM group_standings 
-                    WHERE group_name = ? AND team = ?
-                """, (group, team))
+            cursor.execute(self._sql("""
+                SELECT id FROM group_standings 
+                WHERE region = ? AND event_id = ? AND stage = ? AND group_name = ? AND team = ?
+            """), (region, event_id, stage, group, team))
             
             existing = cursor.fetchone()
             
@@ -553,16 +874,14 @@ class MatchDatabase:
                     """, (record, map_diff, round_diff, delta, existing[0]))
             else:
                 # Insert new record
-                if self.is_postgres:
-                    cursor.execute("""
-                        INSERT INTO group_standings (group_name, team, record, map_diff, round_diff, delta)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """, (group, team, record, map_diff, round_diff, delta))
-                else:
-                    cursor.execute("""
-                        INSERT INTO group_standings (group_name, team, record, map_diff, round_diff, delta)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (group, team, record, map_diff, round_diff, delta))
+                cursor.execute(self._sql("""
+                    INSERT INTO group_standings (region, event_id, stage, group_name, team, record, map_diff, round_diff, delta)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """), (region, event_id, stage, group, team, record, map_diff, round_diff, delta))
+            
+            # Rows written outside the scraper no longer match the stored hash
+            cursor.execute(self._sql("DELETE FROM scrape_state WHERE key = ?"), (self.standings_hash_key(event_id),))
+            self._bump_standings_version(cursor)
             
             conn.commit()
             conn.close()
@@ -572,60 +891,210 @@ class MatchDatabase:
             print(f"❌ Error inserting/updating match data: {e}")
             return False
 
-    def update_scraper_health(self, status, success_count=None, total_runs=None, error_message=None):
-        """Update scraper health status"""
+    def get_state(self, key, default=None):
+        """Get a value from the scrape_state table"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
-            if self.is_postgres:
-                cursor.execute("""
-                    INSERT INTO scraper_health (last_run, status, success_count, total_runs, last_error, updated_at)
-                    VALUES (CURRENT_TIMESTAMP, %s, %s, %s, %s, CURRENT_TIMESTAMP)
-                    ON CONFLICT (id) DO UPDATE SET
-                        last_run = CURRENT_TIMESTAMP,
-                        status = EXCLUDED.status,
-                        success_count = EXCLUDED.success_count,
-                        total_runs = EXCLUDED.total_runs,
-                        last_error = EXCLUDED.last_error,
-                        updated_at = CURRENT_TIMESTAMP
-                """, (status, success_count, total_runs, error_message))
-            else:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO scraper_health 
-                    (id, last_run, status, success_count, total_runs, last_error, updated_at)
-                    VALUES (1, CURRENT_TIMESTAMP, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (status, success_count, total_runs, error_message))
+            cursor.execute(self._sql("SELECT value FROM scrape_state WHERE key = ?"), (key,))
+            row = cursor.fetchone()
+            return row[0] if row else default
+        except Exception as e:
+            logger.error(f"Failed to read state '{key}': {e}")
+            return default
+        finally:
+            conn.close()
+    
+    def set_state(self, key, value):
+        """Insert or update a value in the scrape_state table"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            self._upsert_state(cursor, key, value)
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def _upsert_state(self, cursor, key, value):
+        """Write a scrape_state value using an existing cursor"""
+        cursor.execute(self._sql("""
+            INSERT INTO scrape_state (key, value, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (key) DO UPDATE SET
+                value = EXCLUDED.value,
+                updated_at = CURRENT_TIMESTAMP
+        """), (key, value))
+    
+    def _bump_standings_version(self, cursor):
+        """Increment the standings version in the caller's transaction"""
+        cursor.execute(self._sql("""
+            INSERT INTO scrape_state (key, value, updated_at)
+            VALUES (?, '1', CURRENT_TIMESTAMP)
+            ON CONFLICT (key) DO UPDATE SET
+                value = CAST(CAST(scrape_state.value AS INTEGER) + 1 AS TEXT),
+                updated_at = CURRENT_TIMESTAMP
+        """), (self.STANDINGS_VERSION_KEY,))
+        self._notify_standings_version(cursor)
+    
+    def _notify_standings_version(self, cursor):
+        """
+        Tell listening workers about the new version. pg_notify is
+        transactional, so it is delivered on commit and dropped on rollback.
+        SQLite has no NOTIFY; workers poll the version there instead.
+        """
+        if self.is_postgres:
+            cursor.execute("SELECT pg_notify(%s, (SELECT value FROM scrape_state WHERE key = %s))",
+                           (self.STANDINGS_CHANNEL, self.STANDINGS_VERSION_KEY))
+    
+    def get_standings_version(self):
+        """Current standings version (0 before the first write); one primary key lookup"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            # Unlike get_state, errors propagate so callers never mistake them for version 0
+            cursor.execute(self._sql("SELECT value FROM scrape_state WHERE key = ?"), (self.STANDINGS_VERSION_KEY,))
+            row = cursor.fetchone()
+            return int(row[0]) if row else 0
+        finally:
+            conn.close()
+    
+    def standings_hash_key(self, event_id):
+        """scrape_state key for one event's standings hash"""
+        return f"{self.STANDINGS_HASH_KEY}:{event_id}"
+    
+    def apply_standings_changes(self, event, added, changed, removed, content_hash):
+        """
+        Apply one event's standings diff in a single transaction and store its new
+        content hash. event holds region, event_id and stage; added/changed are
+        team dicts as produced by the scraper, removed holds (group_name, team) keys.
+        """
+        region, event_id, stage = event['region'], str(event['event_id']), event['stage']
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            insert_sql = self._sql("""
+                INSERT INTO group_standings (region, event_id, stage, group_name, team, record, map_diff, round_diff, delta)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """)
+            cursor.executemany(insert_sql, [
+                (region, event_id, stage, team_data['group_name'], team_data['team'], team_data['record'],
+                 team_data['map_diff'], team_data['round_diff'], team_data['delta'])
+                for team_data in added
+            ])
+            
+            update_sql = self._sql("""
+                UPDATE group_standings
+                SET record = ?, map_diff = ?, round_diff = ?, delta = ?, last_updated = CURRENT_TIMESTAMP
+                WHERE region = ? AND event_id = ? AND stage = ? AND group_name = ? AND team = ?
+            """)
+            cursor.executemany(update_sql, [
+                (team_data['record'], team_data['map_diff'], team_data['round_diff'], team_data['delta'],
+                 region, event_id, stage, team_data['group_name'], team_data['team'])
+                for team_data in changed
+            ])
+            
+            delete_sql = self._sql("""
+                DELETE FROM group_standings
+                WHERE region = ? AND event_id = ? AND stage = ? AND group_name = ? AND team = ?
+            """)
+            cursor.executemany(delete_sql, [(region, event_id, stage, group_name, team) for group_name, team in removed])
+            
+            self._upsert_state(cursor, self.standings_hash_key(event_id), content_hash)
+            if added or changed or removed:
+                self._upsert_state(cursor, self.STANDINGS_CHANGED_KEY, datetime.now().isoformat())
+                self._bump_standings_version(cursor)
+            conn.commit()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to apply standings changes: {e}")
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def update_scraper_health(self, status, success_count=0, total_runs=0, error_message=None, history=None,
+                              keep_history=None):
+        """
+        Set the scraper status and add success_count and total_runs to the
+        stored counters, in the single scraper_health row. The increments are
+        applied by the database, so processes recording runs concurrently
+        never overwrite each other's counts. history entries (status, success,
+        error, recorded_at) are appended to scraper_health_history.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql("""
+                INSERT INTO scraper_health (id, last_run, status, success_count, total_runs, last_error, updated_at)
+                VALUES (?, CURRENT_TIMESTAMP, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (id) DO UPDATE SET
+                    last_run = CURRENT_TIMESTAMP,
+                    status = EXCLUDED.status,
+                    success_count = COALESCE(scraper_health.success_count, 0) + EXCLUDED.success_count,
+                    total_runs = COALESCE(scraper_health.total_runs, 0) + EXCLUDED.total_runs,
+                    last_error = EXCLUDED.last_error,
+                    updated_at = CURRENT_TIMESTAMP
+            """), (self.HEALTH_ROW_ID, status, success_count, total_runs, error_message))
+            
+            for entry in history or []:
+                cursor.execute(self._sql("""
+                    INSERT INTO scraper_health_history (status, success, error, recorded_at) VALUES (?, ?, ?, ?)
+                """), (entry['status'], entry['success'], entry['error'], entry['recorded_at']))
+            if history and keep_history:
+                cursor.execute(self._sql("""
+                    DELETE FROM scraper_health_history WHERE id < (
+                        SELECT MIN(id) FROM (
+                            SELECT id FROM scraper_health_history ORDER BY id DESC LIMIT ?
+                        ) newest
+                    )
+                """), (keep_history,))
             
             conn.commit()
             logger.debug(f"Scraper health updated: {status}")
             
         except Exception as e:
+            conn.rollback()
             logger.error(f"Failed to update scraper health: {e}")
             raise
         finally:
             conn.close()
     
+    def get_scraper_health_history(self, limit=50):
+        """Recent scraper status changes and run outcomes, newest first"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql("""
+                SELECT status, success, error, recorded_at FROM scraper_health_history
+                ORDER BY recorded_at DESC, id DESC LIMIT ?
+            """), (limit,))
+            return [{
+                'status': status,
+                'success': None if success is None else bool(success),
+                'error': error,
+                'recorded_at': recorded_at
+            } for status, success, error, recorded_at in cursor.fetchall()]
+        finally:
+            conn.close()
+    
     def get_scraper_health(self):
         """Get current scraper health status"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
-            if self.is_postgres:
-                cursor.execute("""
-                    SELECT last_run, status, success_count, total_runs, last_error
-                    FROM scraper_health 
-                    ORDER BY updated_at DESC 
-                    LIMIT 1
-                """)
-            else:
-                cursor.execute("""
-                    SELECT last_run, status, success_count, total_runs, last_error
-                    FROM scraper_health 
-                    ORDER BY updated_at DESC 
-                    LIMIT 1
-                """)
+            cursor.execute(self._sql("""
+                SELECT last_run, status, success_count, total_runs, last_error
+                FROM scraper_health
+                WHERE id = ?
+            """), (self.HEALTH_ROW_ID,))
             
             result = cursor.fetchone()
             if result:
@@ -657,6 +1126,453 @@ class MatchDatabase:
         finally:
             conn.close()
 
+    def _job_from_row(self, row):
+        job = dict(zip(self.JOB_COLUMNS, row))
+        for field in ('progress', 'result'):
+            job[field] = json.loads(job[field]) if job[field] else None
+        return job
+    
+    def get_job(self, job_id):
+        """Get a background job by id"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql(f"SELECT {', '.join(self.JOB_COLUMNS)} FROM scrape_jobs WHERE id = ?"), (job_id,))
+            row = cursor.fetchone()
+            return self._job_from_row(row) if row else None
+        finally:
+            conn.close()
+    
+    def get_active_job(self, dedupe_key):
+        """Get the pending or running job holding a dedupe key, if any"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql(f"""
+                SELECT {', '.join(self.JOB_COLUMNS)} FROM scrape_jobs
+                WHERE dedupe_key = ? AND status IN ('pending', 'running')
+            """), (dedupe_key,))
+            row = cursor.fetchone()
+            return self._job_from_row(row) if row else None
+        finally:
+            conn.close()
+    
+    def create_job(self, job_id, job_type, dedupe_key=None, _retried=False):
+        """
+        Insert a pending job. Returns (job, created); when an active job already
+        holds the dedupe key that job is returned with created=False.
+        """
+        now = datetime.now().isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql("""
+                INSERT INTO scrape_jobs (id, job_type, dedupe_key, status, progress, created_at, updated_at)
+                VALUES (?, ?, ?, 'pending', '[]', ?, ?)
+            """), (job_id, job_type, dedupe_key, now, now))
+            conn.commit()
+            created = True
+        except Exception as e:
+            # The partial unique index rejects a second active job for the same key
+            conn.rollback()
+            if dedupe_key is None:
+                raise
+            logger.info(f"Job {dedupe_key} already active: {e}")
+            created = False
+        finally:
+            conn.close()
+        
+        if created:
+            return self.get_job(job_id), True
+        
+        existing = self.get_active_job(dedupe_key)
+        if existing is None:
+            if _retried:
+                raise RuntimeError(f"Could not create job for {dedupe_key}")
+            # The other job finished between our insert and lookup; try once more
+            return self.create_job(job_id, job_type, dedupe_key, _retried=True)
+        return existing, False
+    
+    def claim_job(self, job_id):
+        """Atomically move a pending job to running; False if someone else got it"""
+        now = datetime.now().isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql("""
+                UPDATE scrape_jobs SET status = 'running', started_at = ?, updated_at = ?
+                WHERE id = ? AND status = 'pending'
+            """), (now, now, job_id))
+            conn.commit()
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+    
+    def update_job_stage(self, job_id, stage=None):
+        """Record a progress stage (or just a heartbeat when stage is None)"""
+        now = datetime.now().isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            if stage is None:
+                cursor.execute(self._sql("UPDATE scrape_jobs SET updated_at = ? WHERE id = ? AND status = 'running'"),
+                               (now, job_id))
+            else:
+                cursor.execute(self._sql("SELECT progress FROM scrape_jobs WHERE id = ?"), (job_id,))
+                row = cursor.fetchone()
+                progress = json.loads(row[0]) if row and row[0] else []
+                progress.append({'stage': stage, 'at': now})
+                cursor.execute(self._sql("""
+                    UPDATE scrape_jobs SET stage = ?, progress = ?, updated_at = ?
+                    WHERE id = ? AND status = 'running'
+                """), (stage, json.dumps(progress), now, job_id))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def finish_job(self, job_id, status, result=None, error=None):
+        """Mark a job as succeeded or failed"""
+        now = datetime.now().isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql("""
+                UPDATE scrape_jobs SET status = ?, result = ?, error = ?, finished_at = ?, updated_at = ?
+                WHERE id = ?
+            """), (status, json.dumps(result) if result is not None else None, error, now, now, job_id))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def requeue_stale_jobs(self, stale_before):
+        """
+        Return running jobs whose heartbeat stopped before stale_before to pending,
+        and list every pending job id so a live worker can pick them up.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql("""
+                UPDATE scrape_jobs SET status = 'pending', updated_at = ?
+                WHERE status = 'running' AND updated_at < ?
+            """), (datetime.now().isoformat(), stale_before))
+            requeued = cursor.rowcount
+            cursor.execute("SELECT id FROM scrape_jobs WHERE status = 'pending' ORDER BY created_at")
+            pending = [row[0] for row in cursor.fetchall()]
+            conn.commit()
+            if requeued:
+                logger.warning(f"Requeued {requeued} jobs whose worker stopped responding")
+            return pending
+        finally:
+            conn.close()
+
+    def _scheduled_job_from_row(self, row):
+        job = dict(zip(self.SCHEDULED_JOB_COLUMNS, row))
+        job['last_result'] = json.loads(job['last_result']) if job['last_result'] else None
+        return job
+    
+    def get_scheduled_job(self, name):
+        """Get the persisted state of a scheduled job"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql(f"""
+                SELECT {', '.join(self.SCHEDULED_JOB_COLUMNS)} FROM scheduled_jobs WHERE name = ?
+            """), (name,))
+            row = cursor.fetchone()
+            return self._scheduled_job_from_row(row) if row else None
+        finally:
+            conn.close()
+    
+    def get_scheduled_jobs(self):
+        """Get every scheduled job ordered by next run"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(f"SELECT {', '.join(self.SCHEDULED_JOB_COLUMNS)} FROM scheduled_jobs ORDER BY next_run_at")
+            return [self._scheduled_job_from_row(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+    
+    def save_scheduled_job(self, name, **fields):
+        """Insert or update a scheduled job; only the given fields are changed"""
+        unknown = set(fields) - set(self.SCHEDULED_JOB_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown scheduled job fields: {', '.join(sorted(unknown))}")
+        if 'last_result' in fields and fields['last_result'] is not None:
+            fields['last_result'] = json.dumps(fields['last_result'])
+        fields['updated_at'] = datetime.now().isoformat()
+        fields.setdefault('schedule', '')
+        
+        columns = ['name'] + list(fields)
+        # The schedule description is only replaced when the caller passes a real one
+        updates = [f"{column} = EXCLUDED.{column}" for column in fields if column != 'schedule']
+        if fields['schedule']:
+            updates.append("schedule = EXCLUDED.schedule")
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql(f"""
+                INSERT INTO scheduled_jobs ({', '.join(columns)})
+                VALUES ({', '.join('?' for _ in columns)})
+                ON CONFLICT (name) DO UPDATE SET {', '.join(updates)}
+            """), [name] + list(fields.values()))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def acquire_lock(self, name, owner, lease_seconds, force=False):
+        """
+        Take or renew a lease on a named lock. Succeeds when the lock is free,
+        already ours, or its lease has expired; force skips those checks for
+        callers that already hold an exclusive lock elsewhere.
+        """
+        now = datetime.now()
+        now_iso = now.isoformat()
+        expires_at = (now + timedelta(seconds=lease_seconds)).isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            condition = "" if force else \
+                "WHERE scheduler_locks.owner = excluded.owner OR scheduler_locks.expires_at < excluded.heartbeat_at"
+            cursor.execute(self._sql(f"""
+                INSERT INTO scheduler_locks (name, owner, acquired_at, heartbeat_at, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    acquired_at = CASE WHEN scheduler_locks.owner = excluded.owner
+                                       THEN scheduler_locks.acquired_at ELSE excluded.acquired_at END,
+                    owner = excluded.owner,
+                    heartbeat_at = excluded.heartbeat_at,
+                    expires_at = excluded.expires_at
+                {condition}
+            """), (name, owner, now_iso, now_iso, expires_at))
+            conn.commit()
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+    
+    def release_lock(self, name, owner):
+        """Give up a lease we hold"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql("DELETE FROM scheduler_locks WHERE name = ? AND owner = ?"), (name, owner))
+            conn.commit()
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+    
+    def get_lock(self, name):
+        """Get the current holder of a named lock, if any"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql(f"SELECT {', '.join(self.LOCK_COLUMNS)} FROM scheduler_locks WHERE name = ?"),
+                           (name,))
+            row = cursor.fetchone()
+            return dict(zip(self.LOCK_COLUMNS, row)) if row else None
+        finally:
+            conn.close()
+    
+    def save_scrape_run(self, run, keep=None):
+        """Store a scrape run summary and trim the history to the newest keep runs"""
+        values = dict(run)
+        values['spans'] = json.dumps(values.get('spans') or [])
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql(f"""
+                INSERT INTO scrape_runs ({', '.join(self.SCRAPE_RUN_COLUMNS)})
+                VALUES ({', '.join('?' for _ in self.SCRAPE_RUN_COLUMNS)})
+            """), [values.get(column) for column in self.SCRAPE_RUN_COLUMNS])
+            if keep:
+                cursor.execute(self._sql("""
+                    DELETE FROM scrape_runs WHERE started_at < (
+                        SELECT MIN(started_at) FROM (
+                            SELECT started_at FROM scrape_runs ORDER BY started_at DESC LIMIT ?
+                        ) newest
+                    )
+                """), (keep,))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def get_scrape_runs(self, limit=20, include_spans=False):
+        """Most recent scrape runs, newest first"""
+        columns = self.SCRAPE_RUN_COLUMNS if include_spans else self.SCRAPE_RUN_COLUMNS[:-1]
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(self._sql(f"""
+                SELECT {', '.join(columns)} FROM scrape_runs ORDER BY started_at DESC LIMIT ?
+            """), (limit,))
+            runs = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            for run in runs:
+                if include_spans:
+                    run['spans'] = json.loads(run['spans']) if run['spans'] else []
+            return runs
+        finally:
+            conn.close()
+
+    def get_circuit_breaker(self, name):
+        """Get a circuit breaker row, creating it closed on first use"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(self._sql("""
+                INSERT INTO circuit_breakers (name, state, updated_at) VALUES (?, 'closed', ?)
+                ON CONFLICT (name) DO NOTHING
+            """), (name, datetime.now().isoformat()))
+            cursor.execute(self._sql(f"SELECT {', '.join(self.BREAKER_COLUMNS)} FROM circuit_breakers WHERE name = ?"),
+                           (name,))
+            row = cursor.fetchone()
+            conn.commit()
+            return dict(zip(self.BREAKER_COLUMNS, row))
+        finally:
+            conn.close()
+
+    def get_circuit_breakers(self):
+        """Every circuit breaker that has been used"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(f"SELECT {', '.join(self.BREAKER_COLUMNS)} FROM circuit_breakers ORDER BY name")
+            return [dict(zip(self.BREAKER_COLUMNS, row)) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def record_breaker_failure(self, name, error):
+        """Count a failed call; returns the updated row"""
+        now = datetime.now().isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(self._sql("""
+                UPDATE circuit_breakers
+                SET failure_count = failure_count + 1, last_failure_at = ?, last_error = ?, updated_at = ?
+                WHERE name = ?
+            """), (now, error, now, name))
+            conn.commit()
+        finally:
+            conn.close()
+        return self.get_circuit_breaker(name)
+
+    def record_breaker_success(self, name):
+        """Record a successful call; closes the breaker if a half-open probe succeeded"""
+        now = datetime.now().isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(self._sql("""
+                UPDATE circuit_breakers
+                SET state = 'closed', failure_count = 0, opened_at = NULL, retry_at = NULL,
+                    last_success_at = ?, updated_at = ?
+                WHERE name = ?
+            """), (now, now, name))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def transition_breaker(self, name, from_state, to_state, retry_at=None, trip=False, from_retry_at=None):
+        """
+        Move a breaker between states only if it is still in from_state (and,
+        when given, still has from_retry_at), so exactly one process trips it
+        or takes the half-open probe
+        """
+        now = datetime.now().isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            condition = "AND retry_at = ?" if from_retry_at else ""
+            params = (to_state, retry_at, now, 1 if trip else 0, now, 1 if trip else 0, name, from_state)
+            cursor.execute(self._sql(f"""
+                UPDATE circuit_breakers
+                SET state = ?, retry_at = ?, updated_at = ?,
+                    opened_at = CASE WHEN ? = 1 THEN ? ELSE opened_at END,
+                    trip_count = trip_count + ?
+                WHERE name = ? AND state = ? {condition}
+            """), params + ((from_retry_at,) if from_retry_at else ()))
+            conn.commit()
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def hit_rate_limit(self, key, window_index, previous_weight, limit, now):
+        """
+        Count a request against a sliding window counter if it fits under
+        limit. The check and the increment are one upsert, so concurrent
+        workers cannot both take the last slot. Returns (allowed,
+        window_index, previous_count, current_count) as stored afterwards.
+        """
+        # The stored counters rolled forward to window_index
+        previous = ("CASE WHEN rate_limits.window_index = excluded.window_index THEN rate_limits.previous_count "
+                    "WHEN rate_limits.window_index = excluded.window_index - 1 THEN rate_limits.current_count "
+                    "ELSE 0 END")
+        current = "CASE WHEN rate_limits.window_index = excluded.window_index THEN rate_limits.current_count ELSE 0 END"
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(self._sql(f"""
+                INSERT INTO rate_limits (key, window_index, previous_count, current_count, updated_at)
+                VALUES (?, ?, 0, 1, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    previous_count = {previous},
+                    current_count = {current} + 1,
+                    window_index = excluded.window_index,
+                    updated_at = excluded.updated_at
+                WHERE {previous} * ? + {current} + 1 <= ?
+                RETURNING window_index, previous_count, current_count
+            """), (key, window_index, now, previous_weight, limit))
+            row = cursor.fetchone()
+            allowed = row is not None
+            if not allowed:
+                cursor.execute(self._sql("SELECT window_index, previous_count, current_count FROM rate_limits WHERE key = ?"),
+                               (key,))
+                row = cursor.fetchone()
+            conn.commit()
+            return (allowed,) + tuple(row)
+        finally:
+            conn.close()
+
+    def prune_rate_limits(self, before):
+        """Delete counters last hit before `before` (epoch seconds)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(self._sql("DELETE FROM rate_limits WHERE updated_at < ?"), (before,))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def get_last_update_time(self):
+        """When a scrape last succeeded, as a datetime (None before the first one)"""
+        value = self.get_state(self.STANDINGS_SCRAPED_KEY)
+        return datetime.fromisoformat(value) if value else None
+
     def clear_all_teams(self):
         """Clear all team data from the database"""
         try:
@@ -669,6 +1585,10 @@ class MatchDatabase:
             else:
                 cursor.execute("DELETE FROM group_standings")
             
+            # Forget the last scraped hashes so the next scrape repopulates the table
+            cursor.execute(self._sql("DELETE FROM scrape_state WHERE key LIKE ?"), (f"{self.STANDINGS_HASH_KEY}:%",))
+            self._bump_standings_version(cursor)
+            
             conn.commit()
             conn.close()
             
@@ -682,6 +1602,8 @@ class MatchDatabase:
     def reset_database(self):
         """Completely reset the database by dropping and recreating tables"""
         try:
+            # Carried over so the version never repeats one a cache has already seen
+            standings_version = self.get_standings_version()
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -690,21 +1612,17 @@ class MatchDatabase:
                 cursor.execute("DROP TABLE IF EXISTS group_standings CASCADE")
                 cursor.execute("DROP TABLE IF EXISTS scraper_health CASCADE")
                 cursor.execute("DROP TABLE IF EXISTS data_updates CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS scrape_state CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS matches CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS scrape_jobs CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS scheduler_locks CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS scheduled_jobs CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS scrape_runs CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS circuit_breakers CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS scraper_health_history CASCADE")
                 
                 # Recreate tables
-                cursor.execute("""
-                    CREATE TABLE group_standings (
-                        id SERIAL PRIMARY KEY,
-                        group_name VARCHAR(50) NOT NULL,
-                        team VARCHAR(100) NOT NULL,
-                        record VARCHAR(20) NOT NULL,
-                        map_diff VARCHAR(20) NOT NULL,
-                        round_diff VARCHAR(20) NOT NULL,
-                        delta REAL NOT NULL,
-                        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(group_name, team)
-                    )
-                """)
+                cursor.execute(self._group_standings_schema())
                 
                 cursor.execute("""
                     CREATE TABLE scraper_health (
@@ -733,21 +1651,17 @@ class MatchDatabase:
                 cursor.execute("DROP TABLE IF EXISTS group_standings")
                 cursor.execute("DROP TABLE IF EXISTS scraper_health")
                 cursor.execute("DROP TABLE IF EXISTS data_updates")
+                cursor.execute("DROP TABLE IF EXISTS scrape_state")
+                cursor.execute("DROP TABLE IF EXISTS matches")
+                cursor.execute("DROP TABLE IF EXISTS scrape_jobs")
+                cursor.execute("DROP TABLE IF EXISTS scheduler_locks")
+                cursor.execute("DROP TABLE IF EXISTS scheduled_jobs")
+                cursor.execute("DROP TABLE IF EXISTS scrape_runs")
+                cursor.execute("DROP TABLE IF EXISTS circuit_breakers")
+                cursor.execute("DROP TABLE IF EXISTS scraper_health_history")
                 
                 # Recreate tables
-                cursor.execute("""
-                    CREATE TABLE group_standings (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        group_name TEXT NOT NULL,
-                        team TEXT NOT NULL,
-                        record TEXT NOT NULL,
-                        map_diff TEXT NOT NULL,
-                        round_diff TEXT NOT NULL,
-                        delta REAL NOT NULL,
-                        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(group_name, team)
-                    )
-                """)
+                cursor.execute(self._group_standings_schema())
                 
                 cursor.execute("""
                     CREATE TABLE scraper_health (
@@ -772,6 +1686,11 @@ class MatchDatabase:
                     )
                 """)
             
+            self._upgrade_group_standings(cursor)
+            self._create_auxiliary_tables(cursor)
+            self._upsert_state(cursor, self.STANDINGS_VERSION_KEY, str(standings_version + 1))
+            self._notify_standings_version(cursor)
+            
             conn.commit()
             conn.close()
             
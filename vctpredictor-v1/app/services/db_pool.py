@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+VCT PostgreSQL Connection Pool
+A bounded set of psycopg2 connections shared by every thread in a process
+"""
+
+import os
+import logging
+import threading
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(dsn):
+    """The pool for this DSN in this process"""
+    # Keyed by pid as well: a forked worker must never talk on the master's
+    # sockets, and the master's entries stay referenced so they are never
+    # garbage collected (and closed under the master) in the worker
+    key = (dsn, os.getpid())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(dsn)
+            _pools[key] = pool
+        return pool
+
+
+class PooledConnection:
+    """A pooled psycopg2 connection whose close() hands it back to the pool"""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise RuntimeError("Connection has been returned to the pool")
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __del__(self):
+        # A caller that lost its connection to an exception must not leak a slot
+        self.close()
+
+
+class ConnectionPool:
+    """
+    At most DB_POOL_SIZE connections per process, opened on demand and kept
+    for reuse. A thread that finds them all busy waits for one, for up to
+    DB_POOL_TIMEOUT_SECONDS, instead of opening yet another connection.
+    """
+
+    def __init__(self, dsn, size=None, timeout_seconds=None):
+        self.dsn = dsn
+        self.size = size or Config.DB_POOL_SIZE
+        self.timeout_seconds = timeout_seconds or Config.DB_POOL_TIMEOUT_SECONDS
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self._slots.acquire(timeout=self.timeout_seconds):
+            raise RuntimeError(f"No database connection free after {self.timeout_seconds}s "
+                               f"(DB_POOL_SIZE={self.size})")
+        try:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None or conn.closed:
+                import psycopg2
+                conn = psycopg2.connect(self.dsn)
+            return PooledConnection(self, conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        try:
+            if not conn.closed:
+                # Whatever the caller left uncommitted is discarded, not inherited
+                conn.rollback()
+                if conn.autocommit:
+                    conn.autocommit = False
+                with self._lock:
+                    self._idle.append(conn)
+        except Exception as e:
+            logger.warning(f"⚠️ Dropping a database connection that could not be reset: {e}")
+            try:
+                conn.close()
+            except Exception:
+                pass
+        finally:
+            self._slots.release()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+VCT Fixture Store
+Captured vlr.gg pages that can stand in for the scraper's HTTP client
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+from datetime import datetime
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = 'index.json'
+
+
+class FixtureMissingError(LookupError):
+    """Raised when a replayed URL has no captured fixture"""
+
+
+class FixtureResponse:
+    """Minimal stand-in for a requests.Response built from a captured page"""
+
+    def __init__(self, url, status_code, content, headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = dict(headers or {})
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+
+def fixture_filename(url):
+    """Build a stable, readable file name for a captured URL"""
+    parts = urlsplit(url)
+    slug = re.sub(r'[^A-Za-z0-9._-]+', '_', f"{parts.netloc}{parts.path}").strip('_')
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+    return f"{slug[:120]}-{digest}.html"
+
+
+class FixtureStore:
+    """
+    Directory of captured pages plus an index.json describing each one.
+    Exposes get(url, **kwargs) so it can replace the scraper's session.
+    """
+
+    def __init__(self, root, latency=0.0):
+        self.root = root
+        self.latency = latency  # seconds each get() waits, like a round trip to vlr.gg
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self.pages = {}
+        self.requests_served = 0
+        self.bytes_served = 0
+        self.load()
+
+    def load(self):
+        """Load the fixture index from disk"""
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.pages = json.load(f).get('pages', {})
+        else:
+            self.pages = {}
+
+    def urls(self):
+        """Return every captured URL in a stable order"""
+        return sorted(self.pages)
+
+    def read(self, url):
+        """Return the raw bytes captured for a URL"""
+        entry = self.pages.get(url)
+        if entry is None:
+            raise FixtureMissingError(f"No fixture captured for {url}")
+        with open(os.path.join(self.root, entry['file']), 'rb') as f:
+            return f.read()
+
+    def get(self, url, **kwargs):
+        """Replay a captured page (keyword arguments such as timeout are ignored)"""
+        if self.latency:
+            time.sleep(self.latency)
+        entry = self.pages.get(url)
+        if entry is None:
+            raise FixtureMissingError(f"No fixture captured for {url}")
+
+        content = self.read(url)
+        self.requests_served += 1
+        self.bytes_served += len(content)
+        return FixtureResponse(url, entry.get('status_code', 200), content, entry.get('headers'))
+
+    def save(self, url, status_code, content, headers=None):
+        """Store a page and update the index"""
+        os.makedirs(self.root, exist_ok=True)
+        file_name = fixture_filename(url)
+        with open(os.path.join(self.root, file_name), 'wb') as f:
+            f.write(content)
+
+        self.pages[url] = {
+            'file': file_name,
+            'status_code': status_code,
+            'headers': dict(headers or {}),
+            'size': len(content),
+            'captured_at': datetime.now().isoformat()
+        }
+        self.write_index()
+        logger.info(f"📥 Captured {url} ({len(content)} bytes) -> {file_name}")
+
+    def write_index(self):
+        """Persist the index atomically"""
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'pages': self.pages}, f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write('\n')
+        os.replace(tmp_path, self.index_path)
+
+    def capture(self, session, url, **kwargs):
+        """Fetch a live page with the given session and record it with its headers"""
+        response = session.get(url, **kwargs)
+        self.save(url, response.status_code, response.content, response.headers)
+        return response
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+VCT Health State
+Scraper health held in memory: recorded by the scraper, flushed to the
+database, and pushed to Server-Sent Events subscribers on change
+"""
+
+import json
+import time
+import atexit
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+
+def summarize_health(health_data):
+    """The scraper fields /api/health reports, from a get_scraper_health row"""
+    # The first run shows as running, not initializing, while it is in progress
+    if not health_data or (not health_data.get('total_runs') and health_data.get('status') != 'running'):
+        return {
+            'status': 'initializing',
+            'message': 'Scraper health monitoring not yet initialized',
+            'last_run': None,
+            'success_count': 0,
+            'total_runs': 0,
+            'success_rate': 0
+        }
+
+    last_run = health_data['last_run']
+    return {
+        'status': health_data['status'],
+        'message': 'Health data from database',
+        'last_run': last_run.isoformat() if hasattr(last_run, 'isoformat') else last_run,
+        'success_count': health_data['success_count'],
+        'total_runs': health_data['total_runs'],
+        'success_rate': (round(health_data['success_count'] / health_data['total_runs'] * 100, 1)
+                         if health_data['total_runs'] else 0)
+    }
+
+
+class ScraperHealth:
+    """
+    Scraper status and run counters as recorded by this process.
+
+    Scraper code calls record() and only touches memory. Pending changes
+    are written every HEALTH_FLUSH_SECONDS by a background thread, or at
+    once when flush_seconds is 0 (scrapes run outside the app). Counters
+    are sent as increments that the database adds to the single
+    scraper_health row, so runs recorded by several processes add up.
+    """
+
+    def __init__(self, db, flush_seconds=None):
+        self.db = db
+        self.flush_seconds = Config.HEALTH_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self.listeners = []
+        self.flushes = 0
+        self._pending = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self, callback):
+        """Call callback() after every successful flush"""
+        self.listeners.append(callback)
+
+    def record(self, status, success=None, error=None):
+        """Set the status; success is True or False when a run finished, None otherwise"""
+        entry = {
+            'status': status,
+            'success': None if success is None else int(success),
+            'error': error,
+            'recorded_at': datetime.now().isoformat()
+        }
+        with self._lock:
+            pending = self._pending or {'success_count': 0, 'total_runs': 0, 'history': []}
+            pending['status'] = status
+            pending['error'] = error
+            if success is not None:
+                pending['total_runs'] += 1
+                pending['success_count'] += int(success)
+            pending['history'].append(entry)
+            self._pending = pending
+
+        if not self.flush_seconds or not (self._thread and self._thread.is_alive()):
+            self.flush()
+
+    def flush(self):
+        """Write pending changes; on failure they are kept for the next flush"""
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if not pending:
+            return False
+
+        try:
+            self.db.update_scraper_health(
+                status=pending['status'],
+                success_count=pending['success_count'],
+                total_runs=pending['total_runs'],
+                error_message=pending['error'],
+                history=pending['history'],
+                keep_history=Config.HEALTH_HISTORY_KEEP
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Could not flush scraper health, will retry: {e}")
+            with self._lock:
+                newer = self._pending
+                if newer:
+                    # Keep the newer status, add up the counts
+                    pending['status'], pending['error'] = newer['status'], newer['error']
+                    pending['success_count'] += newer['success_count']
+                    pending['total_runs'] += newer['total_runs']
+                    pending['history'].extend(newer['history'])
+                self._pending = pending
+            return False
+
+        self.flushes += 1
+        for callback in self.listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"⚠️ Scraper health listener failed: {e}")
+        return True
+
+    def start(self):
+        if not self.flush_seconds or (self._thread and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._run, name='health-flush', daemon=True)
+        self._thread.start()
+        # Don't lose a recorded outcome when the worker shuts down
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+
+class HealthState:
+    """
+    This process's view of scraper health.
+
+    One thread reads scraper_health every HEALTH_POLL_SECONDS, however many
+    clients are connected, and again right after this process flushes its
+    own ScraperHealth. /api/health is answered from this state. When the
+    summary changes, every stream waiting in wait_for_change() wakes up and
+    every subscribed listener is called (the ASGI app wakes its coroutines
+    that way). An event's id is a hash of its content, so a client
+    reconnecting to another worker with Last-Event-ID is only sent the
+    state again if it differs.
+    """
+
+    def __init__(self, db, poll_seconds=None, max_clients=None):
+        self.db = db
+        self.poll_seconds = poll_seconds or Config.HEALTH_POLL_SECONDS
+        self.max_clients = Config.HEALTH_STREAM_MAX_CLIENTS if max_clients is None else max_clients
+        self.event_id = None
+        self.payload = None
+        self.clients = 0
+        self.changes = 0
+        self.circuit = None
+        self.scraped_at = None
+        self.listeners = []
+        self._changed = threading.Condition()
+        self._thread = None
+
+    def subscribe(self, callback):
+        """Call callback() from the publishing thread whenever the summary changes"""
+        self.listeners.append(callback)
+
+    def refresh(self):
+        """Read the database and publish the summary if it changed"""
+        from app.services.circuit_breaker import CircuitBreaker
+        payload = summarize_health(self.db.get_scraper_health())
+        circuit = CircuitBreaker(self.db, Config.CIRCUIT_NAME).status()
+        payload['circuit_state'] = circuit['state'] if circuit else None
+        # Kept for /api/health, which is answered from here rather than the database
+        self.circuit = circuit
+        self.scraped_at = self.db.get_state(self.db.STANDINGS_SCRAPED_KEY)
+        self.publish(payload)
+
+    def publish(self, payload):
+        event_id = hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        with self._changed:
+            if event_id == self.event_id:
+                return
+            self.event_id = event_id
+            self.payload = payload
+            self.changes += 1
+            self._changed.notify_all()
+        for callback in self.listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"⚠️ Health state listener failed: {e}")
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='health-state', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not refresh scraper health: {e}")
+            time.sleep(self.poll_seconds)
+
+    def change_since(self, last_event_id):
+        """(event_id, payload) if the state differs from last_event_id, otherwise None"""
+        with self._changed:
+            if self.payload is None or self.event_id == last_event_id:
+                return None
+            return self.event_id, self.payload
+
+    def wait_for_change(self, last_event_id, timeout):
+        """(event_id, payload) once the state differs from last_event_id, or None after timeout"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.payload is not None and self.event_id != last_event_id, timeout)
+            return self.change_since(last_event_id)
+
+    def connect(self):
+        """Claim a stream slot; False when this worker already serves max_clients streams"""
+        with self._changed:
+            if self.clients >= self.max_clients:
+                return False
+            self.clients += 1
+            return True
+
+    def disconnect(self):
+        with self._changed:
+            self.clients -= 1
+
+    def status(self):
+        return {
+            'event_id': self.event_id,
+            'clients': self.clients,
+            'max_clients': self.max_clients,
+            'changes': self.changes,
+            'running': bool(self._thread and self._thread.is_alive())
+        }
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+VCT Scraper HTTP Client
+Process-wide shared session with per-host rate limiting and retry/backoff
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import cloudscraper
+import requests
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_shared_session = None
+_session_lock = threading.Lock()
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    """Forked workers must not reuse the parent's sockets or lock state"""
+    global _shared_session, _session_lock, _buckets_lock
+    _shared_session = None
+    _session_lock = threading.Lock()
+    _buckets_lock = threading.Lock()
+    _buckets.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_shared_session():
+    """Return the process-wide cloudscraper session (keep-alive connections are pooled)"""
+    global _shared_session
+    with _session_lock:
+        if _shared_session is None:
+            _shared_session = cloudscraper.create_scraper()
+            logger.info("🔌 Created shared scraper session")
+        return _shared_session
+
+
+class TokenBucket:
+    """Thread-safe token bucket; reserve() returns how long the caller must wait"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            # Negative balance queues callers behind each other
+            return -self.tokens / self.rate
+
+
+def get_host_bucket(host, rate=None, capacity=None):
+    """Return the shared token bucket for a host"""
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(rate or Config.SCRAPER_REQUESTS_PER_SECOND,
+                                 capacity or Config.SCRAPER_BURST)
+            _buckets[host] = bucket
+        return bucket
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) to seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpStats:
+    """Counters for one scrape run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.retries = 0
+        self.throttle_waits = 0
+        self.throttle_wait_seconds = 0.0
+        self.backoff_seconds = 0.0
+        self.errors = 0
+        self.status_counts = {}
+
+    def record(self, **increments):
+        with self.lock:
+            for name, amount in increments.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def record_status(self, status_code):
+        with self.lock:
+            self.status_counts[str(status_code)] = self.status_counts.get(str(status_code), 0) + 1
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'throttle_waits': self.throttle_waits,
+                'throttle_wait_seconds': round(self.throttle_wait_seconds, 3),
+                'backoff_seconds': round(self.backoff_seconds, 3),
+                'errors': self.errors,
+                'status_counts': dict(self.status_counts)
+            }
+
+
+class RateLimitedClient:
+    """
+    Drop-in replacement for the scraper's session: get(url, **kwargs) throttles
+    per host, retries 429/5xx and connection errors with exponential backoff
+    and jitter, and honours Retry-After. With a circuit breaker, requests fail
+    fast with CircuitOpenError while the host is known to be down.
+    """
+
+    def __init__(self, session=None, max_retries=None, retry_delay=None, max_delay=None, sleep=time.sleep,
+                 breaker=None):
+        self.session = session or get_shared_session()
+        self.breaker = breaker
+        self.max_retries = Config.MAX_RETRIES if max_retries is None else max_retries
+        self.retry_delay = Config.RETRY_DELAY if retry_delay is None else retry_delay
+        self.max_delay = Config.RETRY_MAX_DELAY if max_delay is None else max_delay
+        self.sleep = sleep
+        self.stats = HttpStats()
+
+    def reset_stats(self):
+        self.stats.reset()
+
+    def get_stats(self):
+        return self.stats.as_dict()
+
+    def backoff_delay(self, attempt):
+        """Exponential backoff with equal jitter, capped at max_delay"""
+        ceiling = min(self.max_delay, self.retry_delay * (2 ** attempt))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def throttle(self, host):
+        wait = get_host_bucket(host).reserve()
+        if wait > 0:
+            self.stats.record(throttle_waits=1, throttle_wait_seconds=wait)
+            self.sleep(wait)
+
+    def get(self, url, **kwargs):
+        if self.breaker is None:
+            return self._get(url, self.max_retries, **kwargs)
+
+        # A half-open probe gets a single attempt so it reports back quickly
+        probe = self.breaker.before_call()
+        try:
+            response = self._get(url, 0 if probe else self.max_retries, **kwargs)
+        except requests.RequestException as e:
+            self.breaker.record_failure(e)
+            raise
+        if response.status_code in RETRY_STATUSES:
+            self.breaker.record_failure(f"HTTP {response.status_code}")
+        else:
+            self.breaker.record_success()
+        return response
+
+    def _get(self, url, max_retries, **kwargs):
+        kwargs.setdefault('timeout', Config.SCRAPER_TIMEOUT)
+        host = urlsplit(url).netloc
+
+        attempt = 0
+        while True:
+            self.throttle(host)
+            self.stats.record(requests=1)
+            try:
+                response = self.session.get(url, **kwargs)
+            except requests.RequestException as e:
+                self.stats.record(errors=1)
+                if attempt >= max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.warning(f"⚠️ {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                self.stats.record_status(response.status_code)
+                if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None and retry_after > self.max_delay:
+                    logger.warning(f"⚠️ {url} asked us to wait {retry_after:.0f}s, giving up")
+                    return response
+                delay = retry_after if retry_after is not None else self.backoff_delay(attempt)
+                logger.warning(f"⚠️ {url} returned {response.status_code}, retrying in {delay:.1f}s")
+
+            attempt += 1
+            self.stats.record(retries=1, backoff_seconds=delay)
+            self.sleep(delay)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+VCT Background Job Queue
+Database-backed jobs executed by a small in-process worker pool
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from config.base import Config
+from app.services.scheduler import JobTimeout
+
+logger = logging.getLogger(__name__)
+
+
+class JobContext:
+    """
+    Handed to job handlers so they can report progress stages. Like the
+    scheduler's RunContext, report() is also where a job that has passed its
+    timeout gets cancelled.
+    """
+
+    def __init__(self, queue, job, timeout_seconds=None):
+        self.queue = queue
+        self.job = job
+        self.job_id = job['id']
+        self.timeout_seconds = timeout_seconds
+        self.deadline = datetime.now() + timedelta(seconds=timeout_seconds) if timeout_seconds else None
+
+    def check(self):
+        if self.deadline and datetime.now() > self.deadline:
+            raise JobTimeout(f"{self.job['job_type']} job exceeded its {self.timeout_seconds}s timeout")
+
+    def report(self, stage):
+        self.check()
+        try:
+            self.queue.db.update_job_stage(self.job_id, stage)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not record stage '{stage}' for job {self.job_id}: {e}")
+
+
+class JobQueue:
+    """
+    Jobs live in the scrape_jobs table so their status survives worker restarts.
+    Identical active jobs are deduplicated by key, and a running job keeps a
+    heartbeat so another worker can requeue it if its process dies.
+    """
+
+    def __init__(self, db, max_workers=None, heartbeat_seconds=None, stale_seconds=None):
+        self.db = db
+        self.max_workers = max_workers or Config.JOB_WORKERS
+        self.heartbeat_seconds = heartbeat_seconds or Config.JOB_HEARTBEAT_SECONDS
+        self.stale_seconds = stale_seconds or Config.JOB_STALE_SECONDS
+        self.handlers = {}
+        self.timeouts = {}
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        # Created lazily per process so a pre-forked master never hands its threads to workers
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='vct-job')
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def register(self, job_type, handler, timeout_seconds=None):
+        """Register handler(context) for a job type; its return value is stored as the result"""
+        self.handlers[job_type] = handler
+        self.timeouts[job_type] = timeout_seconds
+
+    def enqueue(self, job_type, dedupe_key=None):
+        """Create (or reuse) a job and schedule it; returns (job, created)"""
+        if job_type not in self.handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        job, created = self.db.create_job(str(uuid.uuid4()), job_type, dedupe_key)
+        if created:
+            logger.info(f"📋 Queued {job_type} job {job['id']}")
+            self.executor.submit(self._run, job['id'])
+        else:
+            logger.info(f"📋 Reusing active {job_type} job {job['id']}")
+            job = self.revive_if_stale(job)
+        return job, created
+
+    def get(self, job_id):
+        return self.db.get_job(job_id)
+
+    def wait(self, job_id, poll_seconds=1.0, check=None):
+        """Block until a job (possibly run by another worker) finishes; check() is called between polls"""
+        while True:
+            job = self.db.get_job(job_id)
+            if job is None or job['status'] not in ('pending', 'running'):
+                return job
+            self.revive_if_stale(job)
+            if check:
+                check()
+            time.sleep(poll_seconds)
+
+    def is_stale(self, job):
+        """An active job whose heartbeat stopped more than JOB_STALE_SECONDS ago (its worker died)"""
+        stale_before = (datetime.now() - timedelta(seconds=self.stale_seconds)).isoformat()
+        return job['status'] in ('pending', 'running') and job['updated_at'] < stale_before
+
+    def revive_if_stale(self, job):
+        """
+        Requeue and run a dead worker's job here. It still holds its dedupe
+        key, so otherwise every later enqueue would reuse a job nobody runs.
+        """
+        if not self.is_stale(job):
+            return job
+        logger.warning(f"♻️ Job {job['id']} has had no heartbeat for {self.stale_seconds}s, taking it over")
+        self.recover()
+        return self.db.get_job(job['id']) or job
+
+    def recover(self):
+        """Pick up jobs left behind by a worker that restarted or died"""
+        stale_before = (datetime.now() - timedelta(seconds=self.stale_seconds)).isoformat()
+        pending = self.db.requeue_stale_jobs(stale_before)
+        for job_id in pending:
+            self.executor.submit(self._run, job_id)
+        if pending:
+            logger.info(f"♻️ Resubmitted {len(pending)} pending jobs")
+        return len(pending)
+
+    def _heartbeat(self, job_id, stop):
+        while not stop.wait(self.heartbeat_seconds):
+            try:
+                self.db.update_job_stage(job_id)
+            except Exception as e:
+                logger.warning(f"⚠️ Heartbeat failed for job {job_id}: {e}")
+
+    def _run(self, job_id):
+        if not self.db.claim_job(job_id):
+            return  # another worker already has it
+
+        job = self.db.get_job(job_id)
+        handler = self.handlers.get(job['job_type'])
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, stop), daemon=True)
+        heartbeat.start()
+
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for {job['job_type']}")
+            result = handler(JobContext(self, job, self.timeouts.get(job['job_type'])))
+            self.db.finish_job(job_id, 'succeeded', result=result)
+            logger.info(f"✅ Job {job_id} succeeded")
+        except Exception as e:
+            logger.error(f"❌ Job {job_id} failed: {e}")
+            self.db.finish_job(job_id, 'failed', error=str(e))
+        finally:
+            stop.set()
+
+
+def run_scrape_job(app, context):
+    """Job handler for a full standings scrape, on the app's shared scraper"""
+    from app.services.scraper import VCTScraper
+
+    db = app.db
+    # The scraper records running, success and failure in the app's scraper health
+    scraper = getattr(app, 'scraper_service', None)
+    if scraper is None:
+        scraper = VCTScraper(database_url=db.db_path, health=getattr(app, 'scraper_health', None))
+        app.scraper_service = scraper
+
+    success = scraper.run_scrape(progress_callback=context.report)
+    run_result = scraper.last_run_result or {}
+    if not success:
+        raise RuntimeError(scraper.failure_message())
+
+    try:
+        teams_count = len(db.get_all_teams_with_stats())
+    except Exception:
+        teams_count = 0
+
+    result = {
+        'teams_count': teams_count,
+        'changes': run_result.get('changes'),
+        'failed_events': run_result.get('failed_events'),
+        'http': run_result.get('http')
+    }
+    
+    # The scrape itself succeeded; a failed export only shows up in the result
+    exporter = getattr(app, 'static_exporter', None)
+    if exporter is not None:
+        try:
+            result['static_export'] = exporter.export()
+        except Exception as e:
+            logger.error(f"❌ Static export failed: {e}")
+            result['static_export'] = {'error': str(e)}
+    
+    return result
+
+
+def run_match_crawl_job(app, context):
+    """Job handler that ingests new match results for every configured event"""
+    from app.services.scraper import VCTScraper
+    from app.services.match_crawler import MatchResultsCrawler
+
+    crawler = MatchResultsCrawler(VCTScraper(database_url=app.db.db_path))
+    summaries = []
+    for event in Config.MATCH_RESULT_EVENTS:
+        context.report(f"event {event['id']}")
+        summaries.append(crawler.crawl_event(event))
+
+    # A failed event has kept its cursor for the next run, but the job did not finish
+    failed = [summary for summary in summaries if summary.get('error')]
+    if failed:
+        raise RuntimeError('; '.join(f"event {summary['event']}: {summary['error']}" for summary in failed))
+
+    return {
+        'matches_inserted': sum(summary['matches_inserted'] for summary in summaries),
+        'events': summaries
+    }
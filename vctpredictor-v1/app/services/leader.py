@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+VCT Leader Election
+Makes sure exactly one process in the deployment runs scheduled scrapes
+"""
+
+import os
+import socket
+import uuid
+import zlib
+import logging
+import threading
+from datetime import datetime
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLock:
+    """
+    A named, cluster-wide lock.
+
+    On PostgreSQL this is a session advisory lock held on a dedicated
+    connection, so it is released the moment the holder's process or
+    connection dies. On SQLite it is a row in scheduler_locks with a lease
+    that the holder renews; another process takes over once the lease expires.
+    In both cases the holder keeps the row up to date so /api/health can show
+    who leads.
+    """
+
+    def __init__(self, db, name='scheduler', lease_seconds=None):
+        self.db = db
+        self.name = name
+        self.lease_seconds = lease_seconds or Config.LEADER_LEASE_SECONDS
+        self.backend = 'advisory' if db.is_postgres else 'lease'
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # A forked child gets its own identity and never inherits the parent's session
+        self._pid = os.getpid()
+        self.owner = f"{socket.gethostname()}:{self._pid}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self.leader_since = None
+        self.last_heartbeat = None
+        self._conn = None
+
+    @property
+    def advisory_key(self):
+        # Stable across processes and Python versions, unlike hash()
+        return zlib.crc32(f"vct:{self.name}".encode('utf-8'))
+
+    def _close_connection(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def _try_advisory_lock(self):
+        if self._conn is None:
+            self._conn = self.db.get_dedicated_connection()
+            self._conn.autocommit = True
+        cursor = self._conn.cursor()
+        if self.is_leader:
+            # Still holding it as long as our session is alive
+            cursor.execute("SELECT 1")
+            return True
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", (self.advisory_key,))
+        return bool(cursor.fetchone()[0])
+
+    def try_acquire(self):
+        """Acquire or renew leadership; returns whether we are the leader"""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            was_leader = self.is_leader
+            try:
+                if self.backend == 'advisory':
+                    leader = self._try_advisory_lock()
+                    if leader:
+                        self.db.acquire_lock(self.name, self.owner, self.lease_seconds, force=True)
+                else:
+                    leader = self.db.acquire_lock(self.name, self.owner, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"⚠️ Leader lock '{self.name}' check failed: {e}")
+                self._close_connection()
+                leader = False
+
+            self.is_leader = leader
+            if leader:
+                self.last_heartbeat = datetime.now()
+                if not was_leader:
+                    self.leader_since = self.last_heartbeat
+                    logger.info(f"👑 {self.owner} is now leader for '{self.name}'")
+            elif was_leader:
+                self.leader_since = None
+                logger.warning(f"⚠️ {self.owner} lost leadership for '{self.name}'")
+            return leader
+
+    def release(self):
+        """Step down so another process can take over immediately"""
+        with self._lock:
+            if self.is_leader:
+                try:
+                    self.db.release_lock(self.name, self.owner)
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not release leader lock '{self.name}': {e}")
+            self._close_connection()
+            self.is_leader = False
+            self.leader_since = None
+
+    def status(self):
+        """Lock status for the health endpoint"""
+        holder = None
+        try:
+            holder = self.db.get_lock(self.name)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read leader lock '{self.name}': {e}")
+
+        return {
+            'name': self.name,
+            'backend': self.backend,
+            'owner': self.owner,
+            'is_leader': self.is_leader,
+            'leader_since': self.leader_since.isoformat() if self.leader_since else None,
+            'last_heartbeat': self.last_heartbeat.isoformat() if self.last_heartbeat else None,
+            'holder': holder['owner'] if holder else None,
+            'holder_heartbeat_at': holder['heartbeat_at'] if holder else None,
+            'holder_expires_at': holder['expires_at'] if holder else None
+        }
+
+
+class LeaderElector:
+    """Background thread that keeps trying to acquire, and then renews, a LeaderLock"""
+
+    def __init__(self, lock, interval_seconds=None):
+        self.lock = lock
+        self.interval_seconds = interval_seconds or Config.LEADER_HEARTBEAT_SECONDS
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_leader(self):
+        return self.lock.is_leader
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"leader-{self.lock.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.lock.release()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.lock.try_acquire()
+            self._stop.wait(self.interval_seconds)
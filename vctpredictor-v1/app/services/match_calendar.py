@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+VCT Match Calendar
+Upcoming series from vlr.gg event listings and the adaptive scrape schedule built on them
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from config.base import Config
+from app.services.match_crawler import parse_upcoming_matches
+from app.services.scheduler import IntervalSchedule
+
+logger = logging.getLogger(__name__)
+
+
+class MatchCalendar:
+    """
+    Scheduled series for the tracked events, cached in scrape_state.
+    Series stay in the calendar for a while after they start so the scheduler
+    can keep polling for their results once they drop off the upcoming list.
+    """
+
+    STATE_KEY = 'match_calendar'
+
+    def __init__(self, db):
+        self.db = db
+
+    def load(self):
+        raw = self.db.get_state(self.STATE_KEY)
+        if not raw:
+            return {'updated_at': None, 'matches': []}
+        try:
+            return json.loads(raw)
+        except ValueError:
+            logger.warning("⚠️ Ignoring unreadable match calendar")
+            return {'updated_at': None, 'matches': []}
+
+    def matches(self):
+        """Series with a known start time, earliest first"""
+        return sorted((m for m in self.load()['matches'] if m.get('starts_at')), key=lambda m: m['starts_at'])
+
+    def listing_url(self, scraper, event):
+        return f"{scraper.base_url}/event/matches/{event['event_id']}/{event['slug']}/?series_id=all&group=upcoming"
+
+    def refresh(self, scraper, events=None):
+        """
+        Fetch the upcoming listing of every tracked event and merge it into the
+        calendar. The standings pages carry no schedule, so this costs one
+        request per event, through the scraper's rate-limited client.
+        """
+        now = datetime.now()
+        keep_after = now - timedelta(minutes=Config.SERIES_EXPECTED_MINUTES) - timedelta(hours=Config.RESULT_POLL_WINDOW_HOURS)
+
+        # Recently started series are kept so their result windows survive the refresh
+        merged = {m['match_id']: m for m in self.load()['matches']
+                  if m.get('starts_at') and datetime.fromisoformat(m['starts_at']) >= keep_after}
+
+        fetched = 0
+        for event in events or Config.TRACKED_EVENTS:
+            url = self.listing_url(scraper, event)
+            try:
+                response = scraper.scraper.get(url)
+                if response.status_code != 200:
+                    logger.warning(f"⚠️ Failed to fetch {url}: {response.status_code}")
+                    continue
+                for match in parse_upcoming_matches(response.content, scraper.clean_team_name):
+                    match['event'] = event['event_id']
+                    match['region'] = event['region']
+                    merged[match['match_id']] = match
+                fetched += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Could not read match schedule for event {event['event_id']}: {e}")
+
+        if fetched:
+            self.db.set_state(self.STATE_KEY, json.dumps({
+                'updated_at': now.isoformat(),
+                'matches': sorted(merged.values(), key=lambda m: m.get('starts_at') or '9999')
+            }))
+            logger.info(f"🗓️ Match calendar refreshed: {len(merged)} series from {fetched} events")
+        return fetched
+
+
+class AdaptiveSchedule:
+    """
+    Scrape schedule driven by the match calendar.
+
+    From shortly after each series is expected to finish, poll every
+    RESULT_POLL_INTERVAL_MINUTES until the standings change (or the window
+    runs out). With nothing to wait for, fall back to the regular
+    SCRAPER_INTERVAL heartbeat.
+    """
+
+    # The scheduler recomputes the next run when a run finishes, so a change
+    # seen by this run ends polling straight away
+    recompute_after_run = True
+
+    def __init__(self, db, heartbeat=None):
+        self.db = db
+        self.calendar = MatchCalendar(db)
+        self.heartbeat = heartbeat or IntervalSchedule(Config.SCRAPER_INTERVAL, anchor=Config.SCRAPER_ANCHOR)
+        self.series_duration = timedelta(minutes=Config.SERIES_EXPECTED_MINUTES)
+        self.poll_delay = timedelta(minutes=Config.RESULT_POLL_DELAY_MINUTES)
+        self.poll_interval = timedelta(minutes=Config.RESULT_POLL_INTERVAL_MINUTES)
+        self.poll_window = timedelta(hours=Config.RESULT_POLL_WINDOW_HOURS)
+
+    def describe(self):
+        return (f"adaptive: poll every {self.poll_interval} after matches, "
+                f"otherwise {self.heartbeat.describe()}")
+
+    def standings_changed_at(self):
+        value = self.db.get_state(self.db.STANDINGS_CHANGED_KEY)
+        return datetime.fromisoformat(value) if value else None
+
+    def windows(self):
+        """(poll_from, poll_until, expected_end, match) for every series in the calendar"""
+        for match in self.calendar.matches():
+            expected_end = datetime.fromisoformat(match['starts_at']) + self.series_duration
+            poll_from = expected_end + self.poll_delay
+            yield poll_from, poll_from + self.poll_window, expected_end, match
+
+    def next_run(self, after):
+        changed_at = self.standings_changed_at()
+        heartbeat_at, _ = self.heartbeat.next_run(after)
+        candidates = [(heartbeat_at, 'heartbeat: no match results pending')]
+
+        for poll_from, poll_until, expected_end, match in self.windows():
+            label = f"{match['team1']} vs {match['team2']}"
+            if changed_at and changed_at >= expected_end:
+                continue  # standings already moved after this series ended
+            if poll_from <= after < poll_until:
+                candidates.append((after + self.poll_interval,
+                                   f"polling for the result of {label} (expected to end {expected_end:%H:%M})"))
+            elif poll_from > after:
+                candidates.append((poll_from, f"after {label} (starts {match['starts_at'][11:16]})"))
+
+        return min(candidates, key=lambda candidate: candidate[0])
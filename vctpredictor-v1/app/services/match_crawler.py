@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+VCT Match Results Crawler
+Incremental ingestion of completed series from vlr.gg event match listings
+"""
+
+import re
+import json
+import logging
+from datetime import datetime
+from bs4 import BeautifulSoup
+from config.base import Config
+from app.services.parsing import team_name_text
+
+logger = logging.getLogger(__name__)
+
+MATCH_ID_PATTERN = re.compile(r'^/(\d+)/')
+PAGE_PATTERN = re.compile(r'[?&]page=(\d+)')
+
+
+def parse_listing_date(text):
+    """Parse a listing date label such as 'Sat, August 16, 2025' into ISO format"""
+    text = ' '.join(text.split())
+    for fmt in ('%a, %B %d, %Y', '%A, %B %d, %Y', '%B %d, %Y'):
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_match_listing(content, tournament, clean_team_name=None):
+    """
+    Parse one page of an event match listing.
+    Returns (matches, has_next_page) where matches are dicts ready for
+    MatchDatabase.insert_matches_batch, in page order. Series without a final
+    score (upcoming or live) are skipped.
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    matches = []
+
+    for card in soup.select('a.match-item'):
+        href = card.get('href', '')
+        id_match = MATCH_ID_PATTERN.match(href)
+        if not id_match:
+            continue
+
+        teams = card.select('.match-item-vs-team')
+        if len(teams) != 2:
+            continue
+
+        names = []
+        scores = []
+        for team in teams:
+            name_el = team.select_one('.match-item-vs-team-name .text-of') or team.select_one('.match-item-vs-team-name')
+            score_el = team.select_one('.match-item-vs-team-score')
+            names.append(team_name_text(name_el) if name_el else '')
+            scores.append(score_el.get_text(strip=True) if score_el else '')
+
+        if not all(score.isdigit() for score in scores):
+            continue
+
+        # Listing dates are section labels above each card
+        label = card.find_previous('div', class_='wf-label')
+        match_date = None
+        if label:
+            label_text = ''.join(label.find_all(string=True, recursive=False))
+            match_date = parse_listing_date(label_text)
+
+        if clean_team_name:
+            names = [clean_team_name(name) for name in names]
+
+        matches.append({
+            'match_id': id_match.group(1),
+            'date': match_date or datetime.now().date().isoformat(),
+            'team1': names[0],
+            'team2': names[1],
+            'team1_score': int(scores[0]),
+            'team2_score': int(scores[1]),
+            'map_name': '',
+            'tournament': tournament
+        })
+
+    page_numbers = [int(n) for link in soup.select('.action-container-pages a[href]')
+                    for n in PAGE_PATTERN.findall(link['href'])]
+    current = soup.select_one('.action-container-pages .mod-active')
+    current_page = int(current.get_text(strip=True)) if current and current.get_text(strip=True).isdigit() else 1
+    has_next_page = any(n > current_page for n in page_numbers)
+
+    return matches, has_next_page
+
+
+def parse_upcoming_matches(content, clean_team_name=None):
+    """
+    Parse scheduled series from an event's upcoming listing.
+    Returns dicts with match_id, starts_at (ISO, None when the time is TBD),
+    team1, team2 and status ('upcoming' or 'live'). Listing times are read as
+    local server time.
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    matches = []
+
+    for card in soup.select('a.match-item'):
+        id_match = MATCH_ID_PATTERN.match(card.get('href', ''))
+        teams = card.select('.match-item-vs-team-name')
+        if not id_match or len(teams) != 2:
+            continue
+
+        names = [team_name_text(team.select_one('.text-of') or team) for team in teams]
+        if clean_team_name:
+            names = [name if name == 'TBD' else clean_team_name(name) for name in names]
+
+        starts_at = None
+        label = card.find_previous('div', class_='wf-label')
+        time_el = card.select_one('.match-item-time')
+        if label and time_el:
+            match_date = parse_listing_date(''.join(label.find_all(string=True, recursive=False)))
+            try:
+                match_time = datetime.strptime(time_el.get_text(strip=True), '%I:%M %p').time()
+            except ValueError:
+                match_time = None  # TBD
+            if match_date and match_time:
+                starts_at = datetime.combine(datetime.fromisoformat(match_date).date(), match_time).isoformat()
+
+        matches.append({
+            'match_id': id_match.group(1),
+            'starts_at': starts_at,
+            'team1': names[0],
+            'team2': names[1],
+            'status': 'live' if card.select_one('.ml.mod-live') else 'upcoming'
+        })
+
+    return matches
+
+
+class MatchResultsCrawler:
+    """
+    Pages through completed results for each event, newest first, and stops at
+    the first page containing an already-ingested match_id. A per-event cursor in
+    scrape_state lets an interrupted crawl resume from its first unwritten page.
+    """
+
+    def __init__(self, scraper, batch_size=None, max_pages=None):
+        self.scraper = scraper
+        self.db = scraper.db
+        self.batch_size = batch_size or Config.MATCH_BATCH_SIZE
+        self.max_pages = max_pages or Config.MATCH_CRAWL_MAX_PAGES
+
+    def cursor_key(self, event):
+        return f"match_cursor:{event['id']}"
+
+    def load_cursor(self, event):
+        raw = self.db.get_state(self.cursor_key(event))
+        default = {'backfilled': False, 'next_page': 1, 'newest_match_id': None}
+        if not raw:
+            return default
+        try:
+            return dict(default, **json.loads(raw))
+        except ValueError:
+            logger.warning(f"⚠️ Ignoring unreadable cursor for event {event['id']}")
+            return default
+
+    def save_cursor(self, event, cursor):
+        cursor['updated_at'] = datetime.now().isoformat()
+        self.db.set_state(self.cursor_key(event), json.dumps(cursor))
+
+    def listing_url(self, event, page):
+        return (f"{self.scraper.base_url}/event/matches/{event['id']}/{event['slug']}/"
+                f"?series_id=all&group=completed&page={page}")
+
+    def crawl_event(self, event):
+        """Ingest new results for one event and return a summary of the run"""
+        cursor = self.load_cursor(event)
+        backfilled = cursor['backfilled']
+        page = cursor['next_page']
+        newest_match_id = cursor['newest_match_id']
+
+        # Until the first full pass finishes, resumed pages can repeat matches that
+        # shifted down a page, so only stop on known ids once history is complete
+        stop_on_known = backfilled
+
+        summary = {
+            'event': event['id'],
+            'mode': 'incremental' if backfilled else 'backfill',
+            'start_page': page,
+            'pages_fetched': 0,
+            'matches_seen': 0,
+            'matches_inserted': 0,
+            'batches': 0,
+            'reached_known': False,
+            'complete': False
+        }
+
+        buffer = []  # (page, match) pairs not yet written
+
+        def flush(final=False):
+            # insert_matches_batch raises on failure, which leaves the batch in the
+            # buffer and the cursor on its page; nothing below saves past it
+            while len(buffer) >= self.batch_size or (final and buffer):
+                batch = buffer[:self.batch_size]
+                summary['matches_inserted'] += self.db.insert_matches_batch([m for _, m in batch])
+                del buffer[:len(batch)]
+                summary['batches'] += 1
+
+        try:
+            while summary['pages_fetched'] < self.max_pages:
+                url = self.listing_url(event, page)
+                response = self.scraper.scraper.get(url, timeout=30)
+                if response.status_code != 200:
+                    logger.warning(f"⚠️ Failed to fetch {url}: {response.status_code}")
+                    break
+
+                matches, has_next_page = parse_match_listing(
+                    response.content, event.get('name', event['slug']), self.scraper.clean_team_name
+                )
+                summary['pages_fetched'] += 1
+                summary['matches_seen'] += len(matches)
+
+                if page == 1 and matches:
+                    newest_match_id = matches[0]['match_id']
+
+                known = self.db.get_existing_match_ids(m['match_id'] for m in matches) if stop_on_known else set()
+                buffer.extend((page, m) for m in matches if m['match_id'] not in known)
+                flush()
+
+                if known:
+                    summary['reached_known'] = True
+                    logger.info(f"⏹️ Reached already-ingested matches on page {page} of event {event['id']}")
+                if known or not has_next_page:
+                    summary['complete'] = True
+                    break
+                page += 1
+
+                # Only move the cursor past pages whose matches are all written
+                self.save_cursor(event, {
+                    'backfilled': backfilled,
+                    'next_page': buffer[0][0] if buffer else page,
+                    'newest_match_id': newest_match_id
+                })
+
+            flush(final=True)
+
+            if summary['complete']:
+                self.save_cursor(event, {'backfilled': True, 'next_page': 1, 'newest_match_id': newest_match_id})
+            else:
+                self.save_cursor(event, {'backfilled': backfilled, 'next_page': page, 'newest_match_id': newest_match_id})
+
+        except Exception as e:
+            # The cursor keeps the last position saved after a confirmed write
+            logger.error(f"❌ Match crawl for event {event['id']} failed on page {page}: {e}")
+            summary['error'] = str(e)
+            summary['complete'] = False
+
+        logger.info(f"📥 Event {event['id']}: {summary['matches_inserted']} new matches "
+                    f"from {summary['pages_fetched']} pages ({summary['mode']})")
+        return summary
+
+    def crawl_all(self, events=None):
+        """Crawl every configured event"""
+        return [self.crawl_event(event) for event in (events or Config.MATCH_RESULT_EVENTS)]
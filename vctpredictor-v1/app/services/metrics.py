@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+VCT Metrics
+In-process counters and histograms rendered in the Prometheus text format
+"""
+
+import math
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+BYTE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=None):
+    pairs = list(key) + list(extra or [])
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            return self.header() + [f"{self.name}{_format_labels(key)} {_format_value(value)}"
+                                    for key, value in sorted(self._values.items())]
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def render(self):
+        with self._lock:
+            return self.header() + [f"{self.name}{_format_labels(key)} {_format_value(value)}"
+                                    for key, value in sorted(self._values.items())]
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(buckets) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values.setdefault(key, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            for key, series in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, series['buckets']):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics for this process; get-or-create so modules can share them"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text):
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name, help_text):
+        return self._get(Gauge, name, help_text)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+scrape_runs_total = registry.counter('vct_scrape_runs_total', 'Scrape runs by outcome')
+scrape_duration = registry.histogram('vct_scrape_duration_seconds', 'Wall time of a scrape run')
+scrape_stage_duration = registry.histogram('vct_scrape_stage_seconds', 'Time spent per pipeline stage and event')
+scrape_page_bytes = registry.histogram('vct_scrape_page_bytes', 'Size of fetched event pages', buckets=BYTE_BUCKETS)
+scrape_tables_total = registry.counter('vct_scrape_tables_total', 'Tables examined and accepted as standings')
+scrape_rows_total = registry.counter('vct_scrape_rows_total', 'Standings rows parsed')
+scrape_events_total = registry.counter('vct_scrape_events_total', 'Event scrapes by region and outcome')
+rate_limited_total = registry.counter('vct_rate_limited_total', 'Requests rejected with 429 by rate limit policy')
+
+last_run_timestamp = registry.gauge('vct_scrape_last_run_timestamp_seconds', 'Start time of the latest stored scrape run')
+last_run_success = registry.gauge('vct_scrape_last_run_success', '1 if the latest stored scrape run succeeded')
+last_run_duration = registry.gauge('vct_scrape_last_run_duration_seconds', 'Wall time of the latest stored scrape run')
+last_run_stage = registry.gauge('vct_scrape_last_run_stage_seconds', 'Per-stage time of the latest stored scrape run')
+last_run_bytes = registry.gauge('vct_scrape_last_run_bytes', 'Bytes downloaded by the latest stored scrape run')
+last_run_tables = registry.gauge('vct_scrape_last_run_tables', 'Tables examined and accepted by the latest stored scrape run')
+last_run_rows = registry.gauge('vct_scrape_last_run_rows', 'Standings rows parsed by the latest stored scrape run')
+
+
+def record_scrape_trace(tracer):
+    """Fold a finished scrape trace into the process metrics"""
+    try:
+        scrape_runs_total.inc(outcome=tracer.root.outcome)
+        scrape_duration.observe(tracer.root.duration or 0)
+
+        events = {span.id: span.attributes.get('region', 'unknown') for span in tracer.find('event')}
+        for span in tracer.find('event'):
+            scrape_events_total.inc(region=span.attributes.get('region', 'unknown'), outcome=span.outcome)
+        for stage in ('fetch', 'parse', 'write'):
+            for span in tracer.find(stage):
+                scrape_stage_duration.observe(span.duration or 0, stage=stage,
+                                              region=events.get(span.parent_id, 'all'))
+        for span in tracer.find('fetch'):
+            if span.attributes.get('bytes'):
+                scrape_page_bytes.observe(span.attributes['bytes'], region=events.get(span.parent_id, 'unknown'))
+        for span in tracer.find('parse'):
+            scrape_tables_total.inc(span.attributes.get('tables_examined', 0), result='examined')
+            scrape_tables_total.inc(span.attributes.get('tables_accepted', 0), result='accepted')
+            scrape_rows_total.inc(span.attributes.get('rows', 0))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not record scrape metrics: {e}")
+
+
+def update_last_run_gauges(run):
+    """
+    Set the last-run gauges from a scrape_runs row. The counters only cover
+    the process that ran the scrape; these read the shared table, so every
+    worker reports the same latest run.
+    """
+    if not run:
+        return
+    last_run_timestamp.set(datetime.fromisoformat(run['started_at']).timestamp())
+    last_run_success.set(1 if run['outcome'] == 'ok' else 0)
+    last_run_duration.set(run['duration_seconds'] or 0)
+    for stage in ('fetch', 'parse', 'write'):
+        last_run_stage.set(run[f'{stage}_seconds'] or 0, stage=stage)
+    last_run_bytes.set(run['bytes_downloaded'] or 0)
+    last_run_tables.set(run['tables_examined'] or 0, result='examined')
+    last_run_tables.set(run['tables_accepted'] or 0, result='accepted')
+    last_run_rows.set(run['rows_parsed'] or 0)
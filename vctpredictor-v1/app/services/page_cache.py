@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+VCT Page Cache
+Rendered pages and template fragments, keyed by the standings version
+"""
+
+import time
+import logging
+import threading
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+
+class PageCache:
+    """
+    Per-process cache of rendered HTML and derived view data.
+
+    Every entry belongs to one standings version. The first lookup with a
+    newer version drops the whole cache, so a write anywhere invalidates it
+    as soon as this worker's StandingsCache sees the new version. Entries
+    that also show data outside the standings (like the stale notice or the
+    last scrape time) pass a max_age to bound how long that data lags.
+    """
+
+    def __init__(self, enabled=None, max_age=None):
+        self.enabled = Config.PAGE_CACHE if enabled is None else enabled
+        self.max_age = Config.PAGE_CACHE_MAX_AGE_SECONDS if max_age is None else max_age
+        self.version = None
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, name, version, render, max_age=None):
+        """The cached value of `name` at `version`, calling render() on a miss"""
+        if not self.enabled:
+            return render()
+
+        now = time.monotonic()
+        with self._lock:
+            if version != self.version:
+                self._entries = {}
+                self.version = version
+            entry = self._entries.get(name)
+            if entry is not None and (max_age is None or now - entry[0] < max_age):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Render outside the lock; concurrent misses just render twice
+        value = render()
+        with self._lock:
+            if version == self.version:
+                self._entries[name] = (now, value)
+        return value
+
+    def peek(self, name, version, max_age=None):
+        """The cached value of `name` at `version`, or None; never renders"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(name) if version == self.version else None
+            if entry is None or (max_age is not None and time.monotonic() - entry[0] >= max_age):
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self.version = None
+
+    def status(self):
+        return {
+            'enabled': self.enabled,
+            'version': self.version,
+            'entries': sorted(self._entries),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+VCT Page Parsing
+Standings parsing for vlr.gg pages, run in a small process pool so BeautifulSoup
+work does not hold the GIL of web worker threads
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from bs4 import BeautifulSoup
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+# Elements vlr.gg renders inside or beside a team name for its country: the
+# flag icon in match cards, the light country label in standings rows
+COUNTRY_CLASSES = {'flag', 'ge-text-light', 'event-group-team-tag', 'event-group-team-region'}
+# Flag emoji are pairs of regional indicator symbols
+FLAG_EMOJI_PATTERN = re.compile('[\U0001F1E6-\U0001F1FF]+')
+
+
+def team_name_text(element):
+    """The text of a team name element, leaving out any flag or country label nested in it"""
+    parts = []
+    for text in element.find_all(string=True):
+        parent = text.parent
+        while parent is not element:
+            if COUNTRY_CLASSES.intersection(parent.get('class') or ()):
+                break
+            parent = parent.parent
+        else:
+            if text.strip():
+                parts.append(text.strip())
+    return ' '.join(parts)
+
+
+class StandingsParser:
+    """Turns raw vlr.gg page bytes into plain team dicts; holds no connections or state"""
+
+    def clean_team_name(self, team_name):
+        """Clean and standardize team names"""
+        if not team_name:
+            return "Unknown Team"
+        
+        # Country labels are left out by team_name_text; flag emoji can still be in the text
+        team_name = FLAG_EMOJI_PATTERN.sub('', team_name).strip()
+        
+        # Remove spoiler placeholders and other unwanted text
+        suffixes_to_remove = ['Spoiler hidden', 'Spoiler', 'hidden', 'Esports', 'esports']
+        
+        for suffix in suffixes_to_remove:
+            team_name = team_name.replace(suffix, '').strip()
+        
+        # Clean up any remaining artifacts
+        team_name = team_name.replace('  ', ' ')  # Remove double spaces
+        team_name = team_name.strip()
+        
+        # Standardize common team names
+        name_mapping = {
+            '2game': '2Game Esports',
+            'furia': 'FURIA',
+            'kru': 'KRÜ',
+            'leviatan': 'Leviatán',
+            'shopify': 'Shopify Rebellion',
+            'mibr': 'MIBR',
+            'loud': 'LOUD',
+            'nrg': 'NRG',
+            'cloud9': 'Cloud9',
+            'g2': 'G2 Esports',
+            'evil geniuses': 'Evil Geniuses',
+            '100 thieves': '100 Thieves',
+            'sentinels': 'Sentinels',
+            'visa kru': 'VISA KRÜ',
+            'visa krü': 'VISA KRÜ'
+        }
+        
+        # Try exact match first
+        if team_name.lower() in name_mapping:
+            return name_mapping[team_name.lower()]
+        
+        # Try partial matches
+        for partial, full_name in name_mapping.items():
+            if partial in team_name.lower():
+                return full_name
+        
+        # If no mapping found, capitalize properly
+        if team_name:
+            # Handle special cases like "G2" -> "G2 Esports"
+            if team_name.upper() == 'G2':
+                return 'G2 Esports'
+            elif team_name.upper() == 'NRG':
+                return 'NRG'
+            elif team_name.upper() == 'MIBR':
+                return 'MIBR'
+            elif team_name.upper() == 'LOUD':
+                return 'LOUD'
+            elif team_name.upper() == 'FURIA':
+                return 'FURIA'
+            elif team_name.upper() == 'KRÜ':
+                return 'KRÜ'
+            elif team_name.upper() == 'LEVIATÁN':
+                return 'Leviatán'
+            elif team_name.islower():
+                return team_name.title()
+            else:
+                # Keep the capitalization vlr.gg uses (GIANTX, Gen.G, DRX)
+                return team_name
+        
+        return "Unknown Team"
+
+    def is_standings_table(self, table):
+        """Check if a table contains standings data"""
+        try:
+            # Look for common standings indicators
+            text = table.get_text().lower()
+            standings_indicators = ['rec', 'map', 'rnd', 'δ', 'delta', 'wins', 'losses', 'points']
+            
+            # Check if table has multiple columns (likely standings)
+            rows = table.find_all('tr')
+            if len(rows) < 2:  # Need at least header + 1 data row
+                return False
+            
+            # Check if first row has headers
+            first_row = rows[0]
+            headers = first_row.find_all(['th', 'td'])
+            if len(headers) < 3:  # Need at least 3 columns for standings
+                return False
+            
+            # Check if headers contain standings indicators
+            header_text = ' '.join([h.get_text().lower() for h in headers])
+            has_standings_indicators = any(indicator in header_text for indicator in standings_indicators)
+            
+            return has_standings_indicators
+            
+        except Exception as e:
+            logger.error(f"❌ Error checking if table is standings: {e}")
+            return False
+
+    GROUP_NAME_PATTERN = re.compile(r'\bgroup\s+([a-z0-9]+)\b', re.IGNORECASE)
+    KNOWN_GROUP_NAMES = ('alpha', 'omega')
+
+    def group_name_from_text(self, text):
+        """Extract a group name ("Group Alpha" -> "Alpha", "Group A" -> "A") from a label"""
+        match = self.GROUP_NAME_PATTERN.search(text)
+        if match:
+            name = match.group(1)
+            return name.upper() if len(name) == 1 else name.title()
+        for name in self.KNOWN_GROUP_NAMES:
+            if name in text.lower():
+                return name.title()
+        return None
+
+    def determine_group_from_table(self, table, table_index, soup):
+        """Determine the group name for a standings table"""
+        try:
+            # Method 1: Look for group name in table headers
+            headers = table.find_all('th')
+            for header in headers:
+                group_name = self.group_name_from_text(header.get_text(' ', strip=True))
+                if group_name:
+                    return group_name
+            
+            # Method 2: Look for group name above/below the table
+            # Check previous sibling elements
+            prev_element = table.find_previous_sibling()
+            if prev_element:
+                group_name = self.group_name_from_text(prev_element.get_text(' ', strip=True))
+                if group_name:
+                    return group_name
+            
+            # Method 3: Look for group name in the nearest heading
+            heading = table.find_previous(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+            if heading:
+                group_name = self.group_name_from_text(heading.get_text(' ', strip=True))
+                if group_name:
+                    return group_name
+            
+            # Method 4: Fall back to the table's position on the page
+            return f'Group {table_index + 1}'
+                
+        except Exception as e:
+            logger.error(f"❌ Error determining group name: {e}")
+            return f'Group {table_index + 1}'  # Fallback naming
+    
+    def find_group_indicators(self, table):
+        """Find group indicators in the table"""
+        try:
+            group_name = self.group_name_from_text(table.get_text(' ', strip=True))
+            return [group_name] if group_name else []
+        except Exception as e:
+            logger.error(f"❌ Error finding group indicators: {e}")
+            return []
+
+    def parse_standings_table(self, standings_table, group_name):
+        """Parse the standings table to extract team data"""
+        try:
+            teams_data = []
+            rows = standings_table.find_all('tr')[1:]  # Skip header row
+            
+            logger.info(f"🔍 Parsing {len(rows)} rows for {group_name} group")
+            
+            for i, row in enumerate(rows):
+                try:
+                    cells = row.find_all('td')
+                    if len(cells) < 4:  # Need at least 4 cells for team data
+                        logger.debug(f"⚠️ Row {i} has only {len(cells)} cells, skipping")
+                        continue
+                    
+                    # Extract team data - try multiple selectors
+                    team_element = (
+                        cells[1].find('div', class_='team-name') or
+                        cells[1].find('div', class_='event-group-team-name') or
+                        cells[1].find('span', class_='team-name') or
+                        cells[1].find('a', class_='team-name') or
+                        cells[0].find('div', class_='team-name') or  # Try first cell
+                        cells[0].find('div', class_='event-group-team-name') or
+                        cells[0].find('span', class_='team-name') or
+                        cells[0].find('a', class_='team-name')
+                    )
+                    
+                    if not team_element:
+                        logger.debug(f"⚠️ Row {i}: No team name found, skipping")
+                        continue
+                    
+                    team_name = self.clean_team_name(team_name_text(team_element))
+                    
+                    # Try to find record in different positions
+                    record_cell = None
+                    for j in range(min(len(cells), 6)):
+                        cell_text = cells[j].get_text(strip=True)
+                        if '-' in cell_text or '–' in cell_text:
+                            record_cell = cell_text
+                            break
+                    
+                    if not record_cell:
+                        logger.debug(f"⚠️ Row {i}: No record found, skipping")
+                        continue
+                    
+                    # Try to find map differential
+                    map_diff_cell = None
+                    for j in range(min(len(cells), 6)):
+                        cell_text = cells[j].get_text(strip=True)
+                        if '/' in cell_text or '-' in cell_text:
+                            if cell_text != record_cell:  # Don't use the same cell as record
+                                map_diff_cell = cell_text
+                                break
+                    
+                    if not map_diff_cell:
+                        map_diff_cell = "0/0"  # Default value
+                    
+                    # Try to find round differential
+                    round_diff_cell = None
+                    for j in range(min(len(cells), 6)):
+                        cell_text = cells[j].get_text(strip=True)
+                        if '/' in cell_text or '-' in cell_text:
+                            if cell_text != record_cell and cell_text != map_diff_cell:
+                                round_diff_cell = cell_text
+                                break
+                    
+                    if not round_diff_cell:
+                        round_diff_cell = "0/0"  # Default value
+                    
+                    # Extract delta (round differential converted to number)
+                    try:
+                        if '/' in round_diff_cell:
+                            wins, losses = map(int, round_diff_cell.split('/'))
+                            delta = wins - losses
+                        elif '-' in round_diff_cell:
+                            wins, losses = map(int, round_diff_cell.split('-'))
+                            delta = wins - losses
+                        else:
+                            delta = 0.0
+                    except:
+                        delta = 0.0
+                    
+                    teams_data.append({
+                        'group_name': group_name,
+                        'team': team_name,
+                        'record': record_cell,
+                        'map_diff': map_diff_cell,
+                        'round_diff': round_diff_cell,
+                        'delta': delta
+                    })
+                    
+                    logger.info(f"✅ Scraped: {team_name} ({group_name}) - {record_cell}")
+                    
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to parse team row {i}: {e}")
+                    continue
+            
+            logger.info(f"📋 Successfully parsed {len(teams_data)} teams for {group_name} group")
+            return teams_data
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to parse standings table for {group_name}: {e}")
+            return []
+
+    def parse_standings_page(self, content):
+        """Parse every standings table on an event page, timing each step for the scrape trace"""
+        started = time.perf_counter()
+        soup = BeautifulSoup(content, 'html.parser')
+        all_tables = soup.find_all('table')
+        html_seconds = time.perf_counter() - started
+        
+        all_teams = []
+        table_stats = []
+        for table_index, table in enumerate(all_tables):
+            # Check if this table has standings data
+            if not self.is_standings_table(table):
+                logger.debug(f"⏭️ Table {table_index + 1} is not a standings table, skipping")
+                continue
+            
+            table_started = time.perf_counter()
+            # Try to determine group name from table context
+            group_name = self.determine_group_from_table(table, table_index, soup)
+            table_teams = self.parse_standings_table(table, group_name)
+            if table_teams:
+                all_teams.extend(table_teams)
+            else:
+                logger.warning(f"⚠️ No teams found in table {table_index + 1}")
+            table_stats.append({
+                'index': table_index,
+                'group_name': group_name,
+                'rows': max(len(table.find_all('tr')) - 1, 0),
+                'teams': len(table_teams),
+                'seconds': time.perf_counter() - table_started
+            })
+        
+        return {
+            'teams': all_teams,
+            'tables': len(all_tables),
+            'standings_tables': len(table_stats),
+            'rows': sum(stats['rows'] for stats in table_stats),
+            'html_seconds': html_seconds,
+            'table_stats': table_stats,
+            'seconds': time.perf_counter() - started
+        }
+
+    def inspect_page(self, content):
+        """Summarise each standings table (headers, group indicators, a sample row)"""
+        soup = BeautifulSoup(content, 'html.parser')
+        summaries = []
+        for i, table in enumerate(soup.find_all('table')):
+            summary = {'index': i, 'is_standings': self.is_standings_table(table)}
+            if summary['is_standings']:
+                rows = table.find_all('tr')
+                summary['rows'] = len(rows)
+                if rows:
+                    summary['headers'] = [h.get_text(strip=True) for h in rows[0].find_all(['th', 'td'])]
+                    summary['group_indicators'] = self.find_group_indicators(table)
+                    if len(rows) > 1:
+                        summary['sample_row'] = [c.get_text(strip=True) for c in rows[1].find_all('td')]
+            summaries.append(summary)
+        return summaries
+
+    def analyze_page(self, content, team_names=()):
+        """Group mentions, table layout and known team names found on a page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        page_text = soup.get_text().lower()
+        all_tables = soup.find_all('table')
+        
+        analysis = {
+            'alpha_count': page_text.count('alpha'),
+            'omega_count': page_text.count('omega'),
+            'group_a_count': page_text.count('group a'),
+            'group_b_count': page_text.count('group b'),
+            'total_tables': len(all_tables),
+            'standings_tables': [i for i, table in enumerate(all_tables) if self.is_standings_table(table)],
+            'found_teams': [team for team in team_names if team.lower() in page_text]
+        }
+        
+        # Look for standings table
+        standings_table = (
+            soup.find('table', class_='wf-table') or
+            soup.find('table', class_='standings-table') or
+            soup.find('table', class_='event-standings-table') or
+            soup.find('table')
+        )
+        analysis['standings_table_found'] = standings_table is not None
+        if standings_table:
+            rows = standings_table.find_all('tr')
+            analysis['standings_table_rows'] = len(rows)
+            if len(rows) > 1:
+                analysis['table_headers'] = [cell.get_text(strip=True) for cell in rows[0].find_all(['th', 'td'])]
+                analysis['sample_rows'] = [[cell.get_text(strip=True) for cell in row.find_all('td')]
+                                           for row in rows[:3]]
+        return analysis
+
+
+# Entry points for the pool; module level so spawned workers can unpickle them
+_parser = StandingsParser()
+
+
+def parse_standings_page(content):
+    return _parser.parse_standings_page(content)
+
+
+def inspect_page(content):
+    return _parser.inspect_page(content)
+
+
+def analyze_page(content, team_names=()):
+    return _parser.analyze_page(content, team_names)
+
+
+class ParserPool:
+    """
+    Runs parse functions in worker processes.
+
+    Workers are spawned rather than forked, so they never inherit the web
+    process's threads, locks or database connections. A size of 0 parses
+    in the calling thread (handy for tests and debugging), and a broken
+    pool falls back to in-process parsing for that call.
+
+    A spawned worker runs the parent's __main__ script again, as __mp_main__,
+    before it imports this module. Scripts that can run a scrape therefore
+    build their app under `if __name__ == "__main__"` (run.py, scripts/),
+    and modules that build one at import (wsgi.py, asgi.py) are only ever
+    imported by the server, never run as scripts.
+    """
+
+    def __init__(self, size=None, timeout_seconds=None):
+        self.size = Config.PARSER_POOL_SIZE if size is None else size
+        self.timeout_seconds = timeout_seconds or Config.PARSER_TIMEOUT_SECONDS
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            # A forked web worker must not reuse its parent's pool
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.size,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self._pid = os.getpid()
+                logger.info(f"🧵 Started parser pool with {self.size} workers")
+            return self._executor
+
+    def run(self, func, *args):
+        """Call func(*args) in a worker process and return its result"""
+        if self.size <= 0:
+            return func(*args)
+        
+        try:
+            return self._get_executor().submit(func, *args).result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            logger.error(f"❌ Parsing timed out after {self.timeout_seconds}s, restarting parser pool")
+            self.shutdown()
+            raise
+        except BrokenProcessPool as e:
+            logger.warning(f"⚠️ Parser pool broke ({e}), parsing in-process")
+            self.shutdown()
+            return func(*args)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._pid = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parser_pool():
+    """The process-wide parser pool shared by all scrapers"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParserPool()
+        return _pool
@@ -1,15 +1,37 @@
 # MVP 3: Enhanced Predictor (Uses Real Database)
 
 from app.services.database import MatchDatabase
+from app.services.standings_cache import match_probability, StandingsSnapshot
 from datetime import datetime, timedelta
 
 class DynamicPredictor:
-    def __init__(self, db_path='val_standings.db'):
-        self.db = MatchDatabase(db_path)
+    # Decimal places of the shipped probabilities; displayed to a tenth of a percent
+    TABLE_PROBABILITY_DIGITS = 4
     
-    def predict_match_winner(self, team1, team2):
-        # Get all teams with stats and find the specific teams
-        all_teams = self.db.get_all_teams_with_stats()
+    def __init__(self, db_path='val_standings.db', db=None, cache=None):
+        # Share the app's MatchDatabase when given instead of initializing the schema again
+        self.db = db or MatchDatabase(db_path)
+        # StandingsCache; predictions then read its precomputed probabilities instead of the database
+        self.cache = cache
+    
+    def predict_match_winner(self, team1, team2, event_id=None):
+        if self.cache is not None:
+            snapshot = self.cache.snapshot()
+            first, second = snapshot.find(team1, event_id), snapshot.find(team2, event_id)
+            if first is None or second is None:
+                return {
+                    'error': 'One or both teams not found',
+                    'suggestion': 'Check team names and try again'
+                }
+            return self.build_prediction(
+                team1, team2,
+                snapshot.wins[first], snapshot.losses[first],
+                snapshot.wins[second], snapshot.losses[second],
+                snapshot.probability(first, second)
+            )
+        
+        # Get all teams with stats (limited to one event when given) and find the specific teams
+        all_teams = self.db.get_all_teams_with_stats(event_id=event_id)
         team1_data = next((team for team in all_teams if team['team'] == team1), None)
         team2_data = next((team for team in all_teams if team['team'] == team2), None)
         
@@ -46,6 +68,10 @@ class DynamicPredictor:
                 'suggestion': 'Check database data format'
             }
         
+        return self.build_prediction(team1, team2, team1_wins, team1_losses, team2_wins, team2_losses)
+    
+    def build_prediction(self, team1, team2, team1_wins, team1_losses, team2_wins, team2_losses, team1_base_prob=None):
+        """Prediction result from both records; team1_base_prob may come precomputed"""
         team1_matches = team1_wins + team1_losses
         team2_matches = team2_wins + team2_losses
         
@@ -53,13 +79,9 @@ class DynamicPredictor:
         team2_winrate = team2_wins / team2_matches if team2_matches > 0 else 0
         
         # Base prediction on win rates
-        total_strength = team1_winrate + team2_winrate
-        if total_strength == 0:
-            team1_base_prob = 0.5
-            team2_base_prob = 0.5
-        else:
-            team1_base_prob = team1_winrate / total_strength
-            team2_base_prob = team2_winrate / total_strength
+        if team1_base_prob is None:
+            team1_base_prob = match_probability(team1_winrate, team2_winrate)
+        team2_base_prob = 1 - team1_base_prob
         
         # Determine predicted winner
         if team1_base_prob > team2_base_prob:
@@ -85,4 +107,29 @@ class DynamicPredictor:
             'predicted_winner': predicted_winner,
             'confidence': confidence,
             'prediction_date': datetime.now().isoformat()
-        }
\ No newline at end of file
+        }
+    
+    def probability_table(self, snapshot=None):
+        """
+        Every in-group win probability at one standings version, compact enough to ship to the browser.
+        
+        Each group lists its teams as [id, name] and, in p, P(teams[i] beats teams[j])
+        for i < j in row-major order, to TABLE_PROBABILITY_DIGITS places; P(j beats i)
+        is 1 - p. Teams in different groups never meet, so they have no entry.
+        """
+        if snapshot is None:
+            snapshot = self.cache.snapshot() if self.cache is not None else \
+                StandingsSnapshot(self.db.get_standings_version(), self.db.get_all_teams_with_stats())
+        
+        groups = []
+        for (event_id, stage, group_name), (start, stop) in snapshot.groups.items():
+            groups.append({
+                'event_id': event_id,
+                'stage': stage,
+                'region': snapshot.columns['region'][start],
+                'group': group_name,
+                'teams': [[snapshot.ids[i], snapshot.columns['team'][i]] for i in range(start, stop)],
+                'p': [round(snapshot.probability(i, j), self.TABLE_PROBABILITY_DIGITS)
+                      for i in range(start, stop) for j in range(i + 1, stop)]
+            })
+        return {'version': snapshot.version, 'groups': groups}
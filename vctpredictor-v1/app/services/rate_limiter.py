@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+VCT Rate Limiter
+Per-client request limits for the expensive endpoints, counted in sliding
+windows held in memory or in the database
+"""
+
+import math
+import time
+import logging
+import threading
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+
+def sliding_count(previous, current, elapsed_fraction):
+    """
+    Requests in the window ending now: the current window's count plus the
+    previous window's, weighted by how much of it still overlaps
+    """
+    return previous * (1 - elapsed_fraction) + current
+
+
+def roll_window(stored_index, previous, current, index):
+    """(previous, current) counts at window `index`, for counters last written in window stored_index"""
+    if stored_index == index:
+        return previous, current
+    if stored_index == index - 1:
+        return current, 0
+    return 0, 0
+
+
+def seconds_until_allowed(previous, current, limit, window, elapsed):
+    """How long until one more request fits under limit"""
+    if current + 1 > limit:
+        # This window is full: wait for it to end, then for its count
+        # (the next window's previous) to decay enough
+        return (window - elapsed) + window * (1 - (limit - 1) / current)
+    return window * (1 - (limit - 1 - current) / previous) - elapsed
+
+
+def client_address(forwarded_for, remote_addr, proxy_hops):
+    """
+    The caller's address. With proxy_hops trusted proxies in front of us,
+    the client is that many entries from the right of X-Forwarded-For plus
+    the connecting address; anything further left can be forged.
+    """
+    chain = [address.strip() for address in (forwarded_for or '').split(',') if address.strip()]
+    chain.append(remote_addr or 'unknown')
+    return chain[max(0, len(chain) - 1 - proxy_hops)]
+
+
+class RateLimitPolicy:
+    """A limit shared by a group of endpoints: `limit` requests per client per `window` seconds"""
+
+    def __init__(self, name, limit, window, paths):
+        self.name = name
+        self.limit = int(limit)
+        self.window = float(window)
+        self.paths = tuple(paths)
+        if self.limit < 1 or self.window <= 0:
+            raise ValueError(f"Rate limit policy {name} needs a limit of at least 1 and a positive window")
+
+    def as_dict(self):
+        return {'name': self.name, 'limit': self.limit, 'window': self.window, 'paths': list(self.paths)}
+
+
+class MemoryStore:
+    """Window counters in this process; each worker counts its own requests"""
+
+    def __init__(self):
+        self._windows = {}  # key -> [window index, previous count, current count, last hit]
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, window, now):
+        """Count a request if it fits; (allowed, previous, current) after the check"""
+        index, elapsed = divmod(now, window)
+        with self._lock:
+            entry = self._windows.get(key)
+            previous, current = roll_window(entry[0], entry[1], entry[2], index) if entry else (0, 0)
+
+            allowed = sliding_count(previous, current, elapsed / window) + 1 <= limit
+            if allowed:
+                current += 1
+            self._windows[key] = [index, previous, current, now]
+        return allowed, previous, current
+
+    def prune(self, before):
+        """Drop clients not seen since `before`"""
+        with self._lock:
+            stale = [key for key, entry in self._windows.items() if entry[3] < before]
+            for key in stale:
+                del self._windows[key]
+        return len(stale)
+
+    def __len__(self):
+        return len(self._windows)
+
+
+class DatabaseStore:
+    """Window counters in the rate_limits table, shared by every worker and instance"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def hit(self, key, limit, window, now):
+        index, elapsed = divmod(now, window)
+        allowed, stored_index, previous, current = self.db.hit_rate_limit(
+            key, int(index), 1 - elapsed / window, limit, int(now))
+        return (allowed,) + roll_window(stored_index, previous, current, int(index))
+
+    def prune(self, before):
+        return self.db.prune_rate_limits(int(before))
+
+
+class RateLimiter:
+    """
+    Checks requests against the policy for their path.
+
+    Each (policy, client) pair keeps two counters, for the current and the
+    previous fixed window, and the sliding count is interpolated from
+    them. A check is one dictionary lookup (or one upsert with the
+    database store) whatever the request rate, and only requests that are
+    let through are counted. Clients idle for two of the longest windows
+    are pruned every RATE_LIMIT_PRUNE_SECONDS.
+
+    The memory store counts per worker process, so the effective limit is
+    up to `limit` times the number of workers. RATE_LIMIT_STORE=database
+    makes it exact across workers at the cost of a query per limited
+    request. If the store fails, requests are let through.
+    """
+
+    def __init__(self, db=None, policies=None, store=None, enabled=None):
+        self.enabled = Config.RATE_LIMIT_ENABLED if enabled is None else enabled
+        if policies is None:
+            policies = [RateLimitPolicy(name, **settings) for name, settings in Config.RATE_LIMITS.items()]
+        self.policies = policies
+        self._by_path = {path: policy for policy in policies for path in policy.paths}
+        if store is None:
+            store = DatabaseStore(db) if Config.RATE_LIMIT_STORE == 'database' and db else MemoryStore()
+        self.store = store
+        self.rejected = {}
+        self._longest_window = max((policy.window for policy in policies), default=0)
+        self._pruned_at = time.time()
+
+    def policy_for(self, path):
+        return self._by_path.get(path) if self.enabled else None
+
+    def check(self, path, client):
+        """
+        None when the path is not limited (or the store failed), otherwise
+        {'policy', 'allowed', 'limit', 'remaining', 'retry_after'}
+        """
+        policy = self.policy_for(path)
+        if policy is None:
+            return None
+
+        now = time.time()
+        try:
+            allowed, previous, current = self.store.hit(f"{policy.name}:{client}", policy.limit, policy.window, now)
+            if now - self._pruned_at >= Config.RATE_LIMIT_PRUNE_SECONDS:
+                self._pruned_at = now
+                self.store.prune(now - 2 * self._longest_window)
+        except Exception as e:
+            logger.warning(f"⚠️ Rate limit check failed, letting the request through: {e}")
+            return None
+
+        elapsed = now % policy.window
+        result = {
+            'policy': policy.name,
+            'allowed': allowed,
+            'limit': policy.limit,
+            'remaining': max(0, math.floor(policy.limit - sliding_count(previous, current, elapsed / policy.window))),
+            'retry_after': 0
+        }
+        if not allowed:
+            self.rejected[policy.name] = self.rejected.get(policy.name, 0) + 1
+            result['retry_after'] = max(1, math.ceil(
+                seconds_until_allowed(previous, current, policy.limit, policy.window, elapsed)))
+        return result
+
+    def status(self):
+        return {
+            'enabled': self.enabled,
+            'store': type(self.store).__name__,
+            'policies': [policy.as_dict() for policy in self.policies],
+            'rejected': dict(self.rejected)
+        }
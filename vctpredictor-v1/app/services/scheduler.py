@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+VCT Job Scheduler
+Periodic jobs with persisted next-run times, run only on the elected leader
+"""
+
+import time
+import random
+import logging
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+
+class JobTimeout(Exception):
+    """Raised inside a job that ran past its timeout"""
+
+
+class IntervalSchedule:
+    """Every `interval`, on a grid anchored at a time of day (e.g. 03:00)"""
+
+    def __init__(self, interval, anchor='03:00'):
+        if interval.total_seconds() <= 0:
+            raise ValueError("Schedule interval must be positive")
+        self.interval = interval
+        self.anchor = anchor
+
+    def describe(self):
+        return f"every {self.interval} from {self.anchor}"
+
+    def next_run(self, after):
+        hour, minute = (int(part) for part in self.anchor.split(':'))
+        origin = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        steps = (after - origin) // self.interval + 1
+        return origin + steps * self.interval, 'scheduled'
+
+
+class CronSchedule:
+    """Standard five-field cron expression: minute hour day-of-month month day-of-week"""
+
+    RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs five fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.RANGES)
+        )
+        # Like cron, when both day fields are restricted a match on either is enough
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step = part.split('/')
+                step = int(step)
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = (int(n) for n in part.split('-'))
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            values.update(range(start, end + 1, step))
+        if high == 6 and 7 in values:
+            values.discard(7)
+            values.add(0)  # 7 is also Sunday
+        if not values or min(values) < low or max(values) > high:
+            raise ValueError(f"Cron field {field!r} out of range {low}-{high}")
+        return values
+
+    def describe(self):
+        return f"cron {self.expression}"
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day:
+            return weekday_ok
+        if self.any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_run(self, after):
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                year, month = (moment.year + 1, 1) if moment.month == 12 else (moment.year, moment.month + 1)
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment, 'scheduled'
+        raise ValueError(f"Cron expression {self.expression!r} never fires")
+
+
+class ScheduledJob:
+    """A periodic job definition"""
+
+    def __init__(self, name, schedule, handler, timeout_seconds=None, max_instances=1,
+                 jitter_seconds=0, catch_up=True, run_immediately=False):
+        self.name = name
+        self.run_immediately = run_immediately  # first ever run happens right away
+        self.schedule = schedule
+        self.handler = handler
+        self.timeout_seconds = timeout_seconds or Config.SCHEDULER_DEFAULT_TIMEOUT
+        self.max_instances = max_instances
+        self.jitter_seconds = jitter_seconds
+        self.catch_up = catch_up
+
+
+class RunContext:
+    """
+    Handed to scheduled handlers. report(stage) records progress and is also
+    where a run that has passed its timeout gets cancelled, since Python
+    threads cannot be killed from outside.
+    """
+
+    def __init__(self, scheduler, job, deadline):
+        self.scheduler = scheduler
+        self.job = job
+        self.deadline = deadline
+        self.cancelled = threading.Event()
+
+    def check(self):
+        if self.cancelled.is_set() or datetime.now() > self.deadline:
+            self.cancelled.set()
+            raise JobTimeout(f"{self.job.name} exceeded its {self.job.timeout_seconds}s timeout")
+
+    def report(self, stage):
+        self.check()
+        try:
+            self.scheduler.db.save_scheduled_job(self.job.name, last_stage=stage)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not record stage '{stage}' for {self.job.name}: {e}")
+
+
+class Scheduler:
+    """
+    Runs registered jobs when their persisted next_run_at comes due.
+
+    Only the process holding the leader lock executes anything. Missed runs
+    (for example while every worker was down) are coalesced into a single
+    catch-up run, next-run times get random jitter, each job has a timeout and
+    a limit on concurrent instances.
+    """
+
+    def __init__(self, db, leader_lock, tick_seconds=None, max_workers=None):
+        self.db = db
+        self.leader_lock = leader_lock
+        self.tick_seconds = tick_seconds or Config.SCHEDULER_TICK_SECONDS
+        self.jobs = {}
+        self.running = {}  # job name -> list of active RunContexts
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or Config.SCHEDULER_WORKERS,
+                                            thread_name_prefix='vct-scheduled')
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._was_leader = False
+
+    def register(self, job):
+        """Register a job and make sure it has a persisted next run"""
+        self.jobs[job.name] = job
+        self.running.setdefault(job.name, [])
+
+        state = self.db.get_scheduled_job(job.name)
+        description = job.schedule.describe()
+        if state is None or state['schedule'] != description or not state['next_run_at']:
+            # New job or changed definition: schedule from now
+            if state is None and job.run_immediately:
+                next_run, reason = datetime.now(), 'first run'
+            else:
+                next_run, reason = self.compute_next_run(job, datetime.now())
+            self.db.save_scheduled_job(job.name, schedule=description, next_run_at=next_run.isoformat(),
+                                       next_run_reason=reason)
+            logger.info(f"🗓️ {job.name}: {description}, next run {next_run:%Y-%m-%d %H:%M:%S}")
+
+    def compute_next_run(self, job, after):
+        next_run, reason = job.schedule.next_run(after)
+        if job.jitter_seconds:
+            next_run += timedelta(seconds=random.uniform(0, job.jitter_seconds))
+        return next_run, reason
+
+    def reschedule(self, name, now=None):
+        """Recompute a job's next run, e.g. after the data its schedule depends on changed"""
+        job = self.jobs[name]
+        with self._lock:
+            if self.running[name]:
+                return None  # it recomputes when the run finishes
+        next_run, reason = self.compute_next_run(job, now or datetime.now())
+        self.db.save_scheduled_job(name, next_run_at=next_run.isoformat(), next_run_reason=reason)
+        logger.info(f"🗓️ {name} rescheduled for {next_run:%Y-%m-%d %H:%M:%S} ({reason})")
+        return next_run
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='vct-scheduler', daemon=True)
+        self._thread.start()
+        print(f"🔄 Scheduler started with {len(self.jobs)} jobs (runs on the elected leader)")
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"❌ Scheduler tick failed: {e}")
+            self._stop.wait(self.tick_seconds)
+
+    def tick(self, now=None):
+        """Check timeouts and start due jobs; returns the names started"""
+        now = now or datetime.now()
+        self._enforce_timeouts(now)
+
+        if not self.leader_lock.is_leader:
+            self._was_leader = False
+            return []
+        if not self._was_leader:
+            self._was_leader = True
+            self._resume_interrupted_runs(now)
+
+        started = []
+        for job in self.jobs.values():
+            state = self.db.get_scheduled_job(job.name)
+            if not state or not state['next_run_at']:
+                continue
+            due_at = datetime.fromisoformat(state['next_run_at'])
+            if due_at > now:
+                continue
+
+            with self._lock:
+                if len(self.running[job.name]) >= job.max_instances:
+                    logger.info(f"⏭️ {job.name} is due but already has {job.max_instances} run(s) active")
+                    continue
+
+            missed = self._count_missed(job, due_at, now)
+            next_run, reason = self.compute_next_run(job, now)
+            if missed and not job.catch_up:
+                # Too late for this slot; wait for the next one instead
+                logger.info(f"⏭️ Skipping {missed + 1} missed runs of {job.name}")
+                self.db.save_scheduled_job(job.name, next_run_at=next_run.isoformat(), next_run_reason=reason)
+                continue
+            if missed:
+                logger.info(f"♻️ Coalescing {missed + 1} missed runs of {job.name} into one")
+
+            self._start_run(job, now, next_run, reason)
+            started.append(job.name)
+        return started
+
+    def _count_missed(self, job, due_at, now):
+        """How many further slots passed after due_at (capped, only used for logging/policy)"""
+        missed = 0
+        slot = due_at
+        while missed < 1000:
+            slot, _ = job.schedule.next_run(slot)
+            if slot > now:
+                break
+            missed += 1
+        return missed
+
+    def _resume_interrupted_runs(self, now):
+        """A run left 'running' by another process was cut short by a leader change; redo it now"""
+        for job in self.jobs.values():
+            state = self.db.get_scheduled_job(job.name)
+            if state and state['last_status'] == 'running' and state['run_owner'] != self.leader_lock.owner:
+                logger.warning(f"♻️ {job.name} was interrupted on {state['run_owner']}, rescheduling now")
+                self.db.save_scheduled_job(job.name, last_status='interrupted', next_run_at=now.isoformat(),
+                                           next_run_reason='resume after leader change')
+
+    def _start_run(self, job, now, next_run, reason):
+        context = RunContext(self, job, now + timedelta(seconds=job.timeout_seconds))
+        with self._lock:
+            self.running[job.name].append(context)
+
+        # Advance the schedule first so a crash mid-run does not loop on the same slot
+        self.db.save_scheduled_job(job.name, next_run_at=next_run.isoformat(), next_run_reason=reason,
+                                   last_started_at=now.isoformat(), last_status='running', last_stage=None,
+                                   last_error=None, run_owner=self.leader_lock.owner)
+        logger.info(f"🚀 Running scheduled job {job.name}")
+        self._executor.submit(self._run, job, context)
+
+    def _run(self, job, context):
+        started = time.monotonic()
+        status, result, error = 'succeeded', None, None
+        try:
+            result = job.handler(context)
+            if context.cancelled.is_set():
+                status, error = 'timeout', f"exceeded {job.timeout_seconds}s timeout"
+        except JobTimeout as e:
+            status, error = 'timeout', str(e)
+        except Exception as e:
+            # Handlers may wrap the JobTimeout in their own error
+            status = 'timeout' if context.cancelled.is_set() else 'failed'
+            error = str(e)
+        finally:
+            with self._lock:
+                self.running[job.name].remove(context)
+
+        duration = time.monotonic() - started
+        log = logger.info if status == 'succeeded' else logger.error
+        log(f"{'✅' if status == 'succeeded' else '❌'} Scheduled job {job.name} {status} in {duration:.1f}s"
+            + (f": {error}" if error else ""))
+        fields = {}
+        if getattr(job.schedule, 'recompute_after_run', False):
+            # Schedules that depend on what the run found pick their next slot now
+            next_run, reason = self.compute_next_run(job, datetime.now())
+            fields = {'next_run_at': next_run.isoformat(), 'next_run_reason': reason}
+        try:
+            self.db.save_scheduled_job(job.name, last_status=status, last_error=error, last_result=result,
+                                       last_finished_at=datetime.now().isoformat(),
+                                       last_duration=round(duration, 3), **fields)
+        except Exception as e:
+            logger.error(f"❌ Could not record result of {job.name}: {e}")
+
+    def _enforce_timeouts(self, now):
+        with self._lock:
+            overdue = [context for contexts in self.running.values() for context in contexts
+                       if now > context.deadline and not context.cancelled.is_set()]
+        for context in overdue:
+            logger.warning(f"⏱️ {context.job.name} passed its timeout, cancelling")
+            context.cancelled.set()
+
+    def status(self):
+        """Persisted schedule plus what is running in this process"""
+        jobs = []
+        for state in self.db.get_scheduled_jobs():
+            if state['name'] not in self.jobs:
+                continue
+            with self._lock:
+                state['running_here'] = len(self.running.get(state['name'], []))
+            jobs.append(state)
+        return {
+            'is_leader': self.leader_lock.is_leader,
+            'jobs': jobs
+        }
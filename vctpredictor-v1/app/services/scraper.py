@@ -6,567 +6,426 @@ Automated scraping of VCT standings from vlr.gg
 
 import os
 import time
+import hashlib
 import logging
-import cloudscraper
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
+from config.base import Config
 from app.services.database import MatchDatabase
+from app.services.fixtures import FixtureStore
+from app.services.http_client import RateLimitedClient
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.health_state import ScraperHealth
+from app.services.parsing import StandingsParser, get_parser_pool, parse_standings_page, inspect_page, analyze_page
+from app.services.tracing import Tracer, maybe_span, summarize_scrape_trace
+from app.services.metrics import record_scrape_trace
+from app.services.scheduler import JobTimeout
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-class VCTScraper:
-    def __init__(self, database_url=None):
-        """Initialize the VCT scraper"""
+class VCTScraper(StandingsParser):
+    def __init__(self, database_url=None, http_client=None, health=None):
+        """
+        Initialize the VCT scraper (http_client replaces the live session, e.g. a FixtureStore).
+        Run outcomes go to health, the app's ScraperHealth, or straight to the database without one.
+        """
         self.database_url = database_url or os.environ.get('DATABASE_URL')
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable not set")
         
         self.db = MatchDatabase(self.database_url)
-        self.scraper = cloudscraper.create_scraper()
+        self.health = health or ScraperHealth(self.db, flush_seconds=0)
+        self.last_write_error = None
+        self.breaker = None
+        if http_client is not None:
+            self.scraper = http_client
+        elif Config.SCRAPER_REPLAY_DIR:
+            logger.info(f"📼 Replaying captured pages from {Config.SCRAPER_REPLAY_DIR}")
+            self.scraper = FixtureStore(Config.SCRAPER_REPLAY_DIR, latency=Config.SCRAPER_REPLAY_LATENCY_SECONDS)
+        else:
+            self.breaker = CircuitBreaker(self.db, Config.CIRCUIT_NAME)
+            self.scraper = RateLimitedClient(breaker=self.breaker)
         self.base_url = "https://www.vlr.gg"
+        self.parser_pool = get_parser_pool()
+        self.last_changes = None
+        self.last_run_result = None
+        self.progress_callback = None
+        self.tracer = None
         
         logger.info("🚀 VCT Scraper initialized")
     
-    def clean_team_name(self, team_name):
-        """Clean and standardize team names"""
-        if not team_name:
-            return "Unknown Team"
-        
-        # Remove common suffixes and clean up
-        team_name = team_name.strip()
-        
-        # Remove country suffixes and other unwanted text - be more aggressive
-        suffixes_to_remove = [
-            'United States', 'Brazil', 'Argentina', 'Chile', 'Mexico', 'Canada',
-            'Spoiler hidden', 'Spoiler', 'hidden', 'Esports', 'esports',
-            'UnitedStates', 'BrazilArgentina', 'ChileMexico', 'CanadaUnited'
-        ]
-        
-        for suffix in suffixes_to_remove:
-            team_name = team_name.replace(suffix, '').strip()
-        
-        # Clean up any remaining artifacts
-        team_name = team_name.replace('  ', ' ')  # Remove double spaces
-        team_name = team_name.strip()
-        
-        # Standardize common team names
-        name_mapping = {
-            '2game': '2Game Esports',
-            'furia': 'FURIA',
-            'kru': 'KRÜ',
-            'leviatan': 'Leviatán',
-            'shopify': 'Shopify Rebellion',
-            'mibr': 'MIBR',
-            'loud': 'LOUD',
-            'nrg': 'NRG',
-            'cloud9': 'Cloud9',
-            'g2': 'G2 Esports',
-            'evil geniuses': 'Evil Geniuses',
-            '100 thieves': '100 Thieves',
-            'sentinels': 'Sentinels',
-            'visa kru': 'VISA KRÜ',
-            'visa krü': 'VISA KRÜ'
-        }
-        
-        # Try exact match first
-        if team_name.lower() in name_mapping:
-            return name_mapping[team_name.lower()]
-        
-        # Try partial matches
-        for partial, full_name in name_mapping.items():
-            if partial in team_name.lower():
-                return full_name
-        
-        # If no mapping found, capitalize properly
-        if team_name:
-            # Handle special cases like "G2" -> "G2 Esports"
-            if team_name.upper() == 'G2':
-                return 'G2 Esports'
-            elif team_name.upper() == 'NRG':
-                return 'NRG'
-            elif team_name.upper() == 'MIBR':
-                return 'MIBR'
-            elif team_name.upper() == 'LOUD':
-                return 'LOUD'
-            elif team_name.upper() == 'FURIA':
-                return 'FURIA'
-            elif team_name.upper() == 'KRÜ':
-                return 'KRÜ'
-            elif team_name.upper() == 'LEVIATÁN':
-                return 'Leviatán'
-            else:
-                # Standard capitalization
-                return team_name.title()
+    def event_url(self, event):
+        return f"{self.base_url}/event/{event['event_id']}/{event['slug']}"
+
+    def scrape_event(self, event):
+        """Scrape the standings of one tracked event, tagging every row with its event"""
+        url = self.event_url(event)
+        logger.info(f"🔍 Scraping {event['region']} ({event['name']}): {url}")
+        with maybe_span(self.tracer, 'event', region=event['region'], event_id=str(event['event_id'])) as span:
+            teams_data = self.scrape_single_vct_url(url)
+            span.set(teams=len(teams_data) if teams_data else 0)
+            if not teams_data or len(teams_data) < Config.MIN_TEAMS_PER_EVENT:
+                logger.warning(f"⚠️ Only found {len(teams_data) if teams_data else 0} teams for {event['name']}")
+                span.fail(f"only {len(teams_data) if teams_data else 0} teams")
+                return None
         
-        return "Unknown Team"
+        for team_data in teams_data:
+            team_data['region'] = event['region']
+            team_data['event_id'] = str(event['event_id'])
+            team_data['stage'] = event['stage']
+        logger.info(f"✅ Successfully scraped {len(teams_data)} teams from {url}")
+        return teams_data
 
-    def scrape_vct_standings(self):
-        """Scrape VCT standings from multiple sources"""
+    def scrape_vct_standings(self, events=None):
+        """
+        Scrape the standings of every tracked event in parallel.
+        Returns (event, teams_data) pairs; teams_data is None for events that failed.
+        """
+        events = events or Config.TRACKED_EVENTS
         try:
-            # Try VCT 2025 URLs first
-            vct_urls = [
-                "https://www.vlr.gg/event/2501/vct-2025-americas-stage-2",
-                "https://www.vlr.gg/event/2347/vct-2025-americas-stage-1"
-            ]
-            
-            for url in vct_urls:
-                logger.info(f"🔍 Trying VCT URL: {url}")
-                teams_data = self.scrape_single_vct_url(url)
-                if teams_data and len(teams_data) >= 10:  # Expect at least 10 teams
-                    logger.info(f"✅ Successfully scraped {len(teams_data)} teams from {url}")
-                    return teams_data
-                else:
-                    logger.warning(f"⚠️ Only found {len(teams_data) if teams_data else 0} teams from {url}")
-            
-            # No fallback to sample data - return None if scraping fails
-            logger.error("❌ Failed to scrape VCT data from all sources")
-            return None
-            
+            # The shared HTTP client rate limits per host, so parallel events still respect vlr.gg
+            with ThreadPoolExecutor(max_workers=max(1, min(Config.SCRAPER_EVENT_WORKERS, len(events))),
+                                    thread_name_prefix='scrape-event') as executor:
+                results = list(zip(events, executor.map(self.scrape_event, events)))
+            
+            if not any(teams_data for _, teams_data in results):
+                # No fallback to sample data - callers treat this as a failed scrape
+                logger.error("❌ Failed to scrape VCT data from all events")
+            return results
+            
+        except JobTimeout:
+            raise
         except Exception as e:
             logger.error(f"❌ Error scraping VCT standings: {e}")
-            return None
+            return []
 
     def scrape_single_vct_url(self, url):
         """Scrape a single VCT URL and return all teams from all groups"""
         try:
-            response = self.scraper.get(url)
-            if response.status_code != 200:
-                logger.warning(f"⚠️ Failed to fetch {url}: {response.status_code}")
-                return None
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            self.report_progress('fetch')
+            with maybe_span(self.tracer, 'fetch', url=url) as span:
+                response = self.scraper.get(url)
+                span.set(status_code=response.status_code, bytes=len(response.content or b''))
+                if response.status_code != 200:
+                    logger.warning(f"⚠️ Failed to fetch {url}: {response.status_code}")
+                    span.fail(f"HTTP {response.status_code}")
+                    return None
             logger.info(f"📄 Successfully fetched {url}")
             
-            # Find ALL tables on the page
-            all_tables = soup.find_all('table')
-            logger.info(f"📊 Found {len(all_tables)} tables on the page")
-            
-            all_teams = []
-            
-            # Process each table to find group standings
-            for table_index, table in enumerate(all_tables):
-                logger.info(f"🔍 Processing table {table_index + 1}")
-                
-                # Check if this table has standings data
-                if self.is_standings_table(table):
-                    logger.info(f"✅ Table {table_index + 1} appears to be a standings table")
-                    
-                    # Try to determine group name from table context
-                    group_name = self.determine_group_from_table(table, table_index, soup)
-                    logger.info(f"🏷️ Determined group name: {group_name}")
-                    
-                    # Parse teams from this table
-                    table_teams = self.parse_standings_table(table, group_name)
-                    if table_teams:
-                        logger.info(f"📋 Found {len(table_teams)} teams in {group_name} group")
-                        all_teams.extend(table_teams)
-                    else:
-                        logger.warning(f"⚠️ No teams found in table {table_index + 1}")
-                else:
-                    logger.info(f"⏭️ Table {table_index + 1} is not a standings table, skipping")
-            
-            logger.info(f"🎯 Total teams found across all groups: {len(all_teams)}")
-            return all_teams
-            
+            # Parsing runs in the parser pool; fetching and writing stay in this thread
+            self.report_progress('parse')
+            with maybe_span(self.tracer, 'parse') as span:
+                result = self.parser_pool.run(parse_standings_page, response.content)
+                span.set(tables_examined=result['tables'], tables_accepted=result['standings_tables'],
+                         rows=result['rows'], teams=len(result['teams']))
+                if self.tracer:
+                    # Timed inside the parser pool; the rest of the parse span is transfer overhead
+                    self.tracer.record('parse_html', result['html_seconds'], parent=span)
+                    for stats in result['table_stats']:
+                        self.tracer.record('parse_standings_table', stats['seconds'], parent=span,
+                                           group_name=stats['group_name'], rows=stats['rows'], teams=stats['teams'])
+            
+            logger.info(f"📊 Found {result['standings_tables']} standings tables out of {result['tables']} tables on the page")
+            logger.info(f"🎯 Total teams found across all groups: {len(result['teams'])}")
+            return result['teams']
+            
+        except JobTimeout:
+            raise  # the whole run is cancelled, not just this page
+        except CircuitOpenError as e:
+            logger.warning(f"⛔ Skipping {url}: {e}")
+            return None
         except Exception as e:
             logger.error(f"❌ Error scraping {url}: {e}")
             return None
 
-    def is_standings_table(self, table):
-        """Check if a table contains standings data"""
-        try:
-            # Look for common standings indicators
-            text = table.get_text().lower()
-            standings_indicators = ['rec', 'map', 'rnd', 'δ', 'delta', 'wins', 'losses', 'points']
-            
-            # Check if table has multiple columns (likely standings)
-            rows = table.find_all('tr')
-            if len(rows) < 2:  # Need at least header + 1 data row
-                return False
-            
-            # Check if first row has headers
-            first_row = rows[0]
-            headers = first_row.find_all(['th', 'td'])
-            if len(headers) < 3:  # Need at least 3 columns for standings
-                return False
-            
-            # Check if headers contain standings indicators
-            header_text = ' '.join([h.get_text().lower() for h in headers])
-            has_standings_indicators = any(indicator in header_text for indicator in standings_indicators)
-            
-            return has_standings_indicators
-            
-        except Exception as e:
-            logger.error(f"❌ Error checking if table is standings: {e}")
-            return False
+    def compute_standings_hash(self, teams_data):
+        """Compute a canonical content hash of parsed standings (row order independent)"""
+        canonical = sorted(
+            [
+                team_data['group_name'],
+                team_data['team'],
+                team_data['record'],
+                team_data['map_diff'],
+                team_data['round_diff'],
+                float(team_data['delta'])
+            ]
+            for team_data in teams_data
+        )
+        payload = json.dumps(canonical, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
-    def determine_group_from_table(self, table, table_index, soup):
-        """Determine the group name for a standings table"""
-        try:
-            # Method 1: Look for group name in table headers
-            headers = table.find_all(['th', 'td'])
-            for header in headers:
-                header_text = header.get_text().lower()
-                if 'alpha' in header_text:
-                    return 'Alpha'
-                elif 'omega' in header_text:
-                    return 'Omega'
-                elif 'group a' in header_text:
-                    return 'Alpha'
-                elif 'group b' in header_text:
-                    return 'Omega'
-            
-            # Method 2: Look for group name above/below the table
-            # Check previous sibling elements
-            prev_element = table.find_previous_sibling()
-            if prev_element:
-                prev_text = prev_element.get_text().lower()
-                if 'alpha' in prev_text:
-                    return 'Alpha'
-                elif 'omega' in prev_text:
-                    return 'Omega'
-            
-            # Method 3: Look for group name in nearby headings
-            nearby_headings = table.find_previous_siblings(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-            for heading in nearby_headings:
-                heading_text = heading.get_text().lower()
-                if 'alpha' in heading_text:
-                    return 'Alpha'
-                elif 'omega' in heading_text:
-                    return 'Omega'
-            
-            # Method 4: Check if this is the first or second table
-            # First table is usually Alpha, second is usually Omega
-            if table_index == 0:
-                return 'Alpha'
-            elif table_index == 1:
-                return 'Omega'
-            else:
-                return f'Group {table_index + 1}'  # Fallback naming
-                
-        except Exception as e:
-            logger.error(f"❌ Error determining group name: {e}")
-            return f'Group {table_index + 1}'  # Fallback naming
-    
-    def find_group_indicators(self, table):
-        """Find group indicators in the table"""
-        try:
-            indicators = []
-            text = table.get_text().lower()
-            
-            if 'alpha' in text:
-                indicators.append('alpha')
-            if 'omega' in text:
-                indicators.append('omega')
-            if 'group a' in text:
-                indicators.append('group_a')
-            if 'group b' in text:
-                indicators.append('group_b')
-            
-            return indicators
-        except Exception as e:
-            logger.error(f"❌ Error finding group indicators: {e}")
-            return []
+    def diff_standings(self, teams_data, existing_teams):
+        """Split scraped standings into added, changed and removed rows"""
+        existing = {(t['group_name'], t['team']): t for t in existing_teams}
+        
+        scraped = {}
+        for team_data in teams_data:
+            # A team listed twice keeps its first row, matching the UNIQUE(group_name, team) key
+            scraped.setdefault((team_data['group_name'], team_data['team']), team_data)
+        
+        added = []
+        changed = []
+        for key, team_data in scraped.items():
+            current = existing.get(key)
+            if current is None:
+                added.append(team_data)
+            elif (current['record'] != team_data['record'] or
+                  current['map_diff'] != team_data['map_diff'] or
+                  current['round_diff'] != team_data['round_diff'] or
+                  float(current['delta']) != float(team_data['delta'])):
+                changed.append(team_data)
+        
+        removed = [key for key in existing if key not in scraped]
+        return added, changed, removed
 
-    def determine_group_better(self, row_index, teams_found, cells, group_indicators):
-        """Better logic for determining group assignment"""
-        try:
-            # If we have explicit group indicators, use them
-            if 'alpha' in group_indicators:
-                return 'Alpha'
-            elif 'omega' in group_indicators:
-                return 'Omega'
-            
-            # If no explicit indicators, distribute evenly
-            # First 6 teams go to Alpha, next 6 to Omega
-            if teams_found < 6:
-                return 'Alpha'
-            else:
-                return 'Omega'
-                
-        except Exception as e:
-            logger.error(f"❌ Error determining group: {e}")
-            return 'Alpha'  # Default fallback
+    def update_event(self, event, teams_data):
+        """Write one event's standings in its own transaction, skipping it when unchanged"""
+        content_hash = self.compute_standings_hash(teams_data)
+        stored_hash = self.db.get_state(self.db.standings_hash_key(event['event_id']))
+        
+        if content_hash == stored_hash:
+            logger.info(f"⏭️ {event['name']} unchanged since last run, skipping database write")
+            return {'skipped': True, 'added': 0, 'changed': 0, 'removed': 0}
+        
+        existing_teams = self.db.get_all_teams_with_stats(event_id=event['event_id'])
+        existing_teams = [t for t in existing_teams if t['stage'] == event['stage']]
+        added, changed, removed = self.diff_standings(teams_data, existing_teams)
+        self.db.apply_standings_changes(event, added, changed, removed, content_hash)
+        logger.info(f"✅ {event['name']} written: {len(added)} added, {len(changed)} changed, {len(removed)} removed")
+        return {'skipped': False, 'added': len(added), 'changed': len(changed), 'removed': len(removed)}
 
-    def update_database(self, teams_data):
-        """Update database with scraped team data"""
+    def update_database(self, event_results):
+        """
+        Update database with scraped (event, teams_data) pairs, writing only rows that changed.
+        Events that failed to scrape keep their previous standings.
+        """
         try:
             logger.info("💾 Updating database...")
             
-            # Clear existing data
-            # Note: In production, you might want to keep historical data
-            # For now, we'll replace the data
-            
-            # Insert new team data
-            for team_data in teams_data:
-                self.db.insert_match_data(
-                    group=team_data['group_name'],
-                    team=team_data['team'],
-                    record=team_data['record'],
-                    map_diff=team_data['map_diff'],
-                    round_diff=team_data['round_diff'],
-                    delta=team_data['delta']
-                )
-            
-            # Update scraper health
-            self.db.update_scraper_health(
-                status='success',
-                success_count=1,
-                total_runs=1
-            )
+            per_event = {}
+            with maybe_span(self.tracer, 'write') as span:
+                for event, teams_data in event_results:
+                    if teams_data:
+                        with maybe_span(self.tracer, 'write_event', region=event['region'],
+                                        event_id=str(event['event_id'])) as event_span:
+                            per_event[str(event['event_id'])] = self.update_event(event, teams_data)
+                            event_span.set(**per_event[str(event['event_id'])])
+                span.set(events=len(per_event))
+            
+            self.last_changes = {
+                'skipped': all(changes['skipped'] for changes in per_event.values()),
+                'added': sum(changes['added'] for changes in per_event.values()),
+                'changed': sum(changes['changed'] for changes in per_event.values()),
+                'removed': sum(changes['removed'] for changes in per_event.values()),
+                'events': per_event
+            }
+            
+            self.db.set_state(self.db.STANDINGS_SCRAPED_KEY, datetime.now().isoformat())
             
             logger.info("✅ Database updated successfully")
             return True
             
         except Exception as e:
             logger.error(f"❌ Database update failed: {e}")
+            if self.tracer:
+                for span in self.tracer.find('write'):
+                    span.fail(e)
             
-            # Update scraper health with error
-            self.db.update_scraper_health(
-                status='error',
-                success_count=0,
-                total_runs=1,
-                error_message=str(e)
-            )
+            # Reported in scraper health when the run finishes
+            self.last_write_error = str(e)
             return False
     
-    def run_scrape(self):
-        """Run the scraper and return success status"""
+    def report_progress(self, stage):
+        """Forward a pipeline stage (fetch, parse, write) to the progress callback"""
+        if self.progress_callback:
+            self.progress_callback(stage)
+
+    def run_scrape(self, progress_callback=None):
+        """Run the scraper and return success status (details are kept in last_run_result)"""
+        self.progress_callback = progress_callback
+        self.last_changes = None
+        self.last_run_result = {'success': False, 'teams_count': 0, 'changes': None, 'http': None}
+        if hasattr(self.scraper, 'reset_stats'):
+            self.scraper.reset_stats()
+        
+        self.last_write_error = None
+        self.health.record('running')
+        
+        self.tracer = Tracer('scrape')
+        success = False
+        try:
+            success = self._run_scrape()
+            return success
+        except JobTimeout as e:
+            logger.error(f"⏱️ Scrape cancelled: {e}")
+            self.last_run_result['error'] = str(e)
+            self.last_run_result['timed_out'] = True
+            raise
+        finally:
+            self.finish_trace(success)
+            self.record_health(success)
+    
+    def record_health(self, success):
+        """Record the run's outcome in scraper health (exactly once per run)"""
+        if self.last_run_result.get('timed_out'):
+            self.health.record('timeout', success=False, error=self.last_run_result['error'])
+        elif success and self.last_write_error:
+            self.health.record('error', success=False, error=self.last_write_error)
+        elif success:
+            self.health.record('success', success=True)
+        else:
+            self.health.record('failed', success=False, error=self.failure_message())
+    
+    def failure_message(self):
+        """Why the last run failed, for scraper health and job errors"""
+        run_result = self.last_run_result or {}
+        circuit = run_result.get('circuit')
+        if circuit and circuit.get('rejecting'):
+            return f"vlr.gg is unavailable (circuit open until {circuit['retry_at'][:19]}), serving stored standings"
+        return run_result.get('error') or 'Scraper failed to complete'
+    
+    def finish_trace(self, success):
+        """Persist the run's trace to scrape_runs and fold it into the metrics"""
+        tracer, self.tracer = self.tracer, None
+        tracer.finish('ok' if success else 'error')
+        summary = summarize_scrape_trace(tracer, self.last_run_result.get('teams_count', 0))
+        record_scrape_trace(tracer)
+        try:
+            self.db.save_scrape_run(summary, keep=Config.SCRAPE_RUNS_KEEP)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not store scrape run: {e}")
+        
+        self.last_run_result['trace'] = {key: value for key, value in summary.items() if key != 'spans'}
+        logger.info(f"⏱️ Scrape {summary['outcome']} in {summary['duration_seconds']:.2f}s: "
+                    f"fetch {summary['fetch_seconds']:.2f}s, parse {summary['parse_seconds']:.2f}s, "
+                    f"write {summary['write_seconds']:.2f}s, {summary['bytes_downloaded']} bytes over {summary['pages']} pages")
+    
+    def _run_scrape(self):
         try:
             logger.info("🚀 Starting VCT standings scrape...")
-            teams_data = self.scrape_vct_standings()
+            if self.breaker and self.breaker.is_open():
+                # Fail fast; the standings already stored keep being served, marked stale
+                circuit = self.breaker.status()
+                logger.warning(f"⛔ vlr.gg circuit is open until {circuit['retry_at'][:19]}, skipping scrape")
+                self.last_run_result['circuit'] = circuit
+                return False
             
-            if teams_data and len(teams_data) >= 10:
+            event_results = self.scrape_vct_standings()
+            teams_data = [team for _, event_teams in event_results if event_teams for team in event_teams]
+            failed_events = [event['region'] for event, event_teams in event_results if not event_teams]
+            
+            if teams_data:
                 logger.info(f"✅ Scrape successful: {len(teams_data)} teams found")
+                if failed_events:
+                    logger.warning(f"⚠️ Keeping previous standings for: {', '.join(failed_events)}")
                 
                 # Log group distribution
-                alpha_count = len([t for t in teams_data if t['group_name'] == 'Alpha'])
-                omega_count = len([t for t in teams_data if t['group_name'] == 'Omega'])
-                logger.info(f"📊 Group distribution: Alpha={alpha_count}, Omega={omega_count}")
+                for event, event_teams in event_results:
+                    if event_teams:
+                        groups = {}
+                        for team in event_teams:
+                            groups[team['group_name']] = groups.get(team['group_name'], 0) + 1
+                        distribution = ', '.join(f"{name}={count}" for name, count in sorted(groups.items()))
+                        logger.info(f"📊 {event['region']} group distribution: {distribution}")
                 
                 # Update database with new data
                 try:
                     if hasattr(self, 'db') and self.db:
-                        success = self.update_database(teams_data)
+                        self.report_progress('write')
+                        success = self.update_database(event_results)
                         if success:
                             logger.info("✅ Database updated successfully with new VCT data")
                         else:
                             logger.warning("⚠️ Database update failed")
                     else:
                         logger.info("ℹ️ No database connection, skipping database update")
+                except JobTimeout:
+                    raise
                 except Exception as e:
                     logger.error(f"❌ Database update error: {e}")
                 
+                self.last_run_result = {
+                    'success': True,
+                    'teams_count': len(teams_data),
+                    'changes': self.last_changes,
+                    'failed_events': failed_events,
+                    'http': self.http_stats()
+                }
                 return True
             else:
-                logger.warning(f"⚠️ Scrape incomplete: only {len(teams_data) if teams_data else 0} teams found")
+                logger.warning("⚠️ Scrape incomplete: no event returned enough teams")
+                self.last_run_result['http'] = self.http_stats()
+                if self.breaker:
+                    self.last_run_result['circuit'] = self.breaker.status()
                 return False
                 
+        except JobTimeout:
+            raise
         except Exception as e:
             logger.error(f"❌ Scrape failed: {e}")
+            self.last_run_result['http'] = self.http_stats()
+            self.last_run_result['error'] = str(e)
             return False
+    
+    def http_stats(self):
+        """Request, retry and throttle counters for the current run"""
+        if hasattr(self.scraper, 'get_stats'):
+            stats = self.scraper.get_stats()
+            logger.info(f"🌐 HTTP: {stats['requests']} requests, {stats['retries']} retries, "
+                        f"{stats['throttle_wait_seconds']}s throttled, {stats['backoff_seconds']}s backing off")
+            return stats
+        return None
 
     def inspect_vct_page(self, url):
-        """Inspect VCT page structure for debugging"""
+        """Inspect VCT page structure for debugging; returns one summary dict per table"""
         try:
             response = self.scraper.get(url)
             if response.status_code != 200:
                 logger.error(f"❌ Failed to fetch {url}: {response.status_code}")
                 return None
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
             logger.info(f"📄 Successfully fetched {url}")
             
-            # Find all tables
-            all_tables = soup.find_all('table')
-            logger.info(f"📊 Found {len(all_tables)} tables on the page")
+            tables = self.parser_pool.run(inspect_page, response.content)
+            logger.info(f"📊 Found {len(tables)} tables on the page")
             
-            # Analyze each table
-            for i, table in enumerate(all_tables):
-                logger.info(f"🔍 Table {i + 1}:")
-                
-                # Check if it's a standings table
-                is_standings = self.is_standings_table(table)
-                logger.info(f"  - Is standings table: {is_standings}")
-                
-                if is_standings:
-                    # Count rows
-                    rows = table.find_all('tr')
-                    logger.info(f"  - Rows: {len(rows)}")
-                    
-                    # Show headers
-                    if rows:
-                        headers = rows[0].find_all(['th', 'td'])
-                        header_texts = [h.get_text(strip=True) for h in headers]
-                        logger.info(f"  - Headers: {header_texts}")
-                        
-                        # Look for group indicators
-                        group_indicators = self.find_group_indicators(table)
-                        logger.info(f"  - Group indicators: {group_indicators}")
-                        
-                        # Show sample data
-                        if len(rows) > 1:
-                            sample_row = rows[1]
-                            cells = sample_row.find_all('td')
-                            cell_texts = [c.get_text(strip=True) for c in cells]
-                            logger.info(f"  - Sample row: {cell_texts}")
+            for table in tables:
+                logger.info(f"🔍 Table {table['index'] + 1}:")
+                logger.info(f"  - Is standings table: {table['is_standings']}")
+                if table['is_standings']:
+                    logger.info(f"  - Rows: {table.get('rows')}")
+                    logger.info(f"  - Headers: {table.get('headers')}")
+                    logger.info(f"  - Group indicators: {table.get('group_indicators')}")
+                    logger.info(f"  - Sample row: {table.get('sample_row')}")
             
-            return soup
+            return tables
             
         except Exception as e:
             logger.error(f"❌ Error inspecting VCT page: {e}")
             return None
 
-    def analyze_vct_page_structure(self, url):
-        """Analyze the overall VCT page structure"""
+    def analyze_vct_page_structure(self, url, team_names=()):
+        """Analyze the overall VCT page structure; returns a plain dict of findings"""
         try:
             response = self.scraper.get(url)
             if response.status_code != 200:
                 logger.error(f"❌ Failed to fetch {url}: {response.status_code}")
                 return None
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
             logger.info(f"📄 Successfully fetched {url}")
             
-            # Get page text for analysis
-            page_text = soup.get_text()
-            
-            # Count group mentions
-            alpha_count = page_text.lower().count('alpha')
-            omega_count = page_text.lower().count('omega')
-            group_a_count = page_text.lower().count('group a')
-            group_b_count = page_text.lower().count('group b')
+            analysis = self.parser_pool.run(analyze_page, response.content, tuple(team_names))
             
             logger.info(f"🏷️ Group mentions in page text:")
-            logger.info(f"  - Alpha: {alpha_count}")
-            logger.info(f"  - Omega: {omega_count}")
-            logger.info(f"  - Group A: {group_a_count}")
-            logger.info(f"  - Group B: {group_b_count}")
-            
-            # Find all tables
-            all_tables = soup.find_all('table')
-            logger.info(f"📊 Total tables found: {len(all_tables)}")
-            
-            # Analyze each table
-            standings_tables = []
-            for i, table in enumerate(all_tables):
-                if self.is_standings_table(table):
-                    standings_tables.append(i)
-                    logger.info(f"✅ Table {i + 1} is a standings table")
-                else:
-                    logger.info(f"⏭️ Table {i + 1} is not a standings table")
+            logger.info(f"  - Alpha: {analysis['alpha_count']}")
+            logger.info(f"  - Omega: {analysis['omega_count']}")
+            logger.info(f"  - Group A: {analysis['group_a_count']}")
+            logger.info(f"  - Group B: {analysis['group_b_count']}")
+            logger.info(f"📊 Total tables found: {analysis['total_tables']}")
+            logger.info(f"🎯 Standings tables found at indices: {[i + 1 for i in analysis['standings_tables']]}")
             
-            logger.info(f"🎯 Standings tables found at indices: {[i+1 for i in standings_tables]}")
-            
-            return soup
+            return analysis
             
         except Exception as e:
             logger.error(f"❌ Failed to analyze page structure: {e}")
             return None
-
-    def parse_standings_table(self, standings_table, group_name):
-        """Parse the standings table to extract team data"""
-        try:
-            teams_data = []
-            rows = standings_table.find_all('tr')[1:]  # Skip header row
-            
-            logger.info(f"🔍 Parsing {len(rows)} rows for {group_name} group")
-            
-            for i, row in enumerate(rows):
-                try:
-                    cells = row.find_all('td')
-                    if len(cells) < 4:  # Need at least 4 cells for team data
-                        logger.debug(f"⚠️ Row {i} has only {len(cells)} cells, skipping")
-                        continue
-                    
-                    # Extract team data - try multiple selectors
-                    team_element = (
-                        cells[1].find('div', class_='team-name') or
-                        cells[1].find('div', class_='event-group-team-name') or
-                        cells[1].find('span', class_='team-name') or
-                        cells[1].find('a', class_='team-name') or
-                        cells[0].find('div', class_='team-name') or  # Try first cell
-                        cells[0].find('div', class_='event-group-team-name') or
-                        cells[0].find('span', class_='team-name') or
-                        cells[0].find('a', class_='team-name')
-                    )
-                    
-                    if not team_element:
-                        logger.debug(f"⚠️ Row {i}: No team name found, skipping")
-                        continue
-                    
-                    team_name = team_element.get_text(strip=True)
-                    team_name = self.clean_team_name(team_name)
-                    
-                    # Try to find record in different positions
-                    record_cell = None
-                    for j in range(min(len(cells), 6)):
-                        cell_text = cells[j].get_text(strip=True)
-                        if '-' in cell_text or '–' in cell_text:
-                            record_cell = cell_text
-                            break
-                    
-                    if not record_cell:
-                        logger.debug(f"⚠️ Row {i}: No record found, skipping")
-                        continue
-                    
-                    # Try to find map differential
-                    map_diff_cell = None
-                    for j in range(min(len(cells), 6)):
-                        cell_text = cells[j].get_text(strip=True)
-                        if '/' in cell_text or '-' in cell_text:
-                            if cell_text != record_cell:  # Don't use the same cell as record
-                                map_diff_cell = cell_text
-                                break
-                    
-                    if not map_diff_cell:
-                        map_diff_cell = "0/0"  # Default value
-                    
-                    # Try to find round differential
-                    round_diff_cell = None
-                    for j in range(min(len(cells), 6)):
-                        cell_text = cells[j].get_text(strip=True)
-                        if '/' in cell_text or '-' in cell_text:
-                            if cell_text != record_cell and cell_text != map_diff_cell:
-                                round_diff_cell = cell_text
-                                break
-                    
-                    if not round_diff_cell:
-                        round_diff_cell = "0/0"  # Default value
-                    
-                    # Extract delta (round differential converted to number)
-                    try:
-                        if '/' in round_diff_cell:
-                            wins, losses = map(int, round_diff_cell.split('/'))
-                            delta = wins - losses
-                        elif '-' in round_diff_cell:
-                            wins, losses = map(int, round_diff_cell.split('-'))
-                            delta = wins - losses
-                        else:
-                            delta = 0.0
-                    except:
-                        delta = 0.0
-                    
-                    teams_data.append({
-                        'group_name': group_name,
-                        'team': team_name,
-                        'record': record_cell,
-                        'map_diff': map_diff_cell,
-                        'round_diff': round_diff_cell,
-                        'delta': delta
-                    })
-                    
-                    logger.info(f"✅ Scraped: {team_name} ({group_name}) - {record_cell}")
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to parse team row {i}: {e}")
-                    continue
-            
-            logger.info(f"📋 Successfully parsed {len(teams_data)} teams for {group_name} group")
-            return teams_data
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to parse standings table for {group_name}: {e}")
-            return []
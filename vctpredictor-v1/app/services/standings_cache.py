@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+VCT Standings Cache
+Compact standings snapshot and predictor probabilities, shareable across pre-forked workers
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from array import array
+from datetime import datetime
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+
+def match_probability(win_rate1, win_rate2):
+    """Chance the first team wins, from the two win rates (the predictor's model)"""
+    total = win_rate1 + win_rate2
+    return 0.5 if total == 0 else win_rate1 / total
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class StandingsSnapshot:
+    """
+    Immutable copy of group_standings at one standings version.
+
+    Numbers live in array.array buffers, and strings live in tuples of
+    interned str. Per-group win probabilities are precomputed into a single
+    flat array. A snapshot built in the gunicorn master before fork is
+    therefore shared copy-on-write. Workers reading it touch a handful of
+    object headers, never the numeric pages, and gc.freeze() keeps the
+    collector from writing to the rest.
+    """
+
+    STRING_COLUMNS = ('team', 'region', 'event_id', 'stage', 'group_name', 'record', 'map_diff', 'round_diff',
+                      'last_updated')
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.loaded_at = datetime.now()
+        self.size = len(rows)
+        self.ids = array('q', (row['id'] for row in rows))
+        self.delta = array('d', (float(row['delta']) for row in rows))
+        self.wins = array('l', (row['wins'] for row in rows))
+        self.losses = array('l', (row['losses'] for row in rows))
+        self.win_rate = array('d', (row['win_rate'] for row in rows))
+        self.columns = {name: tuple(_intern(row[name]) for row in rows) for name in self.STRING_COLUMNS}
+
+        # Rows arrive ordered by region, event, stage and group, so each group is one contiguous range
+        self.groups = {}
+        self.index = {}
+        for position, row in enumerate(rows):
+            key = (row['event_id'], row['stage'], row['group_name'])
+            start, _ = self.groups.get(key, (position, position))
+            self.groups[key] = (start, position + 1)
+            self.index.setdefault((row['event_id'], row['team']), position)
+            self.index.setdefault((None, row['team']), position)
+
+        # Row-major n x n block per group: probabilities[offset + i * n + j] = P(row i beats row j)
+        self.offsets = {}
+        self.probabilities = array('d')
+        for key, (start, stop) in self.groups.items():
+            self.offsets[key] = len(self.probabilities)
+            for i in range(start, stop):
+                self.probabilities.extend(match_probability(self.win_rate[i], self.win_rate[j])
+                                          for j in range(start, stop))
+
+    def __len__(self):
+        return self.size
+
+    def row(self, position):
+        """One row as the dict get_all_teams_with_stats returns"""
+        team = {name: values[position] for name, values in self.columns.items()}
+        team.update(id=self.ids[position], delta=self.delta[position], wins=self.wins[position],
+                    losses=self.losses[position], win_rate=self.win_rate[position])
+        return team
+
+    def rows(self, event_id=None):
+        """Fresh row dicts (callers may sort or modify them), optionally for one event"""
+        positions = range(self.size)
+        if event_id is not None:
+            event_ids = self.columns['event_id']
+            positions = [p for p in positions if event_ids[p] == str(event_id)]
+        return [self.row(position) for position in positions]
+
+    def find(self, team, event_id=None):
+        """Row position of a team, within one event when given"""
+        return self.index.get((str(event_id) if event_id is not None else None, team))
+
+    def probability(self, i, j):
+        """P(row i beats row j), from the precomputed block when both are in the same group"""
+        key_i = (self.columns['event_id'][i], self.columns['stage'][i], self.columns['group_name'][i])
+        key_j = (self.columns['event_id'][j], self.columns['stage'][j], self.columns['group_name'][j])
+        if key_i == key_j:
+            start, stop = self.groups[key_i]
+            n = stop - start
+            return self.probabilities[self.offsets[key_i] + (i - start) * n + (j - start)]
+        return match_probability(self.win_rate[i], self.win_rate[j])
+
+
+class StandingsCache:
+    """
+    The current StandingsSnapshot for this process.
+
+    snapshot() compares the cached version with the database's standings
+    version at most every STANDINGS_VERSION_CHECK_SECONDS. That check is a
+    single primary key lookup. The standings are only reloaded when the
+    version has moved, so a preloaded snapshot stays shared until the data
+    actually changes.
+    """
+
+    def __init__(self, db, check_interval=None):
+        self.db = db
+        self.check_interval = Config.STANDINGS_VERSION_CHECK_SECONDS if check_interval is None else check_interval
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.loaded_pid = None
+        self.reloads = 0
+        self.watcher = None
+
+    def load(self):
+        """Read the standings now (used by the gunicorn master before forking)"""
+        with self._lock:
+            self._load(self.db.get_standings_version())
+        return self._snapshot
+
+    def _load(self, version):
+        # A write between reading the version and the rows only means the next check reloads again
+        started = time.perf_counter()
+        snapshot = StandingsSnapshot(version, self.db.get_all_teams_with_stats())
+        self._snapshot = snapshot
+        self._checked_at = time.monotonic()
+        self.loaded_pid = os.getpid()
+        self.reloads += 1
+        logger.info(f"📦 Loaded standings v{version}: {len(snapshot)} teams in "
+                    f"{(time.perf_counter() - started) * 1000:.1f} ms (pid {self.loaded_pid})")
+
+    def current(self):
+        """The snapshot if it needs no version check yet, otherwise None; never queries"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+        return None
+
+    def snapshot(self):
+        """The current snapshot, reloading it if the standings version has moved"""
+        snapshot = self.current()
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._snapshot
+            try:
+                version = self.db.get_standings_version()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not check standings version, serving cached standings: {e}")
+                self._checked_at = time.monotonic()
+                return self._snapshot
+            if self._snapshot is None or version != self._snapshot.version:
+                self._load(version)
+            else:
+                self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self, version=None):
+        """Check the version on the next access, unless the snapshot already has `version`"""
+        snapshot = self._snapshot
+        if version is not None and snapshot is not None and snapshot.version == version:
+            return
+        self._checked_at = 0.0
+
+    def attach(self, watcher):
+        """
+        Follow a VersionWatcher instead of polling on requests. The version
+        check then only runs on a change notification, or every
+        STANDINGS_CACHE_MAX_AGE_SECONDS in case one was lost.
+        """
+        watcher.subscribe(self.invalidate)
+        self.watcher = watcher
+        self.check_interval = max(self.check_interval, Config.STANDINGS_CACHE_MAX_AGE_SECONDS)
+
+    def status(self):
+        snapshot = self._snapshot
+        return {
+            'version': snapshot.version if snapshot is not None else None,
+            'teams': len(snapshot) if snapshot is not None else 0,
+            'loaded_at': snapshot.loaded_at.isoformat() if snapshot is not None else None,
+            # Still the master's copy when the snapshot was loaded by another process
+            'inherited': self.loaded_pid is not None and self.loaded_pid != os.getpid(),
+            'reloads': self.reloads,
+            'check_interval': self.check_interval,
+            'watcher': self.watcher.status() if self.watcher else None
+        }
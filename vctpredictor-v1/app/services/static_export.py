@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+VCT Static Export
+Writes the rendered index page, the standings, every in-group prediction and
+the browser's probability table to a directory a static server or CDN can serve without the app
+"""
+
+import os
+import json
+import logging
+import tempfile
+import mimetypes
+import threading
+from datetime import datetime
+from config.base import Config
+from app.services.assets import STATIC_LEVELS, PREFERENCE, compress, is_compressible
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+
+def write_atomic(path, data):
+    """
+    Replace path with data. The bytes go to a temporary file in the same
+    directory first, so readers see the old file or the new one, never a
+    partial write.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, 0o644)  # mkstemp creates 0600; the web server needs to read it
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def prediction_pairs(snapshot, predictor):
+    """Every pair of teams that can meet (same event, stage and group), keyed '<id>-<id>' lower id first"""
+    predictions = {}
+    team_names = snapshot.columns['team']
+    for start, stop in snapshot.groups.values():
+        positions = sorted(range(start, stop), key=lambda position: snapshot.ids[position])
+        for a, first in enumerate(positions):
+            for second in positions[a + 1:]:
+                prediction = predictor.build_prediction(
+                    team_names[first], team_names[second],
+                    snapshot.wins[first], snapshot.losses[first],
+                    snapshot.wins[second], snapshot.losses[second],
+                    snapshot.probability(first, second)
+                )
+                prediction.pop('prediction_date', None)
+                predictions[f"{snapshot.ids[first]}-{snapshot.ids[second]}"] = prediction
+    return predictions
+
+
+class StaticExporter:
+    """
+    Exports the site after each successful scrape (run_scrape_job).
+
+    The output directory gets index.html, standings.json (the
+    /api/standings body), predictions.json, prediction-table.json (the
+    /api/prediction-table body) and the fingerprinted assets, with .gz/.br
+    variants of each text file for gzip_static-style serving.
+    Every file is written with an atomic rename, assets first and the page
+    last, so a reader never sees a page that links to a missing asset.
+    Fingerprinted assets already in the directory are left alone, so pages
+    cached from earlier exports keep working.
+
+    The exported page answers predictions from prediction-table.json in the
+    browser, so the static host only has to forward /api/* (scrapes,
+    resets and health) to the app.
+    """
+
+    def __init__(self, app, output_dir=None):
+        self.app = app
+        self.output_dir = output_dir or Config.STATIC_EXPORT_DIR
+        self.last_export = None
+        self._lock = threading.Lock()
+
+    def export(self):
+        """Write the current standings version; a summary of what was written"""
+        with self._lock:
+            started = datetime.now()
+            app = self.app
+            # The scrape has just written a new version; don't wait for the watcher to notice
+            app.standings_cache.invalidate()
+            snapshot = app.standings_cache.snapshot()
+
+            written = self.export_assets()
+            files = {
+                'predictions.json': self.predictions_body(snapshot),
+                'prediction-table.json': self.prediction_table_body(snapshot),
+                'standings.json': self.standings_body(snapshot),
+                'index.html': self.render_page(snapshot)
+            }
+            for name, body in files.items():
+                self.write(name, body)
+                written.append(name)
+            self.write('export.json', json.dumps({
+                'version': snapshot.version,
+                'exported_at': started.isoformat(),
+                'files': {name: len(body) for name, body in files.items()}
+            }, indent=2).encode('utf-8'), sidecars=False)
+
+            self.last_export = {
+                'version': snapshot.version,
+                'exported_at': started.isoformat(),
+                'output_dir': self.output_dir,
+                'files_written': len(written),
+                'seconds': round((datetime.now() - started).total_seconds(), 3)
+            }
+            logger.info(f"📤 Exported standings v{snapshot.version} to {self.output_dir} "
+                        f"({len(written)} files in {self.last_export['seconds']}s)")
+            return self.last_export
+
+    def write(self, name, body, sidecars=True):
+        """Write one file, plus its precompressed variants when it is text"""
+        path = os.path.join(self.output_dir, *name.split('/'))
+        if sidecars and is_compressible(mimetypes.guess_type(name)[0]):
+            for encoding in PREFERENCE:
+                write_atomic(path + SIDECAR_SUFFIXES[encoding], compress(body, encoding, STATIC_LEVELS))
+        write_atomic(path, body)
+
+    def export_assets(self):
+        """Copy the static files under the URLs the page links to; fingerprinted ones only once"""
+        manifest = self.app.assets
+        written = []
+        for name, asset in manifest.assets.items():
+            if manifest.enabled:
+                target = f"assets/{asset.url_name}"
+                if os.path.exists(os.path.join(self.output_dir, 'assets', asset.url_name)):
+                    continue
+            else:
+                target = f"static/{name}"
+            path = os.path.join(self.output_dir, *target.split('/'))
+            for encoding, body in asset.variants.items():
+                if encoding != 'identity':
+                    write_atomic(path + SIDECAR_SUFFIXES[encoding], body)
+            write_atomic(path, asset.variants['identity'])
+            written.append(target)
+        return written
+
+    def predictions_body(self, snapshot):
+        from app.routes import event_name
+
+        teams = {}
+        for position in range(len(snapshot)):
+            row = snapshot.row(position)
+            teams[str(row['id'])] = {
+                'team': row['team'],
+                'event': f"{row['event_id']}:{row['stage']}",
+                'event_name': event_name(row),
+                'group_name': row['group_name']
+            }
+        return json.dumps({
+            'version': snapshot.version,
+            'teams': teams,
+            'predictions': prediction_pairs(snapshot, self.app.predictor)
+        }, separators=(',', ':')).encode('utf-8')
+
+    def prediction_table_body(self, snapshot):
+        from app.routes import prediction_table_response
+        return json.dumps(prediction_table_response(self.app, snapshot), separators=(',', ':')).encode('utf-8')
+
+    def standings_body(self, snapshot):
+        from app.routes import standings_response
+        return json.dumps(standings_response(snapshot, {}), separators=(',', ':')).encode('utf-8')
+
+    def render_page(self, snapshot):
+        """The GET / page for this version, with the form answered from prediction-table.json"""
+        from app.routes import index_view_data, render_index
+
+        with self.app.test_request_context('/'):
+            teams_with_stats, standings = index_view_data(snapshot)
+            html = render_index(snapshot.version, teams_with_stats, standings,
+                                prediction_table_url='prediction-table.json')
+        return html.encode('utf-8')
+
+    def status(self):
+        return {
+            'output_dir': self.output_dir,
+            'last_export': self.last_export
+        }
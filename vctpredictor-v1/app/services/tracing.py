@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+VCT Scrape Tracing
+Lightweight spans for the scrape pipeline: durations, byte and row counts, outcome
+"""
+
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed step of a trace; attributes hold counts such as bytes or rows"""
+
+    def __init__(self, span_id, name, parent_id, started, attributes):
+        self.id = span_id
+        self.name = name
+        self.parent_id = parent_id
+        self.started = started
+        self.duration = None
+        self.outcome = 'ok'
+        self.error = None
+        self.attributes = dict(attributes)
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def fail(self, error):
+        self.outcome = 'error'
+        self.error = str(error)
+
+    def finish(self, duration=None):
+        if self.duration is None:
+            self.duration = duration if duration is not None else time.perf_counter() - self.started
+
+    def to_dict(self, origin):
+        return {
+            'id': self.id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_ms': round((self.started - origin) * 1000, 3),
+            'duration_ms': round((self.duration or 0) * 1000, 3),
+            'outcome': self.outcome,
+            'error': self.error,
+            'attributes': self.attributes
+        }
+
+
+class Tracer:
+    """
+    Collects the spans of one scrape run.
+
+    Spans opened with span() nest under the innermost open span of the same
+    thread, or under the root span when the thread has none (events are
+    scraped in a thread pool). record() adds a span for work that was timed
+    elsewhere, such as parsing in the parser pool.
+    """
+
+    def __init__(self, name, **attributes):
+        self.id = str(uuid.uuid4())
+        self.started_at = datetime.now()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_id = 0
+        self.spans = []
+        self.root = self._open(name, None, attributes)
+
+    def _open(self, name, parent_id, attributes, started=None):
+        with self._lock:
+            self._next_id += 1
+            span = Span(self._next_id, name, parent_id, started or time.perf_counter(), attributes)
+            self.spans.append(span)
+        return span
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def current(self):
+        stack = self._stack()
+        return stack[-1] if stack else self.root
+
+    @contextmanager
+    def span(self, name, **attributes):
+        stack = self._stack()
+        span = self._open(name, self.current().id, attributes)
+        stack.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.fail(e)
+            raise
+        finally:
+            stack.pop()
+            span.finish()
+
+    def record(self, name, seconds, parent=None, **attributes):
+        """Add an already finished span that started when its parent did"""
+        parent = parent or self.current()
+        span = self._open(name, parent.id, attributes, started=parent.started)
+        span.finish(seconds)
+        return span
+
+    def finish(self, outcome='ok', error=None):
+        self.root.outcome = outcome
+        self.root.error = error
+        self.root.finish()
+
+    def find(self, name):
+        return [span for span in self.spans if span.name == name]
+
+    def total(self, name, attribute=None):
+        """Summed duration (or attribute) of every span with this name"""
+        spans = self.find(name)
+        if attribute is None:
+            return sum(span.duration or 0 for span in spans)
+        return sum(span.attributes.get(attribute) or 0 for span in spans)
+
+    def to_list(self):
+        return [span.to_dict(self._origin) for span in self.spans]
+
+
+def summarize_scrape_trace(tracer, teams_count=0):
+    """The scrape_runs row for a finished scrape trace"""
+    root = tracer.root
+    return {
+        'id': tracer.id,
+        'started_at': tracer.started_at.isoformat(),
+        'finished_at': datetime.now().isoformat(),
+        'duration_seconds': round(root.duration or 0, 4),
+        'outcome': root.outcome,
+        'teams_count': teams_count,
+        'pages': len(tracer.find('fetch')),
+        'bytes_downloaded': tracer.total('fetch', 'bytes'),
+        'tables_examined': tracer.total('parse', 'tables_examined'),
+        'tables_accepted': tracer.total('parse', 'tables_accepted'),
+        'rows_parsed': tracer.total('parse', 'rows'),
+        # Per-stage time is summed across events, which run in parallel
+        'fetch_seconds': round(tracer.total('fetch'), 4),
+        'parse_seconds': round(tracer.total('parse'), 4),
+        'write_seconds': round(tracer.total('write'), 4),
+        'spans': tracer.to_list()
+    }
+
+
+@contextmanager
+def maybe_span(tracer, name, **attributes):
+    """tracer.span() when a run is being traced, otherwise a throwaway span"""
+    if tracer is None:
+        yield Span(0, name, None, time.perf_counter(), attributes)
+    else:
+        with tracer.span(name, **attributes) as span:
+            yield span
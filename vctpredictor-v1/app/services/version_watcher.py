@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+VCT Version Watcher
+Invalidates this worker's caches as soon as any process changes the standings
+"""
+
+import os
+import select
+import logging
+import threading
+from datetime import datetime
+from config.base import Config
+
+logger = logging.getLogger(__name__)
+
+
+class VersionWatcher:
+    """
+    Background thread that follows the standings version.
+
+    On PostgreSQL it holds a dedicated connection that LISTENs on the
+    standings channel. MatchDatabase NOTIFYs the new version in the
+    transaction that writes the standings, so other workers hear about it
+    the moment it commits. SQLite has no NOTIFY, so the thread polls the
+    version counter every STANDINGS_POLL_SECONDS instead. That costs one
+    primary key read per worker, not one per request.
+
+    Subscribers are called with the new version, or None when changes may
+    have been missed (after reconnecting).
+    """
+
+    def __init__(self, db, poll_seconds=None):
+        self.db = db
+        self.backend = 'listen' if db.is_postgres else 'poll'
+        self.poll_seconds = poll_seconds or Config.STANDINGS_POLL_SECONDS
+        self.subscribers = []
+        self.version = None
+        self.notifications = 0
+        self.last_change_at = None
+        self.connected = False
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def start(self):
+        # A forked worker inherits the object but not the thread, so it starts its own
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._stop.clear()
+        target = self._listen if self.backend == 'listen' else self._poll
+        self._thread = threading.Thread(target=target, name='standings-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _publish(self, version):
+        if version is not None and version == self.version:
+            return
+        self.version = version
+        self.notifications += 1
+        self.last_change_at = datetime.now()
+        for callback in self.subscribers:
+            try:
+                callback(version)
+            except Exception as e:
+                logger.warning(f"⚠️ Standings change subscriber failed: {e}")
+
+    def _poll(self):
+        while not self._stop.is_set():
+            try:
+                version = self.db.get_standings_version()
+                self.connected = True
+                # The first read also catches writes made between fork and now; caches skip their own version
+                self._publish(version)
+            except Exception as e:
+                self.connected = False
+                logger.warning(f"⚠️ Could not poll standings version: {e}")
+            self._stop.wait(self.poll_seconds)
+
+    def _listen(self):
+        backoff = 1
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self.db.get_dedicated_connection()
+                conn.autocommit = True
+                cursor = conn.cursor()
+                cursor.execute(f"LISTEN {self.db.STANDINGS_CHANNEL}")
+                self.connected = True
+                backoff = 1
+                # Anything written while we were not listening must not be missed
+                self._publish(self.db.get_standings_version())
+
+                while not self._stop.is_set():
+                    # Wake up now and then so stop() and dead connections are noticed
+                    if select.select([conn], [], [], self.poll_seconds * 30) == ([], [], []):
+                        cursor.execute("SELECT 1")
+                        continue
+                    conn.poll()
+                    latest = None
+                    while conn.notifies:
+                        payload = conn.notifies.pop(0).payload
+                        latest = int(payload) if payload and payload.isdigit() else None
+                    self._publish(latest)
+            except Exception as e:
+                self.connected = False
+                logger.warning(f"⚠️ Standings listener lost its connection ({e}), reconnecting in {backoff}s")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def status(self):
+        return {
+            'backend': self.backend,
+            'connected': self.connected,
+            'running': bool(self._thread and self._thread.is_alive() and self._pid == os.getpid()),
+            'version': self.version,
+            'notifications': self.notifications,
+            'last_change_at': self.last_change_at.isoformat() if self.last_change_at else None
+        }
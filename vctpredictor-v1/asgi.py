@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+ASGI entry point: python scripts/serve_asgi.py (or uvicorn asgi:app)
+Read endpoints are served from the event loop, everything else by Flask on
+thread pools (see app/asgi.py)
+"""
+
+import os
+
+# uvicorn has no pre-fork hook, so every worker builds its own app and starts its own threads
+os.environ['PRELOAD_APP'] = 'false'
+os.environ['FLASK_ENV'] = 'production'
+
+from app import create_app
+from app.asgi import AsgiApp
+from config.production import ProductionConfig
+
+app = AsgiApp(create_app(ProductionConfig))
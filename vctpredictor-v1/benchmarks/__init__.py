@@ -0,0 +1,5 @@
+#!/usr/bin/env python3
+"""
+VCT Predictor Benchmarks
+Offline performance suites that store their results as JSON
+"""
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the benchmark suites
+Seeding, app servers, result files, git revision stamping and comparisons between runs
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import socket
+import random
+import platform
+import subprocess
+import urllib.request
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'benchmarks', 'results')
+HOST = '127.0.0.1'
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+def seed_database(database_url, fixture_dir):
+    """Fill a database with standings replayed from captured fixtures"""
+    env = dict(os.environ, DATABASE_URL=database_url, SCRAPER_REPLAY_DIR=fixture_dir,
+               PARSER_POOL_SIZE='0', STARTUP_POPULATE='off')
+    subprocess.run([sys.executable, '-c', (
+        "import os\n"
+        "from app.services.scraper import VCTScraper\n"
+        "ok = VCTScraper(database_url=os.environ['DATABASE_URL']).run_scrape()\n"
+        "raise SystemExit(0 if ok else 1)\n"
+    )], cwd=PROJECT_ROOT, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+GROUP_NAMES = ('Alpha', 'Omega', 'Bravo', 'Charlie', 'Delta', 'Echo', 'Foxtrot', 'Golf')
+
+def synthetic_group(rng, region, group_name, teams):
+    """One group's standings rows from a simulated round robin of best-of-three series"""
+    strength = [rng.uniform(0.2, 1.0) for _ in range(teams)]
+    stats = [{'wins': 0, 'losses': 0, 'maps': [0, 0], 'rounds': [0, 0]} for _ in range(teams)]
+    for i in range(teams):
+        for j in range(i + 1, teams):
+            winner, loser = (i, j) if rng.random() < strength[i] / (strength[i] + strength[j]) else (j, i)
+            stats[winner]['wins'] += 1
+            stats[loser]['losses'] += 1
+            for map_winner in [winner, winner] + [loser] * rng.randint(0, 1):
+                map_loser = loser if map_winner == winner else winner
+                losing_rounds = rng.randint(2, 11)
+                stats[map_winner]['maps'][0] += 1
+                stats[map_loser]['maps'][1] += 1
+                stats[map_winner]['rounds'][0] += 13
+                stats[map_winner]['rounds'][1] += losing_rounds
+                stats[map_loser]['rounds'][0] += losing_rounds
+                stats[map_loser]['rounds'][1] += 13
+
+    return [{
+        'group_name': group_name,
+        'team': f"{region.title()} {group_name} {position + 1}",
+        'record': f"{team['wins']}-{team['losses']}",
+        'map_diff': f"{team['maps'][0]}/{team['maps'][1]}",
+        'round_diff': f"{team['rounds'][0]}/{team['rounds'][1]}",
+        'delta': float(team['rounds'][0] - team['rounds'][1])
+    } for position, team in enumerate(stats)]
+
+def seed_synthetic(database_url, groups=2, teams_per_group=6, seed=0):
+    """
+    Replace the standings with generated ones for every tracked event, the
+    same for a given seed. Works on SQLite and PostgreSQL alike; use a
+    database you don't mind losing the standings of.
+    """
+    from app.services.database import MatchDatabase
+    from config.base import Config
+
+    rng = random.Random(seed)
+    db = MatchDatabase(database_url)
+    db.clear_all_teams()
+    for event in Config.TRACKED_EVENTS:
+        rows = []
+        for group in range(groups):
+            group_name = GROUP_NAMES[group] if group < len(GROUP_NAMES) else f"G{group + 1}"
+            rows.extend(synthetic_group(rng, event['region'], group_name, teams_per_group))
+        db.apply_standings_changes(event, rows, [], [], content_hash=f"synthetic-{seed}")
+    return len(Config.TRACKED_EVENTS) * groups * teams_per_group
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+def server_command(mode, port, workers):
+    if mode == 'wsgi':
+        return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f"{HOST}:{port}",
+                '--log-level', 'warning', 'wsgi:app']
+    return [sys.executable, 'scripts/serve_asgi.py', '--host', HOST, '--port', str(port),
+            '--workers', str(workers), '--log-level', 'warning', '--no-access-log']
+
+def start_server(mode, port, workers, env):
+    process = subprocess.Popen(server_command(mode, port, workers), cwd=PROJECT_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"❌ {mode} server exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://{HOST}:{port}/api/health", timeout=2) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise SystemExit(f"❌ {mode} server did not become ready")
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def git_revision():
+    """Return the short commit hash of the working tree, or 'unknown'"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return 'unknown'
+
+def environment_info():
+    """Describe the machine a benchmark ran on"""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+def write_results(suite, results, output=None):
+    """Write results as JSON, named by suite and commit unless an explicit path is given"""
+    payload = {
+        'suite': suite,
+        'revision': git_revision(),
+        'created_at': datetime.now().isoformat(),
+        'environment': environment_info(),
+        'results': results
+    }
+
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"{suite}-{payload['revision']}-{stamp}.json")
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+    print(f"💾 Results written to {output}")
+    return output
+
+def flatten(results, prefix=''):
+    """Flatten nested result dicts into dotted metric names"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+def compare_results(baseline_path, current):
+    """Print the relative change of every numeric metric against a baseline file"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    old = flatten(baseline.get('results', {}))
+    new = flatten(current)
+    print(f"📊 Compared with {baseline.get('revision', '?')} ({baseline_path})")
+    for name in sorted(set(old) & set(new)):
+        before, after = old[name], new[name]
+        change = ((after - before) / before * 100) if before else 0.0
+        print(f"  {name:<50} {before:>14.4f} -> {after:>14.4f} ({change:+.1f}%)")
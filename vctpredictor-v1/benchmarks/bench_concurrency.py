@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Concurrent connection benchmark
+Starts the app under gunicorn (gthread WSGI) and under uvicorn (ASGI), holds
+increasing numbers of open /api/health/stream connections with slow admin
+requests in flight, and times the read endpoints alongside them
+"""
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._common import (PROJECT_ROOT, HOST, seed_database, percentile, write_results, compare_results,
+                               free_port, start_server, stop_server)
+
+DEFAULT_FIXTURE_DIR = os.path.join(PROJECT_ROOT, 'fixtures', 'vlr')
+
+READ_PATHS = ('/api/standings', '/api/health', '/')
+ADMIN_PATH = '/api/debug-scraper'  # fetches four pages, each delayed by the replay latency
+
+async def fetch(port, path, timeout):
+    """GET path on a new connection; (status, seconds), status 0 on timeout or error"""
+    started = time.perf_counter()
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(HOST, port), timeout)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n\r\n".encode())
+        data = await asyncio.wait_for(reader.read(), timeout - (time.perf_counter() - started))
+        status = int(data.split(b' ', 2)[1])
+    except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+        status = 0
+    finally:
+        if writer:
+            writer.close()
+    return status, time.perf_counter() - started
+
+async def open_stream(port, timeout):
+    """Open a health stream and wait for its status line; the writer, or None if it was not served"""
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(HOST, port), timeout)
+        writer.write(f"GET /api/health/stream HTTP/1.1\r\nHost: {HOST}\r\n"
+                     f"Accept: text/event-stream\r\n\r\n".encode())
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        if b' 200 ' in status_line:
+            return writer
+    except (OSError, asyncio.TimeoutError):
+        pass
+    if writer:
+        writer.close()
+    return None
+
+async def run_level(port, streams, reads, concurrency, admin, timeout):
+    # Slow admin calls first, so they hold their threads for the whole level
+    admin_tasks = [asyncio.ensure_future(fetch(port, ADMIN_PATH, 120)) for _ in range(admin)]
+    await asyncio.sleep(0.5)
+
+    writers = await asyncio.gather(*(open_stream(port, timeout) for _ in range(streams)))
+    held = [writer for writer in writers if writer]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed_read(i):
+        async with semaphore:
+            return await fetch(port, READ_PATHS[i % len(READ_PATHS)], timeout)
+
+    started = time.perf_counter()
+    samples = await asyncio.gather(*(timed_read(i) for i in range(reads)))
+    elapsed = time.perf_counter() - started
+
+    for writer in held:
+        writer.close()
+    admin_results = await asyncio.gather(*admin_tasks)
+
+    ok = sorted(seconds * 1000 for status, seconds in samples if status in (200, 304))
+    return {
+        'streams': streams,
+        'streams_held': len(held),
+        'reads_ok': len(ok),
+        'reads_failed': reads - len(ok),
+        'reads_per_second': len(ok) / elapsed,
+        'read_p50_ms': percentile(ok, 50),
+        'read_p95_ms': percentile(ok, 95),
+        'read_mean_ms': statistics.fmean(ok) if ok else 0.0,
+        'admin_ok': sum(1 for status, _ in admin_results if status == 200),
+        'admin_mean_s': statistics.fmean(seconds for _, seconds in admin_results) if admin_results else 0.0
+    }
+
+def run_benchmark(modes, levels, workers, reads, concurrency, admin, admin_latency, timeout, fixture_dir):
+    workdir = tempfile.mkdtemp(prefix='vct-concurrency-')
+    try:
+        database_url = os.path.join(workdir, 'standings.db')
+        seed_database(database_url, fixture_dir)
+        env = dict(os.environ, DATABASE_URL=database_url, SCRAPER_REPLAY_DIR=fixture_dir,
+                   SCRAPER_REPLAY_LATENCY_SECONDS=str(admin_latency), STARTUP_POPULATE='off',
+                   PARSER_POOL_SIZE='0', WEB_CONCURRENCY=str(workers),
+                   # Measure what the servers can hold, not the per-worker stream limits
+                   HEALTH_STREAM_MAX_CLIENTS='100000', ASGI_HEALTH_STREAM_MAX_CLIENTS='100000')
+
+        results = {'workers': workers, 'reads': reads, 'admin_requests': admin, 'timeout_s': timeout}
+        for mode in modes:
+            results[mode] = {'levels': {}}
+            capacity = 0
+            for streams in levels:
+                # A fresh server per level: closed streams can hold threads until their next heartbeat
+                port = free_port()
+                process = start_server(mode, port, workers, env)
+                try:
+                    level = asyncio.run(run_level(port, streams, reads, concurrency, admin, timeout))
+                finally:
+                    stop_server(process)
+                results[mode]['levels'][str(streams)] = level
+                if level['streams_held'] == streams and not level['reads_failed']:
+                    capacity = streams
+
+                print(f"  🔌 {mode} {streams:>5} streams: held {level['streams_held']}, "
+                      f"reads {level['reads_ok']}/{reads} ok, p95 {level['read_p95_ms']:.1f} ms, "
+                      f"admin {level['admin_ok']}/{admin} in {level['admin_mean_s']:.1f} s")
+            results[mode]['capacity'] = capacity
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare concurrent connection capacity of the WSGI and ASGI servers')
+    parser.add_argument('--modes', default='wsgi,asgi', help='Comma-separated servers to run (wsgi, asgi)')
+    parser.add_argument('--levels', default='100,250,500,1000', help='Comma-separated open stream counts')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes per server')
+    parser.add_argument('--reads', type=int, default=100, help='Timed read requests per level')
+    parser.add_argument('--concurrency', type=int, default=10, help='Read requests in flight at once')
+    parser.add_argument('--admin', type=int, default=8, help='Slow admin requests in flight during each level')
+    parser.add_argument('--admin-latency', type=float, default=1.0, help='Replayed page latency in seconds')
+    parser.add_argument('--timeout', type=float, default=3.0, help='Seconds before a read or stream counts as failed')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help='Fixture directory for seeding')
+    parser.add_argument('--output', help='Result file (defaults to benchmarks/results/)')
+    parser.add_argument('--compare', help='Baseline result file to diff against')
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    levels = [int(level) for level in args.levels.split(',')]
+    print(f"🚀 Holding {', '.join(map(str, levels))} streams against {', '.join(modes)} "
+          f"with {args.workers} workers each")
+    results = run_benchmark(modes, levels, args.workers, args.reads, args.concurrency, args.admin,
+                            args.admin_latency, args.timeout, args.fixtures)
+    for mode in modes:
+        print(f"⚡ {mode}: reads stayed healthy up to {results[mode]['capacity']} open streams")
+
+    write_results('concurrency', results, args.output)
+    if args.compare:
+        compare_results(args.compare, results)
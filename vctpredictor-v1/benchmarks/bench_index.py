@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Index page benchmark
+Measures GET / and prediction POST / throughput through the WSGI app over a
+seeded database, with the page cache disabled and enabled
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._common import PROJECT_ROOT, seed_database, percentile, write_results, compare_results
+
+DEFAULT_FIXTURE_DIR = os.path.join(PROJECT_ROOT, 'fixtures', 'vlr')
+
+def time_requests(send, requests):
+    """Send `requests` requests one after another and summarize their latency"""
+    samples = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = send()
+        samples.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise SystemExit(f"❌ Request failed with status {response.status_code}")
+    elapsed = time.perf_counter() - started
+
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        'requests_per_second': requests / elapsed,
+        'mean_ms': statistics.fmean(ms),
+        'p50_ms': percentile(ms, 50),
+        'p95_ms': percentile(ms, 95)
+    }
+
+def prediction_form(app):
+    """Two teams from the same group, as the page's form would submit them"""
+    rows = app.standings_cache.snapshot().rows()
+    first = rows[0]
+    second = next(row for row in rows[1:] if (row['event_id'], row['group_name']) == (first['event_id'], first['group_name']))
+    return {'team1': str(first['id']), 'team2': str(second['id'])}
+
+def run_benchmark(requests, warmup, fixture_dir):
+    workdir = tempfile.mkdtemp(prefix='vct-index-')
+    try:
+        database_url = os.path.join(workdir, 'standings.db')
+        seed_database(database_url, fixture_dir)
+        os.environ.update(DATABASE_URL=database_url, SCRAPER_REPLAY_DIR=fixture_dir, STARTUP_POPULATE='off')
+
+        from app import create_app
+        app = create_app()
+        if app.db is None:
+            raise SystemExit("❌ create_app could not open the seeded database")
+        client = app.test_client()
+        form = prediction_form(app)
+
+        results = {'requests': requests}
+        for label, enabled in (('uncached', False), ('cached', True)):
+            app.page_cache.enabled = enabled
+            app.page_cache.clear()
+            results[label] = {}
+            # The route's debug output is part of an uncached render, but not of what we measure
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                for name, send in (('get', lambda: client.get('/')),
+                                   ('post', lambda: client.post('/', data=form))):
+                    for _ in range(warmup):
+                        send()
+                    results[label][name] = time_requests(send, requests)
+
+            print(f"  📄 {label}: GET {results[label]['get']['requests_per_second']:.0f} req/s "
+                  f"(p50 {results[label]['get']['p50_ms']:.2f} ms), "
+                  f"POST {results[label]['post']['requests_per_second']:.0f} req/s "
+                  f"(p50 {results[label]['post']['p50_ms']:.2f} ms)")
+
+        results['get_speedup'] = (results['cached']['get']['requests_per_second'] /
+                                  results['uncached']['get']['requests_per_second'])
+        results['post_speedup'] = (results['cached']['post']['requests_per_second'] /
+                                   results['uncached']['post']['requests_per_second'])
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark index page throughput with and without the page cache')
+    parser.add_argument('--requests', type=int, default=500, help='Timed requests per scenario')
+    parser.add_argument('--warmup', type=int, default=20, help='Untimed requests before each scenario')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help='Fixture directory for seeding')
+    parser.add_argument('--output', help='Result file (defaults to benchmarks/results/)')
+    parser.add_argument('--compare', help='Baseline result file to diff against')
+    args = parser.parse_args()
+
+    print(f"🚀 Timing {args.requests} index requests per scenario")
+    results = run_benchmark(args.requests, args.warmup, args.fixtures)
+    print(f"⚡ Page cache: GET {results['get_speedup']:.1f}x, POST {results['post_speedup']:.1f}x")
+
+    write_results('index', results, args.output)
+    if args.compare:
+        compare_results(args.compare, results)
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+HTTP load benchmark
+Boots the app under gunicorn and/or uvicorn against a seeded database, drives
+weighted traffic mixes over keep-alive connections at each concurrency level,
+and reports throughput and p50/p95/p99 latency per endpoint
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import tempfile
+import statistics
+import urllib.request
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._common import (PROJECT_ROOT, HOST, seed_database, seed_synthetic, percentile, write_results,
+                               compare_results, free_port, start_server, stop_server)
+
+DEFAULT_FIXTURE_DIR = os.path.join(PROJECT_ROOT, 'fixtures', 'vlr')
+BROWSER_HEADERS = {'Accept-Encoding': 'gzip, br', 'User-Agent': 'vct-bench-load'}
+
+ENDPOINTS = ('GET /', 'GET /api/health', 'GET /api/prediction-table', 'GET /api/standings',
+             'GET /api/standings (revalidate)', 'POST /', 'POST /api/run-scraper')
+
+# Relative weights over ENDPOINTS; a custom mix is given as "GET /=3,POST /=1"
+MIXES = {
+    # Page views with their follow-up calls, a few of them predictions
+    'browse': {'GET /': 35, 'GET /api/health': 25, 'GET /api/prediction-table': 10, 'GET /api/standings': 10,
+               'GET /api/standings (revalidate)': 10, 'POST /': 10},
+    # API clients and a CDN revalidating
+    'api': {'GET /api/standings': 40, 'GET /api/standings (revalidate)': 30, 'GET /api/health': 20,
+            'GET /api/prediction-table': 10},
+    # Form posts without JavaScript
+    'predict': {'POST /': 80, 'GET /': 20},
+    # Browsing while scrapes (replayed from fixtures) rewrite the standings
+    'scrape': {'GET /': 35, 'GET /api/health': 25, 'GET /api/standings': 20, 'POST /': 19,
+               'POST /api/run-scraper': 1}
+}
+
+
+class Traffic:
+    """Builds the requests for each endpoint name from the seeded standings"""
+
+    def __init__(self, teams, standings_etag):
+        self.standings_etag = standings_etag
+        groups = {}
+        for team in teams:
+            groups.setdefault((team['event_id'], team['stage'], team['group_name']), []).append(str(team['id']))
+        self.pairs = [(first, second) for ids in groups.values()
+                      for first in ids for second in ids if first != second]
+        self.standings_paths = ['/api/standings'] + \
+            [f"/api/standings?region={region}" for region in sorted({team['region'] for team in teams})] + \
+            [f"/api/standings?group={group}" for group in sorted({team['group_name'] for team in teams})]
+        self.builders = {
+            'GET /': lambda rng: ('GET', '/', {}, None),
+            'GET /api/health': lambda rng: ('GET', '/api/health', {}, None),
+            'GET /api/prediction-table': lambda rng: ('GET', '/api/prediction-table', {}, None),
+            'GET /api/standings': lambda rng: ('GET', rng.choice(self.standings_paths), {}, None),
+            'GET /api/standings (revalidate)': lambda rng: (
+                'GET', '/api/standings', {'If-None-Match': self.standings_etag}, None),
+            'POST /': self.prediction,
+            'POST /api/run-scraper': lambda rng: ('POST', '/api/run-scraper', {}, b'')
+        }
+
+    def prediction(self, rng):
+        team1, team2 = rng.choice(self.pairs)
+        return 'POST', '/', {'Content-Type': 'application/x-www-form-urlencoded'}, \
+            urlencode({'team1': team1, 'team2': team2}).encode()
+
+    def request(self, name, rng):
+        return self.builders[name](rng)
+
+
+def parse_mix(spec):
+    """A named mix, or "NAME=WEIGHT,..." with NAME one of the endpoint names"""
+    if spec in MIXES:
+        return MIXES[spec]
+    if '=' not in spec:
+        raise SystemExit(f"❌ Unknown mix {spec} (one of {', '.join(MIXES)}, or 'NAME=WEIGHT,...')")
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.rpartition('=')
+        if name.strip() not in ENDPOINTS:
+            raise SystemExit(f"❌ Unknown endpoint {name.strip()!r} (one of {', '.join(ENDPOINTS)})")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+async def send_request(reader, writer, method, path, headers, body):
+    """One request on an open connection; (status, close) once the whole response is read"""
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {HOST}"]
+    lines += [f"{name}: {value}" for name, value in {**BROWSER_HEADERS, **headers}.items()]
+    if body is not None:
+        lines.append(f"Content-Length: {len(body)}")
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b''))
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed')
+    status = int(status_line.split(b' ', 2)[1])
+    length, chunked, close = None, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding':
+            chunked = 'chunked' in value
+        elif name == 'connection':
+            close = value == 'close'
+
+    if method == 'HEAD' or status in (204, 304):
+        pass
+    elif chunked:
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                while await reader.readline() not in (b'\r\n', b''):
+                    pass
+                break
+            await reader.readexactly(size + 2)
+    elif length is not None:
+        await reader.readexactly(length)
+    else:
+        await reader.read()
+        close = True
+    return status, close
+
+
+async def client(port, traffic, names, weights, rng, measure_from, deadline, timeout, samples):
+    """One user: a keep-alive connection sending requests back to back until the deadline"""
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        method, path, headers, body = traffic.request(name, rng)
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(HOST, port), timeout)
+            status, close = await asyncio.wait_for(send_request(reader, writer, method, path, headers, body), timeout)
+        except (OSError, ValueError, IndexError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            status, close = 0, True
+        if started >= measure_from:
+            samples.append((name, status, time.perf_counter() - started))
+        if close and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_level(port, traffic, mix, concurrency, duration, warmup, timeout, seed):
+    names, weights = list(mix), list(mix.values())
+    samples = []
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + duration
+    await asyncio.gather(*(client(port, traffic, names, weights, random.Random(seed + i), measure_from, deadline,
+                                  timeout, samples) for i in range(concurrency)))
+    return summarize(samples, duration, concurrency)
+
+
+def latency_stats(samples, duration):
+    ms = sorted(seconds * 1000 for _, _, seconds in samples)
+    statuses = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(1 for _, status, _ in samples if not 200 <= status < 400)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'statuses': statuses,
+        'requests_per_second': (len(samples) - errors) / duration,
+        'mean_ms': statistics.fmean(ms) if ms else 0.0,
+        'p50_ms': percentile(ms, 50),
+        'p95_ms': percentile(ms, 95),
+        'p99_ms': percentile(ms, 99),
+        'max_ms': ms[-1] if ms else 0.0
+    }
+
+
+def summarize(samples, duration, concurrency):
+    by_endpoint = {}
+    for sample in samples:
+        by_endpoint.setdefault(sample[0], []).append(sample)
+    level = {'concurrency': concurrency, 'duration_s': duration}
+    level.update(latency_stats(samples, duration))
+    level['endpoints'] = {name: latency_stats(endpoint_samples, duration)
+                          for name, endpoint_samples in sorted(by_endpoint.items())}
+    return level
+
+
+def load_traffic(port):
+    """Teams and the current standings ETag, read from the running server"""
+    with urllib.request.urlopen(f"http://{HOST}:{port}/api/standings", timeout=10) as response:
+        body = json.load(response)
+        etag = response.headers['ETag']
+    teams = [team for event in body['events'] for group in event['groups'] for team in group['teams']]
+    return Traffic(teams, etag)
+
+
+def print_level(server, mix_name, level):
+    print(f"  🚦 {server} {mix_name} x{level['concurrency']}: {level['requests_per_second']:.0f} req/s, "
+          f"p50 {level['p50_ms']:.1f} ms, p95 {level['p95_ms']:.1f} ms, p99 {level['p99_ms']:.1f} ms, "
+          f"{level['errors']} errors")
+    for name, stats in level['endpoints'].items():
+        print(f"      {name:<34} {stats['requests_per_second']:>8.0f} req/s  p50 {stats['p50_ms']:>7.1f}  "
+              f"p95 {stats['p95_ms']:>7.1f}  p99 {stats['p99_ms']:>7.1f} ms  {stats['errors']} errors")
+
+
+def prepare_database(args, workdir):
+    database_url = args.database_url or os.path.join(workdir, 'standings.db')
+    if args.seed == 'fixtures':
+        seed_database(database_url, args.fixtures)
+        return database_url, 'fixtures'
+    teams = seed_synthetic(database_url, args.groups, args.teams_per_group, args.random_seed)
+    return database_url, f"synthetic ({teams} teams)"
+
+
+def run_benchmark(args, servers, mixes, levels):
+    workdir = tempfile.mkdtemp(prefix='vct-load-')
+    try:
+        database_url, seeded = prepare_database(args, workdir)
+        env = dict(os.environ, DATABASE_URL=database_url, SCRAPER_REPLAY_DIR=args.fixtures,
+                   SCRAPER_REPLAY_LATENCY_SECONDS=str(args.scraper_latency), STARTUP_POPULATE='off',
+                   PARSER_POOL_SIZE='0', WEB_CONCURRENCY=str(args.workers),
+                   # Only the scrape mix rewrites the standings during a run
+                   ADAPTIVE_SCHEDULE='false',
+                   # Every request comes from one address; limits would only measure 429s
+                   RATE_LIMIT_ENABLED='false')
+
+        results = {'database': 'postgresql' if database_url.startswith('postgres') else 'sqlite',
+                   'seed': seeded, 'workers': args.workers, 'duration_s': args.duration,
+                   'mixes': {name: mix for name, mix in mixes.items()}}
+        for server in servers:
+            results[server] = {}
+            port = free_port()
+            process = start_server(server, port, args.workers, env)
+            try:
+                traffic = load_traffic(port)
+                for mix_name, mix in mixes.items():
+                    results[server][mix_name] = {}
+                    for concurrency in levels:
+                        level = asyncio.run(run_level(port, traffic, mix, concurrency, args.duration, args.warmup,
+                                                      args.timeout, args.random_seed))
+                        results[server][mix_name][str(concurrency)] = level
+                        print_level(server, mix_name, level)
+            finally:
+                stop_server(process)
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load-test the HTTP endpoints with weighted traffic mixes')
+    parser.add_argument('--servers', default='wsgi', help='Comma-separated servers to run (wsgi, asgi)')
+    parser.add_argument('--mixes', default='browse', help=f"Comma-separated mixes ({', '.join(MIXES)}), "
+                                                          f"or one custom mix like 'GET /=3,POST /=1'")
+    parser.add_argument('--concurrency', default='1,10,50', help='Comma-separated numbers of concurrent clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='Measured seconds per level')
+    parser.add_argument('--warmup', type=float, default=2.0, help='Unmeasured seconds before each level')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes per server')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Seconds before a request counts as failed')
+    parser.add_argument('--seed', choices=('synthetic', 'fixtures'), default='synthetic',
+                        help='Generated standings, or standings replayed from the fixtures')
+    parser.add_argument('--groups', type=int, default=2, help='Synthetic groups per tracked event')
+    parser.add_argument('--teams-per-group', type=int, default=6, help='Synthetic teams per group')
+    parser.add_argument('--random-seed', type=int, default=0, help='Seed for the standings and the traffic')
+    parser.add_argument('--database-url', help='PostgreSQL URL to use instead of a temporary SQLite file '
+                                               '(its standings are replaced)')
+    parser.add_argument('--scraper-latency', type=float, default=0.0, help='Replayed page latency in seconds')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help='Fixture directory for the stubbed scraper')
+    parser.add_argument('--output', help='Result file (defaults to benchmarks/results/)')
+    parser.add_argument('--compare', help='Baseline result file to diff against')
+    args = parser.parse_args()
+
+    servers = [server.strip() for server in args.servers.split(',') if server.strip()]
+    if '=' in args.mixes:
+        mixes = {'custom': parse_mix(args.mixes)}
+    else:
+        mixes = {name.strip(): parse_mix(name.strip()) for name in args.mixes.split(',') if name.strip()}
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    print(f"🚀 Load-testing {', '.join(servers)} with {', '.join(mixes)} traffic at "
+          f"{', '.join(map(str, levels))} concurrent clients")
+    results = run_benchmark(args, servers, mixes, levels)
+
+    write_results('load', results, args.output)
+    if args.compare:
+        compare_results(args.compare, results)
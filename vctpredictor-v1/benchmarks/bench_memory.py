@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Per-worker memory benchmark
+Starts gunicorn with and without preload_app over a seeded database, warms
+every worker with page requests and reads RSS, PSS and private memory of
+each worker from /proc (Linux only)
+"""
+
+import os
+import sys
+import time
+import shutil
+import socket
+import signal
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._common import PROJECT_ROOT, seed_database, write_results, compare_results
+
+DEFAULT_FIXTURE_DIR = os.path.join(PROJECT_ROOT, 'fixtures', 'vlr')
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def memory_kb(pid):
+    """Rss, Pss and private (unshared) memory of a process in kB"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup', encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss_kb': values.get('Rss', 0),
+        'pss_kb': values.get('Pss', 0),
+        'private_kb': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    }
+
+def child_pids(pid):
+    with open(f'/proc/{pid}/task/{pid}/children', encoding='utf-8') as f:
+        return [int(child) for child in f.read().split()]
+
+def wait_until_serving(url, deadline):
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=2).read()
+            return
+        except Exception:
+            time.sleep(0.2)
+    raise SystemExit(f"❌ gunicorn did not start serving {url}")
+
+def measure(preload, workers, requests, database_url, fixture_dir):
+    """Run one gunicorn configuration and return per-worker memory"""
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), WEB_CONCURRENCY=str(workers),
+               PRELOAD_APP='true' if preload else 'false', DATABASE_URL=database_url,
+               SCRAPER_REPLAY_DIR=fixture_dir, STARTUP_POPULATE='off', PARSER_POOL_SIZE='0')
+    master = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+                              cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f'http://127.0.0.1:{port}/'
+        wait_until_serving(url, time.time() + 60)
+        # Connections are spread over the workers, so every worker renders pages
+        for _ in range(requests):
+            urllib.request.urlopen(url, timeout=10).read()
+        time.sleep(0.5)
+
+        worker_pids = child_pids(master.pid)
+        samples = [memory_kb(pid) for pid in worker_pids]
+        master_memory = memory_kb(master.pid)
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+
+    per_worker = {key: statistics.fmean(sample[key] for sample in samples) for key in samples[0]}
+    return {
+        'workers': len(samples),
+        'per_worker': per_worker,
+        'master': master_memory,
+        'total_pss_kb': master_memory['pss_kb'] + sum(sample['pss_kb'] for sample in samples)
+    }
+
+def run_benchmark(workers, requests, fixture_dir):
+    workdir = tempfile.mkdtemp(prefix='vct-memory-')
+    try:
+        database_url = os.path.join(workdir, 'standings.db')
+        seed_database(database_url, fixture_dir)
+        results = {}
+        for label, preload in (('per_worker_load', False), ('preload', True)):
+            results[label] = measure(preload, workers, requests, database_url, fixture_dir)
+            per_worker = results[label]['per_worker']
+            print(f"  🧠 {label}: {per_worker['rss_kb'] / 1024:.1f} MB RSS, "
+                  f"{per_worker['pss_kb'] / 1024:.1f} MB PSS, "
+                  f"{per_worker['private_kb'] / 1024:.1f} MB private per worker; "
+                  f"{results[label]['total_pss_kb'] / 1024:.1f} MB PSS in total")
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare gunicorn worker memory with and without preload')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers')
+    parser.add_argument('--requests', type=int, default=40, help='Page requests used to warm the workers')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help='Fixture directory for seeding and replay')
+    parser.add_argument('--output', help='Result file (defaults to benchmarks/results/)')
+    parser.add_argument('--compare', help='Baseline result file to diff against')
+    args = parser.parse_args()
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        raise SystemExit("❌ This benchmark reads /proc/<pid>/smaps_rollup and needs Linux 4.14+")
+
+    print(f"🚀 Measuring {args.workers} gunicorn workers with and without preload")
+    results = run_benchmark(args.workers, args.requests, args.fixtures)
+
+    write_results('memory', results, args.output)
+    if args.compare:
+        compare_results(args.compare, results)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Page weight benchmark
+Bytes and requests a browser needs for a first and a repeat view of the
+index page, with plain static URLs and no compression versus fingerprinted
+assets and gzip/brotli
+"""
+
+import os
+import re
+import sys
+import gzip
+import shutil
+import argparse
+import tempfile
+import brotli
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._common import PROJECT_ROOT, seed_database, write_results, compare_results
+
+DEFAULT_FIXTURE_DIR = os.path.join(PROJECT_ROOT, 'fixtures', 'vlr')
+ACCEPT_ENCODING = 'gzip, deflate, br'  # what current browsers send
+ASSET_PATTERN = re.compile(r'<(?:link|script|img)\b[^>]*?(?:href|src)="(/[^"]+)"')
+
+def transferred(response):
+    """Status line, headers and body as sent on the wire (before any HTTP/2 header compression)"""
+    headers = sum(len(name) + len(value) + 4 for name, value in response.headers.items())
+    return len(f"HTTP/1.1 {response.status}\r\n") + headers + 2 + len(response.data)
+
+def cacheable_without_revalidation(response):
+    cache_control = response.headers.get('Cache-Control', '')
+    return 'immutable' in cache_control or (
+        'max-age=' in cache_control and 'no-cache' not in cache_control
+        and not cache_control.split('max-age=')[1].startswith('0'))
+
+class Browser:
+    """Fetches a page and its assets, keeping a cache the way a browser would"""
+
+    def __init__(self, client):
+        self.client = client
+        self.cache = {}
+
+    def view(self):
+        stats = {'requests': 0, 'bytes': 0, 'not_modified': 0, 'from_cache': 0}
+        page = self.fetch('/', stats)
+        html = page.get_data()
+        if page.headers.get('Content-Encoding'):
+            html = decode(html, page.headers['Content-Encoding'])
+        for url in ASSET_PATTERN.findall(html.decode('utf-8')):
+            self.fetch(url, stats)
+        return stats
+
+    def fetch(self, url, stats):
+        cached = self.cache.get(url)
+        if cached is not None and cacheable_without_revalidation(cached):
+            stats['from_cache'] += 1
+            return cached
+
+        headers = {'Accept-Encoding': ACCEPT_ENCODING}
+        if cached is not None:
+            if cached.headers.get('ETag'):
+                headers['If-None-Match'] = cached.headers['ETag']
+            if cached.headers.get('Last-Modified'):
+                headers['If-Modified-Since'] = cached.headers['Last-Modified']
+
+        response = self.client.get(url, headers=headers)
+        stats['requests'] += 1
+        stats['bytes'] += transferred(response)
+        if response.status_code == 304:
+            stats['not_modified'] += 1
+            return cached
+        if response.status_code != 200:
+            raise SystemExit(f"❌ {url} returned {response.status_code}")
+        self.cache[url] = response
+        return response
+
+def decode(body, encoding):
+    if encoding == 'br':
+        return brotli.decompress(body)
+    return gzip.decompress(body)
+
+def run_benchmark(fixture_dir):
+    workdir = tempfile.mkdtemp(prefix='vct-page-weight-')
+    try:
+        database_url = os.path.join(workdir, 'standings.db')
+        seed_database(database_url, fixture_dir)
+        os.environ.update(DATABASE_URL=database_url, SCRAPER_REPLAY_DIR=fixture_dir, STARTUP_POPULATE='off')
+
+        from app import create_app
+        app = create_app()
+        if app.db is None:
+            raise SystemExit("❌ create_app could not open the seeded database")
+
+        results = {}
+        for label, optimized in (('before', False), ('after', True)):
+            app.assets.enabled = optimized
+            app.compressor.enabled = optimized
+            app.page_cache.clear()  # rendered pages hold the asset URLs
+
+            browser = Browser(app.test_client())
+            results[label] = {'first_view': browser.view(), 'repeat_view': browser.view()}
+            for view in ('first_view', 'repeat_view'):
+                stats = results[label][view]
+                print(f"  📦 {label} {view.replace('_', ' ')}: {stats['bytes'] / 1024:.1f} KB in "
+                      f"{stats['requests']} requests ({stats['not_modified']} not modified, "
+                      f"{stats['from_cache']} from cache)")
+
+        for view in ('first_view', 'repeat_view'):
+            results[f"{view}_reduction"] = 1 - results['after'][view]['bytes'] / results['before'][view]['bytes']
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure bytes transferred per index page view')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help='Fixture directory for seeding')
+    parser.add_argument('--output', help='Result file (defaults to benchmarks/results/)')
+    parser.add_argument('--compare', help='Baseline result file to diff against')
+    args = parser.parse_args()
+
+    print("🚀 Measuring page weight before and after fingerprinting and compression")
+    results = run_benchmark(args.fixtures)
+    print(f"⚡ First view {results['first_view_reduction']:.0%} smaller, "
+          f"repeat view {results['repeat_view_reduction']:.0%} smaller")
+
+    write_results('page_weight', results, args.output)
+    if args.compare:
+        compare_results(args.compare, results)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Scraper benchmark over the captured fixture corpus
+Runs scrape_single_vct_url end-to-end without network access and reports
+throughput, per-stage timings and allocations
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._common import PROJECT_ROOT, write_results, compare_results
+
+DEFAULT_FIXTURE_DIR = os.path.join(PROJECT_ROOT, 'fixtures', 'vlr')
+DEFAULT_INCLUDE = r'/event/\d+/'  # event standings pages, not match listings
+
+def summarize(samples):
+    """Summary statistics in milliseconds for a list of durations in seconds"""
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        'mean_ms': statistics.fmean(ms),
+        'median_ms': statistics.median(ms),
+        'min_ms': ms[0],
+        'max_ms': ms[-1]
+    }
+
+def time_stages(scraper, url):
+    """Run the scrape pipeline stage by stage, returning durations and team count"""
+    from bs4 import BeautifulSoup
+
+    start = time.perf_counter()
+    response = scraper.scraper.get(url)
+    fetched = time.perf_counter()
+
+    soup = BeautifulSoup(response.content, 'html.parser')
+    parsed = time.perf_counter()
+
+    tables = soup.find_all('table')
+    standings = [(i, table) for i, table in enumerate(tables) if scraper.is_standings_table(table)]
+    detected = time.perf_counter()
+
+    teams = []
+    for table_index, table in standings:
+        group_name = scraper.determine_group_from_table(table, table_index, soup)
+        teams.extend(scraper.parse_standings_table(table, group_name))
+    extracted = time.perf_counter()
+
+    return {
+        'fetch': fetched - start,
+        'html_parse': parsed - fetched,
+        'table_detection': detected - parsed,
+        'row_extraction': extracted - detected
+    }, len(teams)
+
+def measure_allocations(scraper, url):
+    """Trace allocations made by one end-to-end scrape of a page"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    scraper.scrape_single_vct_url(url)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    return {
+        'peak_kb': peak / 1024,
+        'allocated_kb': sum(max(stat.size_diff, 0) for stat in stats) / 1024,
+        'allocated_blocks': sum(max(stat.count_diff, 0) for stat in stats)
+    }
+
+def run_benchmark(fixture_dir, iterations, warmup, include=DEFAULT_INCLUDE, pool_size=0):
+    """Benchmark every standings page in the fixture store"""
+    from app.services.fixtures import FixtureStore
+    from app.services.parsing import ParserPool
+    from app.services.scraper import VCTScraper
+
+    store = FixtureStore(fixture_dir)
+    urls = [url for url in store.urls() if re.search(include, url)]
+    if not urls:
+        raise SystemExit(f"❌ No fixtures found in {fixture_dir}")
+
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+    scraper = VCTScraper(database_url=db_file.name, http_client=store)
+    # In-process parsing by default so results stay comparable with older baselines
+    scraper.parser_pool = ParserPool(size=pool_size)
+
+    pages = {}
+    total_seconds = 0.0
+    total_bytes = 0
+    total_pages = 0
+
+    try:
+        for url in urls:
+            page_bytes = len(store.read(url))
+
+            for _ in range(warmup):
+                scraper.scrape_single_vct_url(url)
+
+            end_to_end = []
+            stage_samples = {}
+            teams_found = 0
+            for _ in range(iterations):
+                start = time.perf_counter()
+                teams = scraper.scrape_single_vct_url(url)
+                end_to_end.append(time.perf_counter() - start)
+                teams_found = len(teams or [])
+
+                stages, _ = time_stages(scraper, url)
+                for stage, seconds in stages.items():
+                    stage_samples.setdefault(stage, []).append(seconds)
+
+            total_seconds += sum(end_to_end)
+            total_bytes += page_bytes * iterations
+            total_pages += iterations
+
+            pages[url] = {
+                'bytes': page_bytes,
+                'teams_found': teams_found,
+                'end_to_end': summarize(end_to_end),
+                'stages': {stage: summarize(samples) for stage, samples in stage_samples.items()},
+                'allocations': measure_allocations(scraper, url)
+            }
+            print(f"  📄 {url}: {pages[url]['end_to_end']['median_ms']:.2f} ms median, {teams_found} teams")
+    finally:
+        scraper.parser_pool.shutdown()
+        os.remove(db_file.name)
+
+    return {
+        'iterations': iterations,
+        'parser_pool_size': pool_size,
+        'pages': pages,
+        'throughput': {
+            'pages_per_second': total_pages / total_seconds if total_seconds else 0.0,
+            'megabytes_per_second': total_bytes / total_seconds / 1e6 if total_seconds else 0.0
+        }
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the VCT scraper over captured fixtures')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help='Fixture directory to replay')
+    parser.add_argument('--include', default=DEFAULT_INCLUDE, help='Regex selecting fixture URLs to run')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed runs per page')
+    parser.add_argument('--warmup', type=int, default=2, help='Untimed runs per page')
+    parser.add_argument('--pool-size', type=int, default=0, help='Parser pool workers (0 parses in-process)')
+    parser.add_argument('--output', help='Result file (defaults to benchmarks/results/)')
+    parser.add_argument('--compare', help='Baseline result file to diff against')
+    args = parser.parse_args()
+
+    # Row-level INFO logging would dominate the measurements
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('app').setLevel(logging.WARNING)
+
+    print(f"🚀 Benchmarking scraper over {args.fixtures}")
+    results = run_benchmark(args.fixtures, args.iterations, args.warmup, args.include, args.pool_size)
+    print(f"⚡ {results['throughput']['pages_per_second']:.1f} pages/s, "
+          f"{results['throughput']['megabytes_per_second']:.2f} MB/s")
+
+    write_results('scraper', results, args.output)
+    if args.compare:
+        compare_results(args.compare, results)
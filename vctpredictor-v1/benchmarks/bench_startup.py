@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark
+Times `import app` plus `create_app()` in fresh interpreters, the way each
+gunicorn worker boots, and fails when the median exceeds a budget
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._common import PROJECT_ROOT, seed_database, write_results, compare_results
+
+DEFAULT_FIXTURE_DIR = os.path.join(PROJECT_ROOT, 'fixtures', 'vlr')
+
+# Runs in the child interpreter; os._exit skips waiting for background threads
+# such as an initial scrape the startup has queued
+CHILD_SCRIPT = """
+import os, sys, json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+application = app.create_app()
+created = time.perf_counter()
+sys.stdout.write(json.dumps({
+    'import': imported - start,
+    'create_app': created - imported,
+    'total': created - start,
+    'db_ok': application.db is not None
+}) + '\\n')
+sys.stdout.flush()
+os._exit(0)
+"""
+
+def time_startup(database_url, fixture_dir):
+    """Import and build the app once in a fresh interpreter"""
+    # Replay keeps a queued initial scrape off the network
+    env = dict(os.environ, DATABASE_URL=database_url, SCRAPER_REPLAY_DIR=fixture_dir,
+               FLASK_ENV='development', STARTUP_POPULATE='background')
+    output = subprocess.run([sys.executable, '-c', CHILD_SCRIPT], cwd=PROJECT_ROOT, env=env,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def summarize(samples):
+    ms = sorted(s * 1000 for s in samples)
+    return {'median_ms': statistics.median(ms), 'min_ms': ms[0], 'max_ms': ms[-1]}
+
+def run_benchmark(iterations, fixture_dir):
+    """Cold starts against an empty database and a populated one"""
+    workdir = tempfile.mkdtemp(prefix='vct-startup-')
+    results = {'iterations': iterations}
+    try:
+        for scenario in ('empty', 'populated'):
+            database_url = os.path.join(workdir, f'{scenario}.db')
+            if scenario == 'populated':
+                seed_database(database_url, fixture_dir)
+
+            samples = []
+            for i in range(iterations):
+                if scenario == 'empty' and os.path.exists(database_url):
+                    os.remove(database_url)  # every run starts from nothing
+                samples.append(time_startup(database_url, fixture_dir))
+                if not samples[-1]['db_ok']:
+                    raise SystemExit(f"❌ create_app could not open the database ({scenario})")
+
+            results[scenario] = {stage: summarize([s[stage] for s in samples])
+                                 for stage in ('import', 'create_app', 'total')}
+            print(f"  🚀 {scenario}: {results[scenario]['total']['median_ms']:.0f} ms median "
+                  f"(import {results[scenario]['import']['median_ms']:.0f} ms, "
+                  f"create_app {results[scenario]['create_app']['median_ms']:.0f} ms)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark import + create_app cold-start time')
+    parser.add_argument('--iterations', type=int, default=5, help='Fresh interpreters per scenario')
+    parser.add_argument('--budget-ms', type=float, default=2000, help='Maximum median import + create_app time')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help='Fixture directory for seeding and replay')
+    parser.add_argument('--output', help='Result file (defaults to benchmarks/results/)')
+    parser.add_argument('--compare', help='Baseline result file to diff against')
+    args = parser.parse_args()
+
+    print(f"🚀 Timing cold starts ({args.iterations} per scenario, budget {args.budget_ms:.0f} ms)")
+    results = run_benchmark(args.iterations, args.fixtures)
+    results['budget_ms'] = args.budget_ms
+
+    write_results('startup', results, args.output)
+    if args.compare:
+        compare_results(args.compare, results)
+
+    over = [scenario for scenario in ('empty', 'populated')
+            if results[scenario]['total']['median_ms'] > args.budget_ms]
+    if over:
+        print(f"❌ Startup over budget: {', '.join(over)}")
+        sys.exit(1)
+    print("✅ Startup within budget")
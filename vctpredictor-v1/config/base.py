@@ -4,6 +4,7 @@ Base configuration for VCT Predictor
 """
 
 import os
+import json
 from datetime import timedelta
 
 class Config:
@@ -17,18 +18,151 @@ class Config:
     # Database settings
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     DATABASE_PATH = os.path.join(BASE_DIR, "val_standings.db")
+    # PostgreSQL connections per process; threads beyond this wait for a free one
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_POOL_TIMEOUT_SECONDS = 30
     
     # Scraper settings
     SCRAPER_HEALTH_FILE = os.path.join(BASE_DIR, "scraper_health.json")
     MAX_RETRIES = 3
-    RETRY_DELAY = 60  # seconds
+    RETRY_DELAY = 60  # seconds, base of the exponential backoff
+    RETRY_MAX_DELAY = 600  # seconds, also the longest Retry-After we will honour
+    SCRAPER_TIMEOUT = 30  # seconds per request
+    SCRAPER_REQUESTS_PER_SECOND = float(os.environ.get('SCRAPER_REQUESTS_PER_SECOND', 0.5))  # per host
+    SCRAPER_BURST = 3
+    
+    # Circuit breaker around vlr.gg (state shared by all workers through the database)
+    CIRCUIT_NAME = 'vlr.gg'
+    CIRCUIT_FAILURE_THRESHOLD = 3  # consecutive failed requests before the breaker opens
+    CIRCUIT_RECOVERY_SECONDS = int(os.environ.get('CIRCUIT_RECOVERY_SECONDS', 600))  # open time before a probe
+    CIRCUIT_PROBE_TIMEOUT_SECONDS = 120  # a probe that has not reported back by then is retried
+    
+    # HTML parsing runs in a spawned process pool; 0 parses in-process (tests, debugging)
+    PARSER_POOL_SIZE = int(os.environ.get('PARSER_POOL_SIZE', 2))
+    PARSER_TIMEOUT_SECONDS = 60
+    
+    # Replay captured pages instead of fetching vlr.gg (see scripts/capture_fixtures.py)
+    SCRAPER_REPLAY_DIR = os.environ.get('SCRAPER_REPLAY_DIR')
+    SCRAPER_REPLAY_LATENCY_SECONDS = float(os.environ.get('SCRAPER_REPLAY_LATENCY_SECONDS', 0))  # simulated vlr.gg round trip
+    
+    # Standings are scraped for every tracked event; override with a JSON list in TRACKED_EVENTS
+    TRACKED_EVENTS = json.loads(os.environ['TRACKED_EVENTS']) if os.environ.get('TRACKED_EVENTS') else [
+        {'region': 'americas', 'event_id': '2501', 'slug': 'vct-2025-americas-stage-2', 'stage': 'Stage 2', 'name': 'VCT 2025: Americas Stage 2'},
+        {'region': 'emea', 'event_id': '2498', 'slug': 'vct-2025-emea-stage-2', 'stage': 'Stage 2', 'name': 'VCT 2025: EMEA Stage 2'},
+        {'region': 'pacific', 'event_id': '2500', 'slug': 'vct-2025-pacific-stage-2', 'stage': 'Stage 2', 'name': 'VCT 2025: Pacific Stage 2'},
+        {'region': 'china', 'event_id': '2499', 'slug': 'vct-2025-china-stage-2', 'stage': 'Stage 2', 'name': 'VCT 2025: China Stage 2'}
+    ]
+    SCRAPER_EVENT_WORKERS = 4  # events scraped in parallel
+    SCRAPE_RUNS_KEEP = 500  # traced runs kept in scrape_runs
+    MIN_TEAMS_PER_EVENT = 10  # fewer parsed teams than this counts as a failed event scrape
+    
+    # Match results crawler
+    MATCH_RESULT_EVENTS = [
+        {'id': '2501', 'slug': 'vct-2025-americas-stage-2', 'name': 'VCT 2025: Americas Stage 2'},
+        {'id': '2347', 'slug': 'vct-2025-americas-stage-1', 'name': 'VCT 2025: Americas Stage 1'}
+    ]
+    MATCH_BATCH_SIZE = 25  # matches per insert_matches_batch call
+    MATCH_CRAWL_MAX_PAGES = 20  # pages per event per run
+    
+    # Startup: 'background' queues the initial scrape (and requeued jobs) after
+    # the app is built, 'off' leaves population to the scheduler or a manual update
+    STARTUP_POPULATE = os.environ.get('STARTUP_POPULATE', 'background')
+    MIN_STARTUP_TEAMS = 10  # fewer stored teams than this triggers the initial scrape
+    
+    # Pre-fork loading (set by gunicorn.conf.py when preload_app is on)
+    PRELOAD_APP = os.environ.get('PRELOAD_APP', 'false').lower() == 'true'
+    STANDINGS_VERSION_CHECK_SECONDS = float(os.environ.get('STANDINGS_VERSION_CHECK_SECONDS', 2))
+    
+    # Cross-worker invalidation: LISTEN/NOTIFY on PostgreSQL, a polled version counter on SQLite
+    STANDINGS_POLL_SECONDS = float(os.environ.get('STANDINGS_POLL_SECONDS', 1))
+    STANDINGS_CACHE_MAX_AGE_SECONDS = float(os.environ.get('STANDINGS_CACHE_MAX_AGE_SECONDS', 300))  # in case a notification is lost
+    
+    # HTTP caching of /api/standings (clients and CDNs revalidate with the version ETag)
+    STANDINGS_API_MAX_AGE_SECONDS = int(os.environ.get('STANDINGS_API_MAX_AGE_SECONDS', 60))
+    STANDINGS_API_STALE_WHILE_REVALIDATE_SECONDS = int(os.environ.get('STANDINGS_API_STALE_WHILE_REVALIDATE_SECONDS', 600))
+    STANDINGS_API_STALE_IF_ERROR_SECONDS = 86400  # a CDN keeps serving the last standings if we are down
+    
+    # Rendered index page and fragments, cached per standings version
+    PAGE_CACHE = os.environ.get('PAGE_CACHE', 'true').lower() == 'true'
+    PAGE_CACHE_MAX_AGE_SECONDS = float(os.environ.get('PAGE_CACHE_MAX_AGE_SECONDS', 30))  # bounds how stale the notice and last-updated time get
+    
+    # Static files under /assets/<name>.<hash>.<ext>, cached by browsers for a year
+    STATIC_FINGERPRINTS = os.environ.get('STATIC_FINGERPRINTS', 'true').lower() == 'true'
+    STATIC_MAX_AGE_SECONDS = 31536000
+    
+    # Directory the site is exported to after each successful scrape, for a static server or CDN (off when empty)
+    STATIC_EXPORT_DIR = os.environ.get('STATIC_EXPORT_DIR', '')
+    
+    # gzip/brotli for HTML and JSON responses (static files are compressed once at startup)
+    COMPRESSION = os.environ.get('COMPRESSION', 'true').lower() == 'true'
+    COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))  # smaller bodies aren't worth it
+    
+    # Scraper health pushed over Server-Sent Events (/api/health/stream)
+    HEALTH_POLL_SECONDS = float(os.environ.get('HEALTH_POLL_SECONDS', 2))  # one read per worker, not per client
+    HEALTH_FLUSH_SECONDS = float(os.environ.get('HEALTH_FLUSH_SECONDS', 1))  # recorded scraper health -> database
+    HEALTH_HISTORY_KEEP = 1000  # rows kept in scraper_health_history
+    HEALTH_STREAM_HEARTBEAT_SECONDS = 15  # comment line that keeps proxies from closing idle streams
+    HEALTH_STREAM_MAX_SECONDS = 300  # streams end after this; EventSource reconnects on its own
+    HEALTH_STREAM_RETRY_MS = 5000
+    # Each open stream holds a gthread thread (gunicorn.conf.py reads the same
+    # GUNICORN_THREADS), so by default a quarter of them; the rest serve requests
+    GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS', 128))
+    HEALTH_STREAM_MAX_CLIENTS = int(os.environ.get('HEALTH_STREAM_MAX_CLIENTS', max(1, GUNICORN_THREADS // 4)))
+    
+    # Per-client rate limits on the endpoints that crawl vlr.gg or rewrite the
+    # database; override with a JSON object of {name: {limit, window, paths}}
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMITS = json.loads(os.environ['RATE_LIMITS']) if os.environ.get('RATE_LIMITS') else {
+        'scraper': {'limit': 10, 'window': 3600,
+                    'paths': ['/api/run-scraper', '/api/debug-scraper', '/api/test-scraper-detailed']},
+        'reset': {'limit': 5, 'window': 3600,
+                  'paths': ['/api/reset-database', '/api/reset-database-complete', '/api/init-db']}
+    }
+    RATE_LIMIT_STORE = os.environ.get('RATE_LIMIT_STORE', 'memory')  # 'database' counts across workers
+    RATE_LIMIT_PRUNE_SECONDS = 600  # how often idle clients are dropped
+    # Proxies in front of the app that append to X-Forwarded-For (Railway has one)
+    RATE_LIMIT_PROXY_HOPS = int(os.environ.get('RATE_LIMIT_PROXY_HOPS', 0))
+    
+    # ASGI serving (scripts/serve_asgi.py): read endpoints run on the event loop,
+    # everything else on Flask in separate bounded thread pools
+    ASGI_READ_THREADS = int(os.environ.get('ASGI_READ_THREADS', 8))  # page renders and predictions
+    ASGI_ADMIN_THREADS = int(os.environ.get('ASGI_ADMIN_THREADS', 4))  # scraper, reset and debug endpoints
+    ASGI_DB_THREADS = int(os.environ.get('ASGI_DB_THREADS', 4))  # version checks and health reads for the loop
+    # An open stream is a coroutine rather than a thread here
+    ASGI_HEALTH_STREAM_MAX_CLIENTS = int(os.environ.get('ASGI_HEALTH_STREAM_MAX_CLIENTS', 5000))
+    
+    # Background jobs
+    JOB_WORKERS = 2
+    JOB_HEARTBEAT_SECONDS = 15
+    JOB_STALE_SECONDS = 120  # a running job without a heartbeat this long is requeued
+    
+    # Leader election for scheduled work (one runner across all workers)
+    LEADER_LEASE_SECONDS = 60  # SQLite lease; another process takes over after it expires
+    LEADER_HEARTBEAT_SECONDS = 15
     
     # Logging
     LOG_LEVEL = 'INFO'
     LOG_FILE = os.path.join(BASE_DIR, "logs", "app.log")
     
     # Auto-scraper settings
-    SCRAPER_INTERVAL = timedelta(hours=24)  # Run every 24 hours
+    SCRAPER_INTERVAL = timedelta(hours=float(os.environ.get('SCRAPER_INTERVAL_HOURS', 24)))  # Run every 24 hours
+    SCRAPER_ANCHOR = '03:00'  # interval runs are aligned to this time of day
+    SCRAPE_TIMEOUT_SECONDS = 1800
+    MATCH_CRAWL_CRON = '30 3 * * *'  # minute hour day month weekday
+    
+    # Adaptive scrape schedule (polls for results after scheduled series)
+    ADAPTIVE_SCHEDULE = os.environ.get('ADAPTIVE_SCHEDULE', 'true').lower() == 'true'
+    CALENDAR_REFRESH_HOURS = 6
+    SERIES_EXPECTED_MINUTES = 150  # typical Bo3 including breaks
+    RESULT_POLL_DELAY_MINUTES = 15  # first poll after the expected end
+    RESULT_POLL_INTERVAL_MINUTES = 15
+    RESULT_POLL_WINDOW_HOURS = 6  # give up waiting for a result after this long
+    
+    # Scheduler
+    SCHEDULER_TICK_SECONDS = 30
+    SCHEDULER_WORKERS = 2
+    SCHEDULER_DEFAULT_TIMEOUT = 1800  # seconds
+    SCHEDULER_JITTER_SECONDS = 120  # random delay added to each next run
     BACKUP_RETENTION_DAYS = 5
 
 class DevelopmentConfig(Config):
@@ -19,5 +19,8 @@ class ProductionConfig(Config):
     # Production database
     DATABASE_URL = os.environ.get('DATABASE_URL')
     
+    # Railway's edge proxy sits in front of every request
+    RATE_LIMIT_PROXY_HOPS = int(os.environ.get('RATE_LIMIT_PROXY_HOPS', 1))
+    
     # Production logging
     LOG_LEVEL = 'WARNING'
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Gunicorn configuration for VCT Predictor
+With preload_app the master builds the app and loads the standings once;
+workers inherit them copy-on-write instead of loading their own
+"""
+
+import os
+import gc
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# Threaded workers: an open /api/health/stream holds one thread, not a whole worker.
+# Config.HEALTH_STREAM_MAX_CLIENTS defaults to a quarter of them, so streams never starve requests
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 128))
+timeout = 120
+preload_app = os.environ.get('PRELOAD_APP', 'true').lower() == 'true'
+
+# Config.PRELOAD_APP reads this when the app is imported, which happens after this file
+os.environ['PRELOAD_APP'] = 'true' if preload_app else 'false'
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        # Move everything the master allocated into the permanent generation so
+        # collections in the workers never write to (and un-share) those pages
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from app import start_worker_threads
+        start_worker_threads(server.app.wsgi())
@@ -4,10 +4,13 @@ Development entry point for VCT Predictor
 Run this for local development
 """
 
-from app import app
+from app import create_app
 from config.development import DevelopmentConfig
 
 if __name__ == "__main__":
+    # Built here rather than at import so spawned parser workers, which
+    # re-import this script, do not build an app of their own
+    app = create_app(DevelopmentConfig)
     config = DevelopmentConfig()
     print(f"🚀 Starting VCT Predictor in development mode...")
     print(f"📱 Web interface: http://{config.HOST}:{config.PORT}")
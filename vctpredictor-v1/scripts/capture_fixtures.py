@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Capture vlr.gg pages into a fixture store for offline replay
+Run this somewhere with network access, then commit the fixtures
+"""
+
+import os
+import sys
+import argparse
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cloudscraper
+from app.services.fixtures import FixtureStore
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'vlr')
+
+DEFAULT_URLS = [
+    "https://www.vlr.gg/event/2501/vct-2025-americas-stage-2",
+    "https://www.vlr.gg/event/2498/vct-2025-emea-stage-2",
+    "https://www.vlr.gg/event/2500/vct-2025-pacific-stage-2",
+    "https://www.vlr.gg/event/2499/vct-2025-china-stage-2",
+    "https://www.vlr.gg/event/2347/vct-2025-americas-stage-1"
+]
+
+def capture_fixtures(urls, fixture_dir):
+    """Fetch each URL and record it with its status code and headers"""
+    store = FixtureStore(fixture_dir)
+    session = cloudscraper.create_scraper()
+    captured = 0
+
+    for url in urls:
+        try:
+            response = store.capture(session, url, timeout=30)
+            print(f"  ✅ {url} -> {response.status_code} ({len(response.content)} bytes)")
+            captured += 1
+        except Exception as e:
+            print(f"  ❌ {url}: {e}")
+
+    print(f"📼 Captured {captured}/{len(urls)} pages into {fixture_dir}")
+    return captured == len(urls)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('urls', nargs='*', default=DEFAULT_URLS, help='Pages to capture')
+    parser.add_argument('--out', default=DEFAULT_FIXTURE_DIR, help='Fixture directory')
+    args = parser.parse_args()
+
+    success = capture_fixtures(args.urls, args.out)
+    sys.exit(0 if success else 1)
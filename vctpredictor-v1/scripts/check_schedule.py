@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Check the adaptive scrape schedule against the captured fixtures
+Replays each tracked event's upcoming listing into a temporary calendar and
+checks that a series in every region with one switches the scrape to the fast
+result-polling interval
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'vlr')
+os.environ.setdefault('SCRAPER_REPLAY_DIR', DEFAULT_FIXTURE_DIR)
+
+from config.base import Config
+from app.services.database import MatchDatabase
+from app.services.scraper import VCTScraper
+from app.services.match_calendar import MatchCalendar, AdaptiveSchedule
+
+
+def check_event(event, db_path):
+    """True if a series from this event's listing switches the scrape to result polling; None without one"""
+    db = MatchDatabase(db_path)
+    calendar = MatchCalendar(db)
+    if not calendar.refresh(VCTScraper(database_url=db_path), events=[event]) or not calendar.matches():
+        return None
+
+    # Standings last moved before the first series, and polling for it has just begun
+    match = calendar.matches()[0]
+    starts_at = datetime.fromisoformat(match['starts_at'])
+    db.set_state(db.STANDINGS_CHANGED_KEY, (starts_at - timedelta(hours=1)).isoformat())
+    schedule = AdaptiveSchedule(db)
+    after = starts_at + schedule.series_duration + schedule.poll_delay + timedelta(minutes=1)
+    run_at, reason = schedule.next_run(after)
+
+    if run_at == after + schedule.poll_interval:
+        print(f"  ✅ {event['region']}: {reason}")
+        return True
+    print(f"  ❌ {event['region']}: next run {run_at:%Y-%m-%d %H:%M} ({reason})")
+    return False
+
+
+def check_schedule(tmp_dir):
+    results = {event['region']: check_event(event, os.path.join(tmp_dir, f"{event['region']}.db"))
+               for event in Config.TRACKED_EVENTS}
+
+    missing = sorted(region for region, result in results.items() if result is None)
+    if missing:
+        print(f"ℹ️ No upcoming series captured for: {', '.join(missing)}")
+    checked = [result for result in results.values() if result is not None]
+    return bool(checked) and all(checked)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        success = check_schedule(tmp)
+    sys.exit(0 if success else 1)
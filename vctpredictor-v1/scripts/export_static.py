@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Export the site for a static server or CDN
+Writes the current standings to STATIC_EXPORT_DIR (or --output) the same way
+the scraper does after each successful run; useful for the first deploy
+"""
+
+import os
+import sys
+import argparse
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('STARTUP_POPULATE', 'off')
+os.environ.setdefault('PRELOAD_APP', 'true')  # no watcher or scheduler threads for a one-off export
+
+from app import create_app
+from app.services.static_export import StaticExporter
+from config.base import Config
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export the index page, standings and predictions as static files')
+    parser.add_argument('--output', default=Config.STATIC_EXPORT_DIR, help='Output directory (defaults to STATIC_EXPORT_DIR)')
+    args = parser.parse_args()
+
+    if not args.output:
+        raise SystemExit("❌ No output directory: set STATIC_EXPORT_DIR or pass --output")
+
+    app = create_app()
+    if app.db is None:
+        raise SystemExit("❌ Could not open the database")
+
+    summary = StaticExporter(app, args.output).export()
+    print(f"✅ Exported standings v{summary['version']} to {summary['output_dir']} "
+          f"({summary['files_written']} files in {summary['seconds']}s)")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Serve asgi:app with uvicorn on a listening socket bound here
+The socket is created with IPPROTO_TCP and TCP_NODELAY, so Nagle's algorithm
+is off for every connection whatever the number of workers
+"""
+
+import os
+import sys
+import socket
+import argparse
+
+# Add the parent directory to the path so uvicorn (and its workers) can import asgi:app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+
+def bind_listener(host, port):
+    """
+    A bound TCP socket with Nagle off, for uvicorn to listen on.
+
+    uvicorn --workers binds its own socket with protocol 0, and asyncio only
+    sets TCP_NODELAY on connections from IPPROTO_TCP sockets. Nagle then holds
+    each response body until the client acknowledges the headers, which a
+    delayed ACK puts off by about 40 ms per keep-alive request.
+    """
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    try:
+        sock.bind((host, port))
+    except OSError as e:
+        sock.close()
+        raise SystemExit(f"❌ Could not bind {host}:{port}: {e}")
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve(host, port, workers=1, log_level='info', access_log=True):
+    """Run asgi:app on our own socket; with several workers uvicorn's supervisor shares it"""
+    config = uvicorn.Config('asgi:app', host=host, port=port, workers=workers,
+                            log_level=log_level, access_log=access_log)
+    sock = bind_listener(host, port)
+    if workers > 1:
+        Multiprocess(config, sockets=[sock]).run()
+    else:
+        uvicorn.Server(config).run(sockets=[sock])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve the ASGI app with uvicorn, with TCP_NODELAY on every connection')
+    parser.add_argument('--host', default='0.0.0.0', help='Address to bind')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8000)), help='Port to bind (defaults to $PORT)')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', 1)),
+                        help='Worker processes (defaults to $WEB_CONCURRENCY)')
+    parser.add_argument('--log-level', default='info', help='uvicorn log level')
+    parser.add_argument('--no-access-log', action='store_true', help='Disable the access log')
+    args = parser.parse_args()
+
+    serve(args.host, args.port, workers=args.workers, log_level=args.log_level, access_log=not args.no_access_log)
@@ -118,6 +118,27 @@ document.addEventListener('DOMContentLoaded', function() {
         console.log('🔍 Alternative button selector 2:', altPredictBtn2);
     }
     
+    // Instant predictions: the form is answered in the browser from the
+    // probability table; until it has loaded (or if it can't) the form POSTs
+    const predictionForm = document.querySelector('.prediction-form[data-table]');
+    let predictionTable = null;
+    if (predictionForm && team1Select && team2Select) {
+        loadPredictionTable(predictionForm.dataset.table);
+        predictionForm.addEventListener('submit', function(event) {
+            if (predictionTable) {
+                event.preventDefault();
+                showLocalPrediction();
+            }
+        });
+        [team1Select, team2Select].forEach(select => {
+            select.addEventListener('change', function() {
+                if (predictionTable && team1Select.value && team2Select.value) {
+                    showLocalPrediction();
+                }
+            });
+        });
+    }
+
     // Debug: Check loading spinner states on page load
     console.log('🔍 Checking loading spinner states on page load...');
     const allLoadingSpinners = document.querySelectorAll('.loading-spinner');
@@ -262,7 +283,7 @@ document.addEventListener('DOMContentLoaded', function() {
         // Add appropriate status class
         if (status === 'success') {
             statusElement.classList.add('status-success');
-        } else if (status === 'error' || status === 'failed') {
+        } else if (status === 'error' || status === 'failed' || status === 'timeout') {
             statusElement.classList.add('status-error');
         } else if (status === 'running') {
             statusElement.classList.add('status-warning');
@@ -271,11 +292,47 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
     
-    // Load health data immediately
-    loadScraperHealth();
+    // Poll every 30 seconds (fallback when the event stream is unavailable)
+    let healthPollTimer = null;
+    function startHealthPolling() {
+        if (healthPollTimer) return;
+        console.log('🔁 Falling back to polling /api/health');
+        loadScraperHealth();
+        healthPollTimer = setInterval(loadScraperHealth, 30000);
+    }
     
-    // Auto-refresh health status every 30 seconds
-    setInterval(loadScraperHealth, 30000);
+    // Subscribe to pushed health changes; the server sends the current state
+    // first, then only changes (plus heartbeats to keep the connection open)
+    function connectHealthStream() {
+        if (!window.EventSource) {
+            startHealthPolling();
+            return;
+        }
+        
+        let failures = 0;
+        const source = new EventSource('/api/health/stream');
+        
+        source.onopen = () => {
+            failures = 0;
+        };
+        
+        source.addEventListener('health', event => {
+            updateHealthDisplay(JSON.parse(event.data));
+        });
+        
+        source.onerror = () => {
+            // EventSource reconnects by itself when a stream ends. An error status
+            // (e.g. no free stream slots) closes it; so do repeated failed reconnects
+            failures += 1;
+            if (source.readyState === EventSource.CLOSED || failures >= 3) {
+                console.log('⚠️ Health stream unavailable');
+                source.close();
+                startHealthPolling();
+            }
+        };
+    }
+    
+    connectHealthStream();
     
     console.log('🏥 Health monitoring system initialized');
     
@@ -299,18 +356,23 @@ document.addEventListener('DOMContentLoaded', function() {
         })
         .then(response => response.json())
         .then(data => {
-            if (data.success) {
-                updateStatus.textContent = `✅ Data updated successfully! Found ${data.teams_count} teams`;
-                updateStatus.className = 'update-status success';
-                
-                // Refresh the page to show new data
-                setTimeout(() => {
-                    location.reload();
-                }, 2000);
-            } else {
-                updateStatus.textContent = `❌ Update failed: ${data.error || 'Unknown error'}`;
-                updateStatus.className = 'update-status error';
+            if (!data.success) {
+                throw new Error(data.error || 'Unknown error');
             }
+            updateStatus.textContent = data.deduplicated
+                ? '🔄 An update is already running, following its progress...'
+                : '🔄 Update queued...';
+            return pollScrapeJob(data.status_url || `/api/jobs/${data.job_id}`);
+        })
+        .then(job => {
+            const teamsCount = job.result ? job.result.teams_count : 0;
+            updateStatus.textContent = `✅ Data updated successfully! Found ${teamsCount} teams`;
+            updateStatus.className = 'update-status success';
+            
+            // Refresh the page to show new data
+            setTimeout(() => {
+                location.reload();
+            }, 2000);
         })
         .catch(error => {
             updateStatus.textContent = `❌ Update failed: ${error.message}`;
@@ -324,6 +386,36 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Poll a background job until it finishes, showing its current stage
+    function pollScrapeJob(statusUrl) {
+        const stageLabels = {
+            fetch: 'Fetching standings pages...',
+            parse: 'Parsing standings tables...',
+            write: 'Saving team data...'
+        };
+        
+        return new Promise((resolve, reject) => {
+            function check() {
+                fetch(statusUrl)
+                    .then(response => response.json())
+                    .then(job => {
+                        if (job.status === 'succeeded') {
+                            resolve(job);
+                        } else if (job.status === 'failed') {
+                            reject(new Error(job.error || 'Scraper failed'));
+                        } else if (job.success === false) {
+                            reject(new Error(job.error || 'Job not found'));
+                        } else {
+                            updateStatus.textContent = `🔄 ${stageLabels[job.stage] || 'Waiting for a worker...'}`;
+                            setTimeout(check, 1500);
+                        }
+                    })
+                    .catch(reject);
+            }
+            check();
+        });
+    }
+    
     // Reset Database Function
     function resetDatabase() {
         if (!resetBtn) return;
@@ -424,5 +516,102 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Local Prediction Functions
+    function loadPredictionTable(url) {
+        fetch(url)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(data => {
+                predictionTable = indexPredictionTable(data);
+                console.log(`✅ Prediction table v${data.version} loaded (${Object.keys(predictionTable.teams).length} teams)`);
+            })
+            .catch(error => {
+                console.log('⚠️ Prediction table unavailable, predictions will be posted:', error.message);
+            });
+    }
+
+    function indexPredictionTable(data) {
+        // team id -> its group and position in the group's team list
+        const teams = {};
+        data.groups.forEach(group => {
+            group.teams.forEach(([id, name], position) => {
+                teams[String(id)] = {name, group, position};
+            });
+        });
+        return {version: data.version, teams};
+    }
+
+    function groupProbability(group, i, j) {
+        // P(teams[i] beats teams[j]); p holds i < j row by row, and P(j beats i) = 1 - P(i beats j)
+        if (i > j) {
+            return 1 - groupProbability(group, j, i);
+        }
+        const n = group.teams.length;
+        return group.p[i * n - (i * (i + 1)) / 2 + (j - i - 1)];
+    }
+
+    function localPrediction(table, team1Id, team2Id) {
+        // The same checks and messages as the server's form handler
+        if (!team1Id || !team2Id) {
+            return {error: 'Please select two teams'};
+        }
+        if (team1Id === team2Id) {
+            return {error: 'Please select two different teams'};
+        }
+        const team1 = table.teams[team1Id];
+        const team2 = table.teams[team2Id];
+        if (!team1 || !team2) {
+            return {error: 'One or both selected teams are invalid'};
+        }
+        if (team1.group.event_id !== team2.group.event_id || team1.group.stage !== team2.group.stage) {
+            return {error: `Teams must be from the same event. ${team1.name} plays in ${team1.group.event_name} and ${team2.name} plays in ${team2.group.event_name}`};
+        }
+        if (team1.group !== team2.group) {
+            return {error: `Teams must be from the same group. ${team1.name} is in Group ${team1.group.group} and ${team2.name} is in Group ${team2.group.group}`};
+        }
+        // A tie goes to the second team, as on the server
+        const team1Probability = groupProbability(team1.group, team1.position, team2.position);
+        const team2Probability = 1 - team1Probability;
+        return {
+            predicted_winner: team1Probability > team2Probability ? team1.name : team2.name,
+            confidence: Math.max(team1Probability, team2Probability)
+        };
+    }
+
+    function renderPrediction(form, prediction) {
+        const section = form.parentElement;
+        section.querySelectorAll('.prediction-result').forEach(element => element.remove());
+
+        const result = document.createElement('div');
+        result.className = 'prediction-result';
+        if (prediction.error) {
+            result.classList.add('error');
+            const message = document.createElement('p');
+            message.textContent = prediction.error;
+            result.appendChild(message);
+        } else {
+            const heading = document.createElement('h3');
+            heading.textContent = 'Prediction Result';
+            result.appendChild(heading);
+            [['Winner', prediction.predicted_winner],
+             ['Confidence', `${(prediction.confidence * 100).toFixed(1)}%`]].forEach(([label, value]) => {
+                const line = document.createElement('p');
+                const strong = document.createElement('strong');
+                strong.textContent = `${label}:`;
+                line.append(strong, ` ${value}`);
+                result.appendChild(line);
+            });
+        }
+        section.appendChild(result);
+    }
+
+    function showLocalPrediction() {
+        renderPrediction(predictionForm, localPrediction(predictionTable, team1Select.value, team2Select.value));
+    }
+
     console.log('🎉 VCT Predictor initialization complete');
 });
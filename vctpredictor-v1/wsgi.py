@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-WSGI entry point for Railway deployment
+WSGI entry point for Railway deployment: gunicorn -c gunicorn.conf.py wsgi:app
 """
 
 import os
@@ -12,11 +12,3 @@ os.environ['FLASK_ENV'] = 'production'
 
 # Create production app
 app = create_app(ProductionConfig)
-
-if __name__ == "__main__":
-    config = ProductionConfig()
-    app.run(
-        host=config.HOST,
-        port=config.PORT,
-        debug=config.DEBUG
-    )